@@ -9,7 +9,9 @@ import ErrorDisplay from './ErrorDisplay';
 
 const Dashboard = () => {
   const [blogs, setBlogs] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
 
   useEffect(() => {
@@ -21,7 +23,8 @@ const Dashboard = () => {
     setError('');
     try {
       const response = await blogAPI.getAllBlogs();
-      setBlogs(response.data);
+      setBlogs(response.data.results);
+      setNextPage(response.data.next);
     } catch (error) {
       const errorMessage = getApiErrorMessage(error, 'fetch blogs');
       if (errorMessage.includes('Network Error')) {
@@ -35,6 +38,19 @@ const Dashboard = () => {
     }
   };
 
+  const fetchMoreBlogs = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await blogAPI.getBlogPage(nextPage);
+      setBlogs(prev => [...prev, ...response.data.results]);
+      setNextPage(response.data.next);
+    } catch (error) {
+      setError(getApiErrorMessage(error, 'fetch blogs'));
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDelete = async (id) => {
     if (window.confirm('Are you sure you want to delete this blog?')) {
       try {
@@ -159,13 +175,13 @@ const Dashboard = () => {
                 </h3>
                 
                 <p className="text-gray-600 dark:text-gray-400 text-sm mb-4 line-clamp-3">
-                  {blog.content}
+                  {blog.excerpt ?? blog.content}
                 </p>
                 
                 <div className="flex items-center justify-between text-sm text-gray-500 dark:text-gray-400">
                   <div className="flex items-center">
                     <User className="w-4 h-4 mr-1" />
-                    <span>{blog.meta_tags?.author || 'Author'}</span>
+                    <span>{blog.meta_tags?.author || blog.author || 'Author'}</span>
                   </div>
                   <div className="flex items-center">
                     <Calendar className="w-4 h-4 mr-1" />
@@ -177,6 +193,18 @@ const Dashboard = () => {
           ))}
         </div>
       )}
+
+      {nextPage && (
+        <div className="flex justify-center">
+          <button
+            onClick={fetchMoreBlogs}
+            disabled={loadingMore}
+            className="px-4 py-2 text-sm font-medium rounded-md border border-gray-300 dark:border-gray-600 text-gray-700 dark:text-gray-200 hover:bg-gray-50 dark:hover:bg-gray-700 disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
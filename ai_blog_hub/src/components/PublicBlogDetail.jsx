@@ -21,9 +21,8 @@ const PublicBlogDetail = () => {
       const blogResponse = await blogAPI.getBlog(id);
       setBlog(blogResponse.data);
 
-      const allBlogsResponse = await blogAPI.getAllBlogs();
-      const allBlogs = allBlogsResponse.data;
-      const related = allBlogs
+      const topicBlogsResponse = await blogAPI.getAllBlogs({ topic: blogResponse.data.topic, page_size: 4 });
+      const related = topicBlogsResponse.data.results
         .filter(b => b.id !== parseInt(id) && b.topic === blogResponse.data.topic)
         .slice(0, 3);
       setRelatedBlogs(related);
@@ -216,7 +215,7 @@ const PublicBlogDetail = () => {
                       {relatedBlog.title}
                     </h3>
                     <p className="text-sm text-gray-600 dark:text-gray-400 line-clamp-3">
-                      {relatedBlog.content.substring(0, 120)}...
+                      {(relatedBlog.excerpt ?? relatedBlog.content).substring(0, 120)}...
                     </p>
                   </article>
                 </Link>
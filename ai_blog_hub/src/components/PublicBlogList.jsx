@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Link } from 'react-router-dom';
 import { blogAPI } from '../services/api';
 import { getApiErrorMessage } from '../utils/errorHandler';
@@ -7,56 +7,94 @@ import { Calendar, User, Tag, Search, BookOpen } from 'lucide-react';
 import { motion } from 'framer-motion';
 import ErrorDisplay from './ErrorDisplay';
 
+// Wait this long after the last keystroke before searching
+const SEARCH_DELAY_MS = 300;
+
+// Offline fallback only: the API filters server-side
+const matchesFilters = (blog, search, topic) => {
+  const term = search.toLowerCase();
+  const matchesSearch = !term ||
+    blog.title.toLowerCase().includes(term) ||
+    (blog.content ?? blog.excerpt ?? '').toLowerCase().includes(term);
+  return matchesSearch && (!topic || blog.topic === topic);
+};
+
 const PublicBlogList = () => {
   const [blogs, setBlogs] = useState([]);
-  const [filteredBlogs, setFilteredBlogs] = useState([]);
+  const [topics, setTopics] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
+  const [search, setSearch] = useState('');
   const [selectedTopic, setSelectedTopic] = useState('');
+  // Only the latest request may update the list (an earlier search can answer last)
+  const latestRequest = useRef(0);
 
   useEffect(() => {
-    fetchBlogs();
+    fetchTopics();
   }, []);
 
   useEffect(() => {
-    filterBlogs();
-  }, [blogs, searchTerm, selectedTopic]);
+    const timer = setTimeout(() => setSearch(searchTerm.trim()), SEARCH_DELAY_MS);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
+  useEffect(() => {
+    fetchBlogs();
+  }, [search, selectedTopic]);
+
+  const fetchTopics = async () => {
+    try {
+      const response = await blogAPI.getTopics();
+      setTopics(response.data);
+    } catch (error) {
+      setTopics([...new Set(mockBlogs.map(blog => blog.topic).filter(Boolean))]);
+    }
+  };
 
   const fetchBlogs = async () => {
+    const request = ++latestRequest.current;
     setLoading(true);
     setError('');
     try {
-      const response = await blogAPI.getAllBlogs();
-      setBlogs(response.data);
+      const params = {};
+      if (search) params.search = search;
+      if (selectedTopic) params.topic = selectedTopic;
+      const response = await blogAPI.getAllBlogs(params);
+      if (request !== latestRequest.current) return;
+      setBlogs(response.data.results);
+      setNextPage(response.data.next);
     } catch (error) {
+      if (request !== latestRequest.current) return;
       const errorMessage = getApiErrorMessage(error, 'fetch blogs');
       if (errorMessage.includes('Network Error')) {
         console.warn('API network error. Falling back to mock data for PublicBlogList.');
-        setBlogs(mockBlogs);
+        setBlogs(mockBlogs.filter(blog => matchesFilters(blog, search, selectedTopic)));
+        setNextPage(null);
       } else {
         setError(errorMessage);
       }
     } finally {
-      setLoading(false);
+      if (request === latestRequest.current) setLoading(false);
     }
   };
 
-  const filterBlogs = () => {
-    let filtered = blogs;
-
-    if (searchTerm) {
-      filtered = filtered.filter(blog =>
-        blog.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        blog.content.toLowerCase().includes(searchTerm.toLowerCase())
-      );
-    }
-
-    if (selectedTopic) {
-      filtered = filtered.filter(blog => blog.topic === selectedTopic);
+  // The next-page URL carries the search and topic of the request that returned it
+  const fetchMoreBlogs = async () => {
+    const request = latestRequest.current;
+    setLoadingMore(true);
+    try {
+      const response = await blogAPI.getBlogPage(nextPage);
+      if (request !== latestRequest.current) return;
+      setBlogs(prev => [...prev, ...response.data.results]);
+      setNextPage(response.data.next);
+    } catch (error) {
+      setError(getApiErrorMessage(error, 'fetch blogs'));
+    } finally {
+      setLoadingMore(false);
     }
-
-    setFilteredBlogs(filtered);
   };
 
   const formatDate = (dateString) => {
@@ -67,18 +105,13 @@ const PublicBlogList = () => {
     });
   };
 
-  const getUniqueTopics = () => {
-    const topics = blogs.map(blog => blog.topic).filter(Boolean);
-    return [...new Set(topics)];
-  };
-
   const truncateContent = (content, maxLength = 200) => {
     if (!content) return '';
     if (content.length <= maxLength) return content;
     return content.substring(0, maxLength) + '...';
   };
 
-  if (loading) {
+  if (loading && blogs.length === 0 && !search && !selectedTopic) {
     return (
       <div className="flex justify-center items-center h-64">
         <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-blue-600"></div>
@@ -123,7 +156,7 @@ const PublicBlogList = () => {
                   className="w-full px-3 py-2 border border-gray-300 dark:border-gray-600 bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100 rounded-md focus:outline-none focus:ring-blue-500 focus:border-blue-500"
                 >
                   <option value="">All Topics</option>
-                  {getUniqueTopics().map(topic => (
+                  {topics.map(topic => (
                     <option key={topic} value={topic}>{topic}</option>
                   ))}
                 </select>
@@ -131,11 +164,11 @@ const PublicBlogList = () => {
             </div>
             
             <div className="mt-4 text-sm text-gray-600 dark:text-gray-400">
-              Showing {filteredBlogs.length} of {blogs.length} blogs
+              {loading ? 'Searching...' : `Showing ${blogs.length}${nextPage ? '+' : ''} blogs`}
             </div>
           </div>
 
-          {filteredBlogs.length === 0 ? (
+          {!loading && blogs.length === 0 ? (
             <div className="text-center py-12 bg-white dark:bg-gray-800 rounded-lg">
               <div className="mx-auto h-12 w-12 flex items-center justify-center rounded-full bg-gray-100 dark:bg-gray-700">
                 <BookOpen className="h-6 w-6 text-gray-400 dark:text-gray-500" />
@@ -151,7 +184,7 @@ const PublicBlogList = () => {
             </div>
           ) : (
             <div className="grid gap-8 md:grid-cols-2 lg:grid-cols-3">
-              {filteredBlogs.map((blog, index) => (
+              {blogs.map((blog, index) => (
                 <motion.article
                   key={blog.id}
                   initial={{ opacity: 0, y: 20 }}
@@ -179,13 +212,13 @@ const PublicBlogList = () => {
                     </h2>
                     
                     <p className="text-gray-600 dark:text-gray-400 text-sm mb-4 line-clamp-3">
-                      {truncateContent(blog.content)}
+                      {truncateContent(blog.excerpt ?? blog.content)}
                     </p>
                     
                     <div className="flex items-center justify-between text-sm text-gray-500 dark:text-gray-400 mb-4">
                       <div className="flex items-center">
                         <User className="w-4 h-4 mr-1" />
-                        <span>{blog.meta_tags?.author || 'Anonymous'}</span>
+                        <span>{blog.meta_tags?.author || blog.author || 'Anonymous'}</span>
                       </div>
                       <div className="flex items-center">
                         <Calendar className="w-4 h-4 mr-1" />
@@ -204,6 +237,18 @@ const PublicBlogList = () => {
               ))}
             </div>
           )}
+
+          {nextPage && (
+            <div className="flex justify-center">
+              <button
+                onClick={fetchMoreBlogs}
+                disabled={loadingMore}
+                className="px-4 py-2 text-sm font-medium rounded-md border border-gray-300 dark:border-gray-600 text-gray-700 dark:text-gray-200 hover:bg-gray-50 dark:hover:bg-gray-700 disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
         </>
       )}
     </div>
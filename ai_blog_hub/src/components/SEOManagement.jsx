@@ -9,7 +9,9 @@ import ErrorDisplay from './ErrorDisplay';
 
 const SEOManagement = () => {
   const [blogs, setBlogs] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [refreshLoading, setRefreshLoading] = useState({});
   const [error, setError] = useState('');
   const [successMessage, setSuccessMessage] = useState('');
@@ -36,7 +38,8 @@ const SEOManagement = () => {
     setError('');
     try {
       const response = await blogAPI.getAllBlogs();
-      setBlogs(response.data);
+      setBlogs(response.data.results);
+      setNextPage(response.data.next);
     } catch (error) {
       const errorMessage = getApiErrorMessage(error, 'fetch blogs');
       if (errorMessage.includes('Network Error')) {
@@ -50,6 +53,19 @@ const SEOManagement = () => {
     }
   };
 
+  const fetchMoreBlogs = async () => {
+    setLoadingMore(true);
+    try {
+      const response = await blogAPI.getBlogPage(nextPage);
+      setBlogs(prev => [...prev, ...response.data.results]);
+      setNextPage(response.data.next);
+    } catch (error) {
+      setError(getApiErrorMessage(error, 'fetch blogs'));
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handlePreviewRefresh = (blogId) => {
     setRefreshLoading(prev => ({ ...prev, [blogId]: 'preview' }));
     navigate(`/admin/seo-management/preview/${blogId}`);
@@ -134,7 +150,7 @@ const SEOManagement = () => {
                     </div>
                     
                     <p className="text-gray-600 dark:text-gray-400 text-sm mb-3 line-clamp-2">
-                      {blog.content.substring(0, 150)}...
+                      {(blog.excerpt ?? blog.content).substring(0, 150)}...
                     </p>
                     
                     <div className="text-sm text-gray-500 dark:text-gray-400">
@@ -162,6 +178,18 @@ const SEOManagement = () => {
           ))}
         </div>
       )}
+
+      {nextPage && (
+        <div className="flex justify-center">
+          <button
+            onClick={fetchMoreBlogs}
+            disabled={loadingMore}
+            className="px-4 py-2 text-sm font-medium rounded-md border border-gray-300 dark:border-gray-600 text-gray-700 dark:text-gray-200 hover:bg-gray-50 dark:hover:bg-gray-700 disabled:opacity-50"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
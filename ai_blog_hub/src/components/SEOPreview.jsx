@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
-import { blogAPI, seoAPI } from '../services/api';
+import { seoAPI } from '../services/api';
 import { getApiErrorMessage } from '../utils/errorHandler';
 import { useAuth } from '../contexts/AuthContext';
 import { mockBlogs } from '../data/mockBlogs';
@@ -9,12 +9,21 @@ import DiffViewer from './DiffViewer';
 import { ArrowLeft, Check, Loader2, ShieldAlert } from 'lucide-react';
 import { motion } from 'framer-motion';
 
+// The old side of a server diff (everything but added parts), i.e. the current version of a field
+const currentText = (parts = []) => parts.filter((part) => !part.added).map((part) => part.value).join('');
+
+// A field replaced as a whole, for mock previews when the API is unreachable
+const replacedParts = (oldText = '', newText = '') =>
+  oldText === newText
+    ? [{ value: oldText }]
+    : [{ value: oldText, removed: true }, { value: newText, added: true }];
+
 const SEOPreview = () => {
   const { id } = useParams();
   const navigate = useNavigate();
   const { user } = useAuth();
 
-  const [originalBlog, setOriginalBlog] = useState(null);
+  // Preview metadata plus `fields`: title/content/meta diffs computed by the server
   const [previewBlog, setPreviewBlog] = useState(null);
   const [loading, setLoading] = useState(true);
   const [confirming, setConfirming] = useState(false);
@@ -24,11 +33,7 @@ const SEOPreview = () => {
     setLoading(true);
     setError('');
     try {
-      const [originalRes, previewRes] = await Promise.all([
-        blogAPI.getBlog(id),
-        seoAPI.previewRefresh(id),
-      ]);
-      setOriginalBlog(originalRes.data);
+      const previewRes = await seoAPI.previewRefresh(id, { diff: 1 });
       setPreviewBlog(previewRes.data);
     } catch (err) {
       const errorMessage = getApiErrorMessage(err, 'fetch blog preview');
@@ -36,19 +41,17 @@ const SEOPreview = () => {
         console.warn(`API network error. Falling back to mock data for SEO Preview on Blog ID: ${id}.`);
         const mockOriginal = mockBlogs.find(b => b.id === parseInt(id));
         if (mockOriginal) {
-          setOriginalBlog(mockOriginal);
           // Simulate an AI refresh for mock data
-          const mockPreview = {
-            ...mockOriginal,
-            title: `[AI Enhanced] ${mockOriginal.title}`,
-            content: `This is an AI-enhanced version of the original content. ${mockOriginal.content}`,
-            meta_tags: {
-              ...mockOriginal.meta_tags,
-              description: `Optimized for SEO: ${mockOriginal.meta_tags.description}`,
-              keywords: `${mockOriginal.meta_tags.keywords}, ai, seo, optimized`,
-            }
-          };
-          setPreviewBlog(mockPreview);
+          const description = mockOriginal.meta_tags.description;
+          const keywords = mockOriginal.meta_tags.keywords;
+          setPreviewBlog({
+            fields: {
+              title: replacedParts(mockOriginal.title, `[AI Enhanced] ${mockOriginal.title}`),
+              content: replacedParts(mockOriginal.content, `This is an AI-enhanced version of the original content. ${mockOriginal.content}`),
+              meta_description: replacedParts(description, `Optimized for SEO: ${description}`),
+              meta_keywords: replacedParts(keywords, `${keywords}, ai, seo, optimized`),
+            },
+          });
         } else {
           setError(`Blog with ID ${id} not found in mock data.`);
         }
@@ -64,21 +67,17 @@ const SEOPreview = () => {
     fetchData();
   }, [id]);
 
+const fields = previewBlog?.fields || {};
+
 const handleConfirm = async () => {
   setConfirming(true);
   setError('');
   try {
-    await seoAPI.confirmRefresh(id, {
-      title: previewBlog.preview_title,
-      content: previewBlog.preview_content,
-      meta_tags: {
-        description: previewBlog.preview_meta_tags?.description,
-        keywords: previewBlog.preview_meta_tags?.keywords,
-      }
-    });
+    // The server applies the stored preview; the version guards against a newer one
+    await seoAPI.confirmRefresh(id, { preview_version: previewBlog.preview_version });
 
     navigate('/admin/seo-management', {
-      state: { message: `Blog "${originalBlog.title}" has been successfully refreshed.` },
+      state: { message: `Blog "${currentText(fields.title)}" has been successfully refreshed.` },
     });
   } catch (err) {
     const errorMessage = getApiErrorMessage(err, 'confirm blog refresh');
@@ -97,11 +96,11 @@ const handleConfirm = async () => {
     );
   }
 
-  if (error && !originalBlog) {
+  if (error && !previewBlog) {
     return <ErrorDisplay error={error} onRetry={fetchData} />;
   }
   
-  if (!originalBlog || !previewBlog) return null;
+  if (!previewBlog) return null;
 
   return (
     <motion.div 
@@ -129,19 +128,19 @@ const handleConfirm = async () => {
           <h2 className="text-xl font-semibold text-gray-800 dark:text-gray-200 border-b border-gray-200 dark:border-gray-700 pb-2">Current Version</h2>
           <div>
             <h3 className="font-medium text-gray-700 dark:text-gray-300">Title</h3>
-            <p className="text-sm text-gray-600 dark:text-gray-400 bg-gray-50 dark:bg-gray-700/50 p-2 rounded border border-gray-200 dark:border-gray-600">{originalBlog.title}</p>
+            <p className="text-sm text-gray-600 dark:text-gray-400 bg-gray-50 dark:bg-gray-700/50 p-2 rounded border border-gray-200 dark:border-gray-600">{currentText(fields.title)}</p>
           </div>
           <div>
             <h3 className="font-medium text-gray-700 dark:text-gray-300">Content</h3>
-            <p className="text-sm text-gray-600 dark:text-gray-400 bg-gray-50 dark:bg-gray-700/50 p-2 rounded border border-gray-200 dark:border-gray-600 max-h-60 overflow-y-auto">{originalBlog.content}</p>
+            <p className="text-sm text-gray-600 dark:text-gray-400 bg-gray-50 dark:bg-gray-700/50 p-2 rounded border border-gray-200 dark:border-gray-600 max-h-60 overflow-y-auto">{currentText(fields.content)}</p>
           </div>
           <div>
             <h3 className="font-medium text-gray-700 dark:text-gray-300">Meta Description</h3>
-            <p className="text-sm text-gray-600 dark:text-gray-400 bg-gray-50 dark:bg-gray-700/50 p-2 rounded border border-gray-200 dark:border-gray-600">{originalBlog.meta_tags?.description || 'N/A'}</p>
+            <p className="text-sm text-gray-600 dark:text-gray-400 bg-gray-50 dark:bg-gray-700/50 p-2 rounded border border-gray-200 dark:border-gray-600">{currentText(fields.meta_description) || 'N/A'}</p>
           </div>
           <div>
             <h3 className="font-medium text-gray-700 dark:text-gray-300">Keywords</h3>
-            <p className="text-sm text-gray-600 dark:text-gray-400 bg-gray-50 dark:bg-gray-700/50 p-2 rounded border border-gray-200 dark:border-gray-600">{originalBlog.meta_tags?.keywords || 'N/A'}</p>
+            <p className="text-sm text-gray-600 dark:text-gray-400 bg-gray-50 dark:bg-gray-700/50 p-2 rounded border border-gray-200 dark:border-gray-600">{currentText(fields.meta_keywords) || 'N/A'}</p>
           </div>
         </div>
 
@@ -150,22 +149,47 @@ const handleConfirm = async () => {
           <h2 className="text-xl font-semibold text-blue-800 dark:text-blue-300 border-b border-blue-200 dark:border-blue-800 pb-2">AI-Generated SEO Version</h2>
           <div>
             <h3 className="font-medium text-gray-700 dark:text-gray-300">Title</h3>
-            <DiffViewer oldText={originalBlog.title} newText={previewBlog.preview_title} />
+            <DiffViewer parts={fields.title} />
           </div>
           <div>
             <h3 className="font-medium text-gray-700 dark:text-gray-300">Content</h3>
             <div className="max-h-60 overflow-y-auto">
-              <DiffViewer oldText={originalBlog.content} newText={previewBlog.preview_content} />
+              <DiffViewer parts={fields.content} />
             </div>
           </div>
           <div>
             <h3 className="font-medium text-gray-700 dark:text-gray-300">Meta Description</h3>
-            <DiffViewer oldText={originalBlog.meta_tags?.description} newText={previewBlog.preview_meta_tags?.description} />
+            <DiffViewer parts={fields.meta_description} />
           </div>
           <div>
             <h3 className="font-medium text-gray-700 dark:text-gray-300">Keywords</h3>
-            <DiffViewer oldText={originalBlog.meta_tags?.keywords} newText={previewBlog.preview_meta_tags?.keywords} />
+            <DiffViewer parts={fields.meta_keywords} />
           </div>
+          {previewBlog.missed_keywords?.length > 0 && (
+            <div>
+              <h3 className="font-medium text-gray-700 dark:text-gray-300">Missed Keyword Opportunities</h3>
+              <div className="flex flex-wrap gap-2">
+                {previewBlog.missed_keywords.map((keyword) => (
+                  <span key={keyword.phrase} title={`Used by ${keyword.posts} posts on this topic`} className="text-xs px-2 py-1 rounded-full bg-yellow-50 dark:bg-yellow-900/20 text-yellow-700 dark:text-yellow-300 border border-yellow-200 dark:border-yellow-800">
+                    {keyword.phrase}
+                  </span>
+                ))}
+              </div>
+            </div>
+          )}
+          {previewBlog.related_posts?.length > 0 && (
+            <div>
+              <h3 className="font-medium text-gray-700 dark:text-gray-300">Suggested Internal Links</h3>
+              <ul className="text-sm space-y-1">
+                {previewBlog.related_posts.map((post) => (
+                  <li key={post.id} className="flex justify-between bg-gray-50 dark:bg-gray-700/50 p-2 rounded border border-gray-200 dark:border-gray-600">
+                    <a href={`/blogs/${post.id}`} target="_blank" rel="noreferrer" className="text-blue-600 dark:text-blue-400 hover:underline">{post.title}</a>
+                    <span className="text-gray-500 dark:text-gray-400">{Math.round(post.score * 100)}%</span>
+                  </li>
+                ))}
+              </ul>
+            </div>
+          )}
         </div>
       </div>
       
@@ -144,7 +144,12 @@ export const authAPI = {
 
 // Blog APIs
 export const blogAPI = {
-  getAllBlogs: () => api.get('/blogs/'),
+  // One cursor page ({ results, next, previous }); params: page_size, topic, search, fields
+  getAllBlogs: (params) => api.get('/blogs/', { params }),
+  // Every topic in use, sorted
+  getTopics: () => api.get('/blogs/topics/'),
+  // Follow a `next` / `previous` URL from a page
+  getBlogPage: (url) => api.get(url),
   getBlog: (id) => api.get(`/blogs/${id}/`),
   createBlog: (blogData) => api.post('/blogs/', blogData),
   updateBlog: (id, blogData) => api.put(`/blogs/${id}/`, blogData),
@@ -154,7 +159,8 @@ export const blogAPI = {
 
 // SEO APIs
 export const seoAPI = {
-  previewRefresh: (id) => api.get(`/refresh-blog/${id}/preview/`),
+  // params.diff = 1 returns the change as server-computed line parts instead of the full preview
+  previewRefresh: (id, params) => api.get(`/refresh-blog/${id}/preview/`, { params }),
   confirmRefresh: (id, data) => api.post(`/refresh-blog/${id}/confirm/`, data),
 };
 
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:06
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+# Existing posts have never been refreshed: they are as fresh as when they were written
+def backfill_last_refreshed_at(apps, schema_editor):
+    Blog = apps.get_model("blog", "Blog")
+    Blog.objects.update(last_refreshed_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_blog_preview_data'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='last_refreshed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_last_refreshed_at, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='blog',
+            name='staleness_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['-created_at', '-id'], name='blog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['topic', 'last_refreshed_at'], name='blog_topic_refreshed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['last_refreshed_at'], name='blog_refreshed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['topic', '-staleness_score'], name='blog_topic_staleness_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['author', 'updated_at'], name='blog_author_updated_idx'),
+        ),
+    ]
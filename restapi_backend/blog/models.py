@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 class Blog(models.Model):
     title = models.CharField(max_length=255)
@@ -12,8 +13,24 @@ class Blog(models.Model):
 
       # 🔹 New field for storing preview SEO refresh
     preview_data = models.JSONField(null=True, blank=True)
+    # When the content was written or last refreshed by the SEO pipeline
+    last_refreshed_at = models.DateTimeField(default=timezone.now)
+    # Outdated spans per 1,000 characters, written by the SEO analysis stage (null = not analysed yet)
+    staleness_score = models.FloatField(null=True, blank=True)
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # List ordering / cursor pagination
+            models.Index(fields=["-created_at", "-id"], name="blog_created_idx"),
+            # Staleness selection: "topic X not refreshed since ..., oldest first", with and without topic
+            models.Index(fields=["topic", "last_refreshed_at"], name="blog_topic_refreshed_idx"),
+            models.Index(fields=["last_refreshed_at"], name="blog_refreshed_idx"),
+            models.Index(fields=["topic", "-staleness_score"], name="blog_topic_staleness_idx"),
+            # ... and most outdated first across all topics
+            models.Index(fields=["-staleness_score", "id"], name="blog_staleness_idx"),
+            models.Index(fields=["author", "updated_at"], name="blog_author_updated_idx"),
+        ]
 
     def __str__(self):
         return self.title
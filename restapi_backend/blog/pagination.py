@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class BlogCursorPagination(CursorPagination):
+    """
+    Newest posts first. Cursor pages stay fast on large tables (no OFFSET/COUNT) and don't
+    skip or repeat posts when new ones are created while a client is paging.
+    """
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
@@ -1,10 +1,48 @@
 from rest_framework import serializers
 from .models import Blog
 
-class BlogSerializer(serializers.ModelSerializer):
+
+# Field names from ?fields=id,title,... on read requests, or None when all fields are wanted
+def requested_fields(request):
+    if request is None or request.method not in ("GET", "HEAD", "OPTIONS"):
+        return None
+    fields = request.query_params.get("fields")
+    if not fields:
+        return None
+    return {name.strip() for name in fields.split(",") if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Only serializes the fields named in ?fields= (sparse fieldsets). Unknown names are ignored.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        requested = requested_fields(self.context.get("request"))
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+
+class BlogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     author = serializers.ReadOnlyField(source="author.username")
 
     class Meta:
         model = Blog
         fields = "__all__"
-        read_only_fields = ("id", "created_at", "updated_at", "author")
+        # Refresh bookkeeping is written by the SEO pipeline only; authors must not reorder staleness or scheduling
+        read_only_fields = ("id", "created_at", "updated_at", "author", "last_refreshed_at", "staleness_score")
+
+
+class BlogListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Lightweight list entry: no content body, meta tags or preview, just a short excerpt
+    computed by the database.
+    """
+    author = serializers.ReadOnlyField(source="author.username")
+    excerpt = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Blog
+        fields = ("id", "title", "topic", "author", "excerpt", "created_at", "updated_at")
+        read_only_fields = fields
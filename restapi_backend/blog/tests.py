@@ -1,3 +1,134 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import Blog
+from .views import EXCERPT_LENGTH
+
+URL = "/api/blogs/"
+
+
+class BlogListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user("writer", password="pw")
+        # Same created_at for several posts, so the id tiebreaker is exercised too
+        cls.blogs = Blog.objects.bulk_create([
+            Blog(title=f"Post {i}", content=f"Body {i} " * 100, topic="seo" if i % 2 else "ads", author=cls.author)
+            for i in range(45)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def pages(self, params=None):
+        response = self.client.get(URL, params or {})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            yield response.data
+            if not response.data["next"]:
+                return
+            response = self.client.get(response.data["next"])
+
+    def test_pages_cover_every_post_once_newest_first(self):
+        pages = list(self.pages())
+        self.assertEqual([len(page["results"]) for page in pages], [20, 20, 5])
+        ids = [post["id"] for page in pages for post in page["results"]]
+        expected = list(Blog.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_posts_created_while_paging_do_not_shift_pages(self):
+        pages = self.pages({"page_size": 10})
+        seen = [post["id"] for post in next(pages)["results"]]
+        Blog.objects.create(title="Newest", content="x", author=self.author)
+        for page in pages:
+            seen += [post["id"] for post in page["results"]]
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), {blog.pk for blog in self.blogs})
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(URL, {"page_size": 1000})
+        self.assertEqual(len(response.data["results"]), 45)
+        response = self.client.get(URL, {"page_size": 5})
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_list_entries_have_an_excerpt_instead_of_the_body(self):
+        post = self.client.get(URL).data["results"][0]
+        self.assertNotIn("content", post)
+        self.assertNotIn("preview_data", post)
+        self.assertEqual(len(post["excerpt"]), EXCERPT_LENGTH)
+        self.assertEqual(post["author"], "writer")
+
+    def test_sparse_fieldsets(self):
+        post = self.client.get(URL, {"fields": "id,title"}).data["results"][0]
+        self.assertEqual(set(post), {"id", "title"})
+        post = self.client.get(URL, {"fields": "id,content"}).data["results"][0]
+        self.assertEqual(set(post), {"id", "content"})
+
+    def test_topic_filter(self):
+        titles = [post["title"] for page in self.pages({"topic": "ads"}) for post in page["results"]]
+        self.assertEqual(len(titles), 23)
+
+    def test_detail_has_the_full_post(self):
+        blog = self.blogs[0]
+        response = self.client.get(f"{URL}{blog.pk}/")
+        self.assertEqual(response.data["content"], blog.content)
+
+
+class BlogUpdateTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user("writer", password="pw")
+        self.blog = Blog.objects.create(title="Post", content="Body", author=self.author, staleness_score=2.5)
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def test_refresh_bookkeeping_is_read_only(self):
+        refreshed_at = self.blog.last_refreshed_at
+        response = self.client.patch(
+            f"{URL}{self.blog.pk}/",
+            {"title": "Renamed", "staleness_score": 999.0, "last_refreshed_at": "2000-01-01T00:00:00Z"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.title, "Renamed")
+        self.assertEqual(self.blog.staleness_score, 2.5)
+        self.assertEqual(self.blog.last_refreshed_at, refreshed_at)
+
+
+class BlogSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user("writer", password="pw")
+        filler = "Nothing to see here. " * 20
+        cls.deep = Blog.objects.create(
+            title="Deep", content=filler + "Drip campaigns convert.", topic="email", author=author
+        )
+        Blog.objects.bulk_create([
+            Blog(title=f"Post {i}", content=filler, topic="seo" if i % 2 else "ads", author=author) for i in range(30)
+        ])
+        Blog.objects.create(title="Drip campaigns 101", content="Basics.", topic="ads", author=author)
+        Blog.objects.create(title="Untitled topic", content="x", topic="", author=author)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def titles(self, **params):
+        titles, response = [], self.client.get(URL, dict(params, page_size=5))
+        while True:
+            titles += [post["title"] for post in response.data["results"]]
+            if not response.data["next"]:
+                return titles
+            response = self.client.get(response.data["next"])
+
+    def test_search_matches_titles_and_text_past_the_excerpt_on_any_page(self):
+        self.assertEqual(sorted(self.titles(search="drip CAMPAIGNS")), ["Deep", "Drip campaigns 101"])
+
+    def test_search_and_topic_combine(self):
+        self.assertEqual(self.titles(search="drip", topic="email"), ["Deep"])
+        self.assertEqual(len(self.titles(topic="seo")), 15)
+
+    def test_topics_lists_every_topic_in_use(self):
+        response = self.client.get(f"{URL}topics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, ["ads", "email", "seo"])
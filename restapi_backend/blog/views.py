@@ -1,12 +1,62 @@
+from django.db.models import Q
+from django.db.models.functions import Substr
 from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from .models import Blog
-from .serializers import BlogSerializer
+from .pagination import BlogCursorPagination
+from .serializers import BlogListSerializer, BlogSerializer, requested_fields
 from .permissions import IsAuthorOrReadOnly
 
+# Large columns the list endpoint doesn't load unless asked for with ?fields=
+HEAVY_FIELDS = ("content", "meta_tags", "preview_data")
+EXCERPT_LENGTH = 200
+
+
 class BlogViewSet(viewsets.ModelViewSet):
-    queryset = Blog.objects.all()
+    queryset = Blog.objects.select_related("author")
     serializer_class = BlogSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
+    pagination_class = BlogCursorPagination
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            requested = requested_fields(self.request)
+            # Fields outside the list serializer (e.g. ?fields=id,content) fall back to the full one
+            if requested is None or requested <= set(BlogListSerializer.Meta.fields):
+                return BlogListSerializer
+        return BlogSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+
+        topic = self.request.query_params.get("topic")
+        if topic:
+            queryset = queryset.filter(topic=topic)
+        # ?search= matches the title or anywhere in the body, across every page
+        search = self.request.query_params.get("search", "").strip()
+        if search:
+            queryset = queryset.filter(Q(title__icontains=search) | Q(content__icontains=search))
+
+        requested = requested_fields(self.request)
+        if self.get_serializer_class() is BlogListSerializer:
+            queryset = queryset.defer(*HEAVY_FIELDS)
+            if requested is None or "excerpt" in requested:
+                queryset = queryset.annotate(excerpt=Substr("content", 1, EXCERPT_LENGTH))
+        elif requested:
+            queryset = queryset.defer(*[name for name in HEAVY_FIELDS if name not in requested])
+        return queryset
+
+    # Every topic in use, for the list's topic filter (not just those on the loaded pages)
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def topics(self, request):
+        topics = (
+            Blog.objects.exclude(topic__isnull=True).exclude(topic="")
+            .order_by("topic").values_list("topic", flat=True).distinct()
+        )
+        return Response(list(topics))
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
@@ -10,7 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -41,6 +43,7 @@ INSTALLED_APPS = [
     "rest_framework",
     "rest_framework.authtoken",
     "blog",
+    "seo",
     # optional
     "corsheaders",
 ]
@@ -98,12 +101,55 @@ WSGI_APPLICATION = 'blogproject.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=sqlite (default) or postgres.
+# SQLite writers wait up to DB_BUSY_TIMEOUT seconds for the lock and take it up front (IMMEDIATE)
+# instead of failing on upgrade. DB_SQLITE_WAL=1 switches the database file to WAL mode so API reads
+# aren't blocked by a refresh being written; it's opt-in because it rewrites the file's header.
+# PostgreSQL (needs psycopg) keeps connections open for DB_CONN_MAX_AGE seconds, or uses psycopg's
+# connection pool when DB_POOL_MAX_SIZE is set (needs psycopg[pool]).
+DB_ENGINE = os.environ.get("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get("DB_NAME", "blogproject"),
+            'USER': os.environ.get("DB_USER", "postgres"),
+            'PASSWORD': os.environ.get("DB_PASSWORD", ""),
+            'HOST': os.environ.get("DB_HOST", "localhost"),
+            'PORT': os.environ.get("DB_PORT", "5432"),
+            'CONN_MAX_AGE': int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
     }
-}
+    if os.environ.get("DB_POOL_MAX_SIZE"):
+        # The pool owns connection reuse, so Django must close (return) them after each request
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ["DB_POOL_MAX_SIZE"]),
+            "timeout": int(os.environ.get("DB_POOL_TIMEOUT", "10")),
+        }
+elif DB_ENGINE == "sqlite":
+    SQLITE_WAL = os.environ.get("DB_SQLITE_WAL", "0") == "1"
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get("DB_NAME", str(BASE_DIR / 'db.sqlite3')),
+            'OPTIONS': {
+                'timeout': int(os.environ.get("DB_BUSY_TIMEOUT", "20")),
+                'transaction_mode': 'IMMEDIATE',
+                'init_command': (
+                    ("PRAGMA journal_mode=WAL;PRAGMA synchronous=NORMAL;" if SQLITE_WAL else "")
+                    + "PRAGMA temp_store=MEMORY;"
+                    f"PRAGMA cache_size=-{int(os.environ.get('DB_SQLITE_CACHE_KB', '20000'))}"
+                ),
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unsupported DB_ENGINE '{DB_ENGINE}'. Use 'sqlite' or 'postgres'.")
 
 
 # Password validation
@@ -176,3 +222,126 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# SEO refresh models (spaCy + flan-t5) load lazily on first use.
+# Set SEO_PREWARM_MODELS=1 on AI workers to load them at startup instead.
+SEO_PREWARM_MODELS = os.environ.get("SEO_PREWARM_MODELS", "0") == "1"
+
+# Chunks per model.generate call when rewriting a post
+SEO_GENERATION_BATCH_SIZE = int(os.environ.get("SEO_GENERATION_BATCH_SIZE", "8"))
+
+# Background refresh jobs: "thread" runs them in a pool inside each web process,
+# "database" leaves them queued for `manage.py run_refresh_worker`.
+SEO_REFRESH_QUEUE = os.environ.get("SEO_REFRESH_QUEUE", "thread")
+SEO_REFRESH_WORKERS = int(os.environ.get("SEO_REFRESH_WORKERS", "2"))
+
+# Cache backends. The "seo" alias is the optional persistent tier for analysis results,
+# shared by all workers on the box and kept across restarts.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "seo": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("SEO_CACHE_DIR", str(BASE_DIR / ".seo_cache")),
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    },
+}
+
+# In-memory LRU size per worker, plus the cache alias used as the persistent tier
+# (set SEO_PERSISTENT_CACHE=0 to keep analysis results in memory only).
+SEO_ANALYSIS_CACHE = {
+    "MAX_ENTRIES": int(os.environ.get("SEO_ANALYSIS_CACHE_ENTRIES", "512")),
+    "PERSISTENT_ALIAS": "seo" if os.environ.get("SEO_PERSISTENT_CACHE", "1") == "1" else None,
+}
+
+# Posts streamed through nlp.pipe and generation together in a bulk refresh
+SEO_BULK_POSTS_PER_BATCH = int(os.environ.get("SEO_BULK_POSTS_PER_BATCH", "16"))
+
+# Worker processes nlp.pipe uses when analysing many posts (bulk refresh)
+SEO_NLP_PROCESSES = int(os.environ.get("SEO_NLP_PROCESSES", "1"))
+
+# Outdated-info detection uses a regex scanner; set SEO_OUTDATED_NER_PASS=1 to also
+# check bare numbers with spaCy NER (slower, fewer false positives).
+SEO_OUTDATED_NER_PASS = os.environ.get("SEO_OUTDATED_NER_PASS", "0") == "1"
+
+# Chunks generated together before each streamed preview event (1 = lowest time-to-first-chunk)
+SEO_STREAM_BATCH_SIZE = int(os.environ.get("SEO_STREAM_BATCH_SIZE", "1"))
+
+# Most tokens of post text packed into one generation prompt (chunks follow sentence boundaries)
+SEO_CHUNK_TOKEN_BUDGET = int(os.environ.get("SEO_CHUNK_TOKEN_BUDGET", "240"))
+
+# "full" rewrites every chunk of a post; "incremental" rewrites only paragraphs with outdated
+# info (and the intro if target keywords are missing). Previews can override with ?mode=.
+SEO_REFRESH_MODE = os.environ.get("SEO_REFRESH_MODE", "full")
+
+# Generation backend: "torch" (fp32 eager), "torch-int8" (dynamic int8 quantization, CPU)
+# or "onnx" (ONNX Runtime with KV cache; needs optimum[onnxruntime]). A backend that can't load falls back to "torch".
+SEO_GENERATION_BACKEND = os.environ.get("SEO_GENERATION_BACKEND", "torch")
+# Where the ONNX export is saved and reused across workers (exported on first load if missing)
+SEO_ONNX_MODEL_DIR = os.environ.get("SEO_ONNX_MODEL_DIR", str(BASE_DIR / ".onnx" / "flan-t5-base"))
+
+# "sample" draws fresh text on every call; "greedy" and "seeded" (sampling with SEO_GENERATION_SEED)
+# are deterministic, so results are cached per prompt, model and decoding parameters
+SEO_GENERATION_MODE = os.environ.get("SEO_GENERATION_MODE", "sample")
+SEO_GENERATION_SEED = int(os.environ.get("SEO_GENERATION_SEED", "0"))
+SEO_GENERATION_CACHE = {
+    "MAX_ENTRIES": int(os.environ.get("SEO_GENERATION_CACHE_ENTRIES", "2048")),
+    "TIMEOUT": int(os.environ.get("SEO_GENERATION_CACHE_TIMEOUT", str(7 * 24 * 3600))),
+    "PERSISTENT_ALIAS": SEO_ANALYSIS_CACHE["PERSISTENT_ALIAS"],
+}
+
+# Shared inference server (`manage.py run_inference_server`). When set, web workers send generation
+# and NER work to it instead of loading models themselves; with SEO_INFERENCE_FALLBACK they load
+# models in-process while it is unreachable.
+SEO_INFERENCE_SERVER_URL = os.environ.get("SEO_INFERENCE_SERVER_URL", "")
+SEO_INFERENCE_TIMEOUT = int(os.environ.get("SEO_INFERENCE_TIMEOUT", "300"))
+SEO_INFERENCE_FALLBACK = os.environ.get("SEO_INFERENCE_FALLBACK", "1") == "1"
+
+# Send per-stage durations of the preview endpoint in a Server-Timing header (visible in browser devtools)
+SEO_SERVER_TIMING = os.environ.get("SEO_SERVER_TIMING", "1" if DEBUG else "0") == "1"
+# Bearer token Prometheus must send to /api/seo/metrics/ (empty = superusers only)
+SEO_METRICS_TOKEN = os.environ.get("SEO_METRICS_TOKEN", "")
+
+# Internal-link suggestions: TF-IDF vectors of every post, memory-mapped from SEO_SIMILARITY_INDEX_DIR
+# and shared by all workers (build it with `manage.py build_similarity_index`). Saved posts are
+# re-indexed automatically unless SEO_SIMILARITY_AUTO_UPDATE=0.
+SEO_SIMILARITY_INDEX_DIR = os.environ.get("SEO_SIMILARITY_INDEX_DIR", str(BASE_DIR / ".seo_index"))
+SEO_SIMILARITY_DIMENSIONS = int(os.environ.get("SEO_SIMILARITY_DIMENSIONS", "512"))
+SEO_SIMILARITY_AUTO_UPDATE = os.environ.get("SEO_SIMILARITY_AUTO_UPDATE", "1") == "1"
+# Test runs write to a temporary similarity index instead of SEO_SIMILARITY_INDEX_DIR
+TEST_RUNNER = "seo.testing.SeoTestRunner"
+# Related posts returned with each refresh preview, and the lowest cosine similarity worth suggesting
+SEO_RELATED_POSTS = int(os.environ.get("SEO_RELATED_POSTS", "5"))
+SEO_RELATED_MIN_SCORE = float(os.environ.get("SEO_RELATED_MIN_SCORE", "0.05"))
+
+# Missed keyword opportunities in refresh previews: at most SEO_MISSED_KEYWORDS phrases that at
+# least SEO_MISSED_KEYWORD_MIN_POSTS other posts of the same topic use and the post doesn't
+SEO_MISSED_KEYWORDS = int(os.environ.get("SEO_MISSED_KEYWORDS", "10"))
+SEO_MISSED_KEYWORD_MIN_POSTS = int(os.environ.get("SEO_MISSED_KEYWORD_MIN_POSTS", "2"))
+# Saved posts are keyword-indexed on a background thread after commit; 0 indexes them right after the commit
+SEO_KEYWORD_INDEX_ASYNC = os.environ.get("SEO_KEYWORD_INDEX_ASYNC", "1") == "1"
+
+# Scheduled refreshes (`manage.py run_refresh_scheduler`): every post with a RefreshPolicy is refreshed
+# SEO_REFRESH_INTERVAL_DAYS after its last refresh; new posts get a policy when SEO_SCHEDULE_NEW_POSTS=1
+# (existing ones with `manage.py schedule_refresh`). The scheduler runs at most WORKERS tasks of
+# POSTS_PER_TASK posts at once, starts at most MAX_PER_MINUTE posts a minute, pauses while the load
+# average per CPU is above MAX_LOAD_PER_CPU, and retries failures after BACKOFF_BASE seconds, doubling
+# up to BACKOFF_MAX.
+SEO_REFRESH_INTERVAL_DAYS = int(os.environ.get("SEO_REFRESH_INTERVAL_DAYS", "182"))
+SEO_SCHEDULE_NEW_POSTS = os.environ.get("SEO_SCHEDULE_NEW_POSTS", "1") == "1"
+SEO_SCHEDULER = {
+    "WORKERS": int(os.environ.get("SEO_SCHEDULER_WORKERS", "2")),
+    "POSTS_PER_TASK": int(os.environ.get("SEO_SCHEDULER_POSTS_PER_TASK", "4")),
+    "MAX_PER_MINUTE": float(os.environ.get("SEO_SCHEDULER_MAX_PER_MINUTE", "30")),
+    "MAX_LOAD_PER_CPU": float(os.environ.get("SEO_SCHEDULER_MAX_LOAD_PER_CPU", "0.8")),
+    "POLL_INTERVAL": float(os.environ.get("SEO_SCHEDULER_POLL_INTERVAL", "30")),
+    "LEASE_MINUTES": int(os.environ.get("SEO_SCHEDULER_LEASE_MINUTES", "30")),
+    "BACKOFF_BASE": int(os.environ.get("SEO_SCHEDULER_BACKOFF_BASE", "300")),
+    "BACKOFF_MAX": int(os.environ.get("SEO_SCHEDULER_BACKOFF_MAX", str(24 * 3600))),
+}
+
+# Refresh revision history: every SEO_REVISION_SNAPSHOT_EVERY-th revision of a post is stored whole,
+# the ones in between as compressed line deltas, so rebuilding a version applies at most that many - 1
+SEO_REVISION_SNAPSHOT_EVERY = int(os.environ.get("SEO_REVISION_SNAPSHOT_EVERY", "10"))
@@ -1,3 +1,31 @@
 from django.contrib import admin
+from .models import BulkRefreshRun, KeywordPhrase, RefreshJob, RefreshPolicy
 
-# Register your models here.
+
+@admin.register(RefreshJob)
+class RefreshJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "blog", "action", "status", "created_at", "finished_at")
+    list_filter = ("action", "status")
+    readonly_fields = ("created_at", "started_at", "finished_at")
+
+
+@admin.register(BulkRefreshRun)
+class BulkRefreshRunAdmin(admin.ModelAdmin):
+    list_display = ("id", "status", "apply", "processed", "total", "created_at", "finished_at")
+    list_filter = ("status", "apply")
+    readonly_fields = ("created_at", "started_at", "updated_at", "finished_at")
+
+
+
+@admin.register(RefreshPolicy)
+class RefreshPolicyAdmin(admin.ModelAdmin):
+    list_display = ("blog", "enabled", "interval", "auto_apply", "next_run_at", "last_status", "failures")
+    list_filter = ("enabled", "auto_apply", "last_status")
+    readonly_fields = ("leased_until", "last_run_at", "last_status", "failures", "last_error")
+
+
+@admin.register(KeywordPhrase)
+class KeywordPhraseAdmin(admin.ModelAdmin):
+    list_display = ("phrase", "document_frequency")
+    search_fields = ("phrase",)
+    ordering = ("-document_frequency",)
@@ -0,0 +1,71 @@
+from datetime import datetime
+from functools import lru_cache
+from importlib import metadata
+
+from django.conf import settings
+
+from .cache import TieredCache, make_key
+from .registry import NLP_MODEL_NAME
+from .utils import detect_outdated, detect_outdated_many, extract_keywords, outdated_ner_pass
+
+# Bump when detect_outdated / extract_keywords change what they return
+ANALYSIS_VERSION = 3
+
+_cache_settings = getattr(settings, "SEO_ANALYSIS_CACHE", {})
+analysis_cache = TieredCache(
+    "analysis",
+    max_entries=_cache_settings.get("MAX_ENTRIES", 512),
+    persistent_alias=_cache_settings.get("PERSISTENT_ALIAS"),
+)
+
+
+# Installed NLP model version, so upgrading spaCy models invalidates old results
+@lru_cache(maxsize=1)
+def nlp_model_version():
+    if not outdated_ner_pass():
+        return "scanner"
+    try:
+        return f"{NLP_MODEL_NAME}-{metadata.version(NLP_MODEL_NAME)}"
+    except metadata.PackageNotFoundError:
+        return NLP_MODEL_NAME
+
+
+# Cache key: content hash + model/analysis version + year (years are only outdated relative to now)
+def analysis_key(content):
+    return make_key("analysis", ANALYSIS_VERSION, nlp_model_version(), datetime.now().year, content)
+
+
+# Outdated spans and keywords for a post, computed once per distinct content
+def analyze_content(content):
+    def compute():
+        return {
+            "outdated": [list(span) for span in detect_outdated(content)],
+            "keywords": extract_keywords(content),
+        }
+
+    return _from_cached(analysis_cache.get_or_compute(analysis_key(content), compute))
+
+
+# Analyse many posts, streaming only the cache misses through nlp.pipe together
+def analyze_many(contents, batch_size=32):
+    keys = [analysis_key(content) for content in contents]
+    results = [analysis_cache.get(key) for key in keys]
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        outdated = detect_outdated_many([contents[i] for i in missing], batch_size=batch_size)
+        for i, spans in zip(missing, outdated):
+            results[i] = {
+                "outdated": [list(span) for span in spans],
+                "keywords": extract_keywords(contents[i]),
+            }
+            analysis_cache.set(keys[i], results[i])
+
+    return [_from_cached(result) for result in results]
+
+
+def _from_cached(result):
+    return {
+        "outdated": [tuple(span) for span in result["outdated"]],
+        "keywords": list(result["keywords"]),
+    }
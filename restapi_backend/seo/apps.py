@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class SeoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'seo'
+
+    def ready(self):
+        # Re-index posts in the keyword and similarity indexes when they are saved or deleted
+        from . import signals  # noqa: F401
+        # Models load lazily on first use; AI workers can opt into loading them at boot
+        if getattr(settings, "SEO_PREWARM_MODELS", False):
+            from .registry import registry
+            registry.warm()
@@ -0,0 +1,161 @@
+import logging
+import os
+import threading
+
+from django.conf import settings
+
+from .inference_client import InferenceUnavailable, fallback_enabled, get_client
+from .metrics import count, stage
+from .registry import GENERATION_MODEL_NAME, registry
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationBackend:
+    """
+    Runs seq2seq generation for a batch of prompts. Subclasses only differ in how the model is
+    loaded; tokenization, decoding settings and output are the same for every backend.
+    """
+    name = None
+
+    def __init__(self, model_name=GENERATION_MODEL_NAME):
+        self.model_name = model_name
+        self.tokenizer = registry.get("tokenizer")
+        self.device = "cpu"
+        self.model = self.load_model()
+
+    def load_model(self):
+        raise NotImplementedError
+
+    # do_sample=False decodes greedily (temperature/top_p are ignored); a seed makes sampling reproducible.
+    # The seed is global to the model, so seeded prompts are generated one at a time: in a shared batch
+    # a prompt's sample would depend on its batchmates, while its cached result is keyed per prompt.
+    def generate(self, prompts, max_length=256, temperature=0.7, top_p=0.9, do_sample=True, seed=None):
+        if do_sample and seed is not None and len(prompts) > 1:
+            return [
+                text
+                for prompt in prompts
+                for text in self.generate([prompt], max_length, temperature, top_p, do_sample, seed)
+            ]
+        with stage("tokenize"):
+            inputs = self.tokenizer(prompts, return_tensors="pt", padding=True, truncation=True).to(self.device)
+        sampling = {"temperature": temperature, "top_p": top_p} if do_sample else {}
+        if do_sample and seed is not None:
+            from transformers import set_seed
+            set_seed(seed)
+        with stage("model_generate"):
+            outputs = self.model.generate(
+                **inputs,
+                max_length=max_length,
+                do_sample=do_sample,
+                num_return_sequences=1,
+                pad_token_id=self.tokenizer.pad_token_id,
+                **sampling
+            )
+        count("generation_tokens", int(inputs["attention_mask"].sum()), direction="in")
+        count("generation_tokens", int((outputs != self.tokenizer.pad_token_id).sum()), direction="out")
+        with stage("decode"):
+            return self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+
+# PyTorch eager mode, fp32 (GPU if available)
+class TorchBackend(GenerationBackend):
+    name = "torch"
+
+    def load_model(self):
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+        model.to(self.device)
+        model.eval()
+        return model
+
+
+# PyTorch eager mode with Linear layers dynamically quantized to int8 (CPU only)
+class QuantizedTorchBackend(GenerationBackend):
+    name = "torch-int8"
+
+    def load_model(self):
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+
+        model = AutoModelForSeq2SeqLM.from_pretrained(self.model_name)
+        model.eval()
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+# ONNX Runtime via optimum, with decoder KV cache. The exported model is saved to
+# SEO_ONNX_MODEL_DIR (when set) so later workers load it instead of exporting again.
+class OnnxBackend(GenerationBackend):
+    name = "onnx"
+
+    def load_model(self):
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise ImportError(
+                "The 'onnx' generation backend needs optimum[onnxruntime]: pip install 'optimum[onnxruntime]'"
+            ) from e
+
+        export_dir = getattr(settings, "SEO_ONNX_MODEL_DIR", None)
+        if export_dir and os.path.isdir(export_dir):
+            return ORTModelForSeq2SeqLM.from_pretrained(export_dir, use_cache=True)
+
+        logger.info("Exporting %s to ONNX", self.model_name)
+        model = ORTModelForSeq2SeqLM.from_pretrained(self.model_name, export=True, use_cache=True)
+        if export_dir:
+            model.save_pretrained(export_dir)
+        return model
+
+
+# Sends prompts to the shared inference server; falls back to an in-process backend when it's unreachable
+class RemoteBackend(GenerationBackend):
+    name = "remote"
+
+    def __init__(self, client):
+        self.client = client
+        self._local = None
+        self._local_lock = threading.Lock()
+
+    def generate(self, prompts, max_length=256, temperature=0.7, top_p=0.9, do_sample=True, seed=None):
+        params = {"max_length": max_length, "temperature": temperature, "top_p": top_p, "do_sample": do_sample, "seed": seed}
+        try:
+            with stage("remote_generate"):
+                return self.client.generate(prompts, **params)
+        except InferenceUnavailable:
+            if not fallback_enabled():
+                raise
+        return self.local().generate(prompts, **params)
+
+    def local(self):
+        with self._local_lock:
+            if self._local is None:
+                self._local = load_backend()
+        return self._local
+
+
+BACKENDS = {backend.name: backend for backend in (TorchBackend, QuantizedTorchBackend, OnnxBackend)}
+
+
+# Instantiate the backend named in settings (or `name`). An optimized backend that can't load here
+# (optimum not installed, no quantized engine on this CPU) falls back to plain torch.
+def load_backend(name=None):
+    name = name or getattr(settings, "SEO_GENERATION_BACKEND", TorchBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown generation backend '{name}'. Choose one of: {', '.join(BACKENDS)}")
+    try:
+        return BACKENDS[name]()
+    except (ImportError, RuntimeError) as e:
+        if name == TorchBackend.name:
+            raise
+        logger.warning("Generation backend '%s' is unavailable, using '%s': %s", name, TorchBackend.name, e)
+        count("generation_backend_fallbacks", backend=name)
+        return TorchBackend()
+
+
+# The shared inference server when SEO_INFERENCE_SERVER_URL is set, otherwise an in-process backend
+def load_generator():
+    client = get_client()
+    return RemoteBackend(client) if client else load_backend()
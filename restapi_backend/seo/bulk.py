@@ -0,0 +1,129 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from blog.models import Blog
+
+from .jobs import get_executor, get_queue_mode
+from .models import BulkRefreshRun
+from .pipeline import PreviewConflict, apply_refresh, generate_refresh_many, store_preview
+
+logger = logging.getLogger(__name__)
+
+FILTER_KEYS = ("topic", "author", "older_than_days", "not_refreshed_days")
+
+
+# Blogs matched by a bulk refresh filter, in the pk order runs are checkpointed in
+def select_blogs(filters):
+    blogs = Blog.objects.all()
+    if filters.get("topic"):
+        blogs = blogs.filter(topic__iexact=filters["topic"])
+    if filters.get("author"):
+        blogs = blogs.filter(author__username=filters["author"])
+    if filters.get("older_than_days") is not None:
+        cutoff = timezone.now() - timedelta(days=int(filters["older_than_days"]))
+        blogs = blogs.filter(updated_at__lt=cutoff)
+    if filters.get("not_refreshed_days") is not None:
+        cutoff = timezone.now() - timedelta(days=int(filters["not_refreshed_days"]))
+        blogs = blogs.filter(last_refreshed_at__lt=cutoff)
+    return blogs.order_by("pk")
+
+
+# Validate filters and record a pending run
+def create_run(filters, apply=False, user=None):
+    filters = {key: filters[key] for key in FILTER_KEYS if filters.get(key) not in (None, "")}
+    for key in ("older_than_days", "not_refreshed_days"):
+        if key in filters:
+            filters[key] = int(filters[key])
+            if filters[key] < 0:
+                raise ValueError(f"{key} must not be negative")
+    return BulkRefreshRun.objects.create(
+        filters=filters,
+        apply=apply,
+        total=select_blogs(filters).count(),
+        requested_by=user if user and user.is_authenticated else None,
+    )
+
+
+# Create a run and start it in the background pool (or leave it for `run_refresh_worker`)
+def enqueue_bulk_refresh(filters, apply=False, user=None):
+    run = create_run(filters, apply=apply, user=user)
+    if get_queue_mode() == "thread":
+        get_executor().submit(_run_in_background, run.pk)
+    return run
+
+
+def _run_in_background(run_id):
+    close_old_connections()
+    try:
+        run_bulk_refresh(run_id)
+    finally:
+        close_old_connections()
+
+
+def pending_run_ids():
+    return list(BulkRefreshRun.objects.filter(status=BulkRefreshRun.STATUS_PENDING).order_by("created_at").values_list("pk", flat=True))
+
+
+# Atomically mark a run as running; `resume_running` takes over a run whose process died
+def claim_run(run_id, resume_running=False):
+    statuses = [BulkRefreshRun.STATUS_PENDING, BulkRefreshRun.STATUS_FAILED]
+    if resume_running:
+        statuses.append(BulkRefreshRun.STATUS_RUNNING)
+    return BulkRefreshRun.objects.filter(pk=run_id, status__in=statuses).update(
+        status=BulkRefreshRun.STATUS_RUNNING,
+        error="",
+    ) == 1
+
+
+# Refresh every selected blog in batches, checkpointing after each batch.
+# `progress(run)` is called after every batch. Returns the run, or None if it was already claimed.
+def run_bulk_refresh(run_id, posts_per_batch=None, batch_size=None, progress=None, resume_running=False):
+    if not claim_run(run_id, resume_running=resume_running):
+        return None
+
+    run = BulkRefreshRun.objects.get(pk=run_id)
+    posts_per_batch = max(1, posts_per_batch or getattr(settings, "SEO_BULK_POSTS_PER_BATCH", 16))
+    if run.started_at is None:
+        run.started_at = timezone.now()
+        run.save(update_fields=["started_at", "updated_at"])
+
+    blogs = select_blogs(run.filters)
+    try:
+        while True:
+            batch = list(blogs.filter(pk__gt=run.last_blog_id)[:posts_per_batch])
+            if not batch:
+                break
+
+            started = time.perf_counter()
+            refreshes = generate_refresh_many(batch, batch_size=batch_size)
+            for blog, refresh in zip(batch, refreshes):
+                if run.apply:
+                    try:
+                        apply_refresh(blog, refresh)
+                    except PreviewConflict:
+                        logger.warning("Bulk refresh %s: blog %s was edited during generation, skipped", run.pk, blog.pk)
+                else:
+                    store_preview(blog, refresh)
+
+            run.processed += len(batch)
+            run.last_blog_id = batch[-1].pk
+            run.save(update_fields=["processed", "last_blog_id", "updated_at"])
+            logger.info("Bulk refresh %s: %s posts in %.1fs", run.pk, len(batch), time.perf_counter() - started)
+            if progress:
+                progress(run)
+    except Exception as e:
+        logger.exception("Bulk refresh %s failed after %s posts", run.pk, run.processed)
+        run.status = BulkRefreshRun.STATUS_FAILED
+        run.error = str(e)
+        run.save(update_fields=["status", "error", "updated_at"])
+        return run
+
+    run.status = BulkRefreshRun.STATUS_COMPLETED
+    run.finished_at = timezone.now()
+    run.save(update_fields=["status", "finished_at", "updated_at"])
+    return run
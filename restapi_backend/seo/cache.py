@@ -0,0 +1,107 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import InvalidCacheBackendError, caches
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+# Stable sha256 key for any JSON-serialisable parts
+def make_key(namespace, *parts):
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{namespace}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+class TieredCache:
+    """
+    Two-tier cache: a bounded in-process LRU in front of an optional Django cache
+    alias (file or DB backed) that survives restarts and is shared by workers.
+    With `timeout` (seconds) entries expire in both tiers; None keeps them until evicted.
+    """
+
+    def __init__(self, name, max_entries=512, persistent_alias=None, timeout=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.persistent_alias = persistent_alias
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def _persistent(self):
+        if not self.persistent_alias:
+            return None
+        try:
+            return caches[self.persistent_alias]
+        except InvalidCacheBackendError:
+            logger.warning("Cache alias '%s' is not configured; using memory only", self.persistent_alias)
+            self.persistent_alias = None
+            return None
+
+    def get(self, key, default=None):
+        with self._lock:
+            expires, value = self._entries.get(key, (None, _MISSING))
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                value = _MISSING
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        persistent = self._persistent()
+        if persistent is not None:
+            value = persistent.get(key, _MISSING)
+            if value is not _MISSING:
+                self.persistent_hits += 1
+                self._remember(key, value)
+                return value
+
+        self.misses += 1
+        return default
+
+    def set(self, key, value):
+        self._remember(key, value)
+        persistent = self._persistent()
+        if persistent is not None:
+            persistent.set(key, value, timeout=self.timeout)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.persistent_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "timeout": self.timeout,
+            "hits": self.hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.persistent_hits) / lookups, 3) if lookups else None,
+            "persistent_alias": self.persistent_alias,
+        }
+
+    def _remember(self, key, value):
+        expires = time.monotonic() + self.timeout if self.timeout else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
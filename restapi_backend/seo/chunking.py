@@ -0,0 +1,90 @@
+import re
+from collections import namedtuple
+
+# A run of source text [start, end) sent to the model as one prompt
+Chunk = namedtuple("Chunk", ["text", "start", "end", "tokens"])
+
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+# Sentence end punctuation (plus closing quotes/brackets), then the whitespace before the next sentence
+SENTENCE_END = re.compile(r"[.!?][\"')\]]*(\s+)(?=[\"'(\[]?[A-Z0-9])")
+WORD = re.compile(r"\S+")
+
+
+# (start, end) offsets of each paragraph, whitespace-trimmed
+def paragraph_spans(text):
+    spans = []
+    start = 0
+    for match in PARAGRAPH_BREAK.finditer(text):
+        spans.append((start, match.start()))
+        start = match.end()
+    spans.append((start, len(text)))
+    return [_trim(text, s, e) for s, e in spans if text[s:e].strip()]
+
+
+# (start, end) offsets of each sentence inside text[start:end]
+def sentence_spans(text, start, end):
+    spans = []
+    for match in SENTENCE_END.finditer(text, start, end):
+        spans.append(_trim(text, start, match.start(1)))
+        start = match.end()
+    if text[start:end].strip():
+        spans.append(_trim(text, start, end))
+    return spans
+
+
+# Split text into paragraph/sentence segments and pack consecutive segments into chunks of at most
+# `token_budget` tokens. `count_tokens(list_of_strings)` returns a token count per string.
+# Sentences longer than the budget are split on word boundaries. With cross_paragraphs=False
+# every chunk stays inside one paragraph.
+def chunk_text(text, token_budget, count_tokens, cross_paragraphs=True):
+    chunks = []
+    current = None
+    for p_start, p_end in paragraph_spans(text):
+        if not cross_paragraphs and current:
+            chunks.append(current)
+            current = None
+
+        segments = sentence_spans(text, p_start, p_end)
+        counts = count_tokens([text[s:e] for s, e in segments])
+        for (s, e), count in zip(segments, counts):
+            pieces = _split_words(text, s, e, token_budget, count_tokens) if count > token_budget else [(s, e, count)]
+            for piece in pieces:
+                current = _pack(chunks, current, piece, token_budget)
+    if current:
+        chunks.append(current)
+    return [Chunk(text[s:e], s, e, count) for s, e, count in chunks]
+
+
+# Whitespace between two chunks as it should appear when the rewritten chunks are joined
+def separator(text, previous, following):
+    gap = text[previous.end:following.start]
+    return "\n\n" if PARAGRAPH_BREAK.search(gap) else " "
+
+
+# Extend the current chunk with a piece if it fits the budget, otherwise close it and start a new one
+def _pack(chunks, current, piece, token_budget):
+    if current and current[2] + piece[2] <= token_budget:
+        return current[0], piece[1], current[2] + piece[2]
+    if current:
+        chunks.append(current)
+    return piece
+
+
+def _split_words(text, start, end, token_budget, count_tokens):
+    words = [(m.start(), m.end()) for m in WORD.finditer(text, start, end)]
+    counts = count_tokens([text[s:e] for s, e in words])
+    pieces = []
+    current = None
+    for (s, e), count in zip(words, counts):
+        current = _pack(pieces, current, (s, e, count), token_budget)
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _trim(text, start, end):
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
@@ -0,0 +1,78 @@
+import logging
+import threading
+import time
+
+import requests
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceUnavailable(Exception):
+    pass
+
+
+class InferenceClient:
+    """
+    Thin client for the shared inference server (`manage.py run_inference_server`).
+    After a connection failure the server is skipped for `retry_after` seconds so callers
+    fall back to in-process models without waiting on a timeout every time.
+    """
+
+    def __init__(self, url, timeout=300, retry_after=30):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._down_until = 0
+        self._session = requests.Session()
+
+    def available(self):
+        return time.monotonic() >= self._down_until
+
+    def generate(self, prompts, **params):
+        return self._post("/generate", dict(params, prompts=prompts))["texts"]
+
+    def analyze(self, contents):
+        return [[tuple(span) for span in spans] for spans in self._post("/analyze", {"contents": contents})["outdated"]]
+
+    def _post(self, path, payload):
+        if not self.available():
+            raise InferenceUnavailable(f"Inference server {self.url} marked down")
+        try:
+            response = self._session.post(self.url + path, json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            self._down_until = time.monotonic() + self.retry_after
+            logger.warning("Inference server %s unreachable, using in-process models for %ss: %s", self.url, self.retry_after, e)
+            raise InferenceUnavailable(str(e)) from e
+        if response.status_code != 200:
+            raise InferenceUnavailable(f"Inference server returned {response.status_code}: {response.text[:200]}")
+        return response.json()
+
+
+_client = None
+_client_lock = threading.Lock()
+_remote_disabled = False
+
+
+# Client for SEO_INFERENCE_SERVER_URL, or None when models run in this process
+def get_client():
+    global _client
+    url = getattr(settings, "SEO_INFERENCE_SERVER_URL", "")
+    if not url or _remote_disabled:
+        return None
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = InferenceClient(url, timeout=getattr(settings, "SEO_INFERENCE_TIMEOUT", 300))
+    return _client
+
+
+# Used by the inference server itself so it never calls out to itself
+def disable_remote():
+    global _remote_disabled
+    _remote_disabled = True
+
+
+# Whether to load models in-process when the server can't be reached (otherwise the error is raised)
+def fallback_enabled():
+    return getattr(settings, "SEO_INFERENCE_FALLBACK", True)
@@ -0,0 +1,144 @@
+import json
+import logging
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+class _Request:
+    def __init__(self, prompts, params):
+        self.prompts = prompts
+        self.params = params
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class MicroBatcher:
+    """
+    Collects generate requests from concurrent callers and runs them together.
+    The first queued request opens a batch; requests with the same decoding parameters that arrive
+    within `max_wait` seconds join it, up to `max_batch_size` prompts per model call.
+    """
+
+    def __init__(self, generate, max_batch_size=16, max_wait=0.01):
+        self.generate = generate
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.requests = 0
+        self.prompts = 0
+        self._queue = queue.Queue()
+        self._deferred = []
+        threading.Thread(target=self._loop, name="seo-microbatcher", daemon=True).start()
+
+    def submit(self, prompts, **params):
+        request = _Request(list(prompts), params)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "prompts": self.prompts,
+            "avg_prompts_per_batch": round(self.prompts / self.batches, 2) if self.batches else None,
+            "queued": self._queue.qsize(),
+        }
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            prompts = [prompt for request in batch for prompt in request.prompts]
+            try:
+                texts = []
+                for start in range(0, len(prompts), self.max_batch_size):
+                    texts.extend(self.generate(prompts[start:start + self.max_batch_size], **batch[0].params))
+            except Exception as e:
+                logger.exception("Inference batch failed")
+                for request in batch:
+                    request.error = e
+                    request.done.set()
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            self.prompts += len(prompts)
+            offset = 0
+            for request in batch:
+                request.result = texts[offset:offset + len(request.prompts)]
+                offset += len(request.prompts)
+                request.done.set()
+
+    def _collect(self):
+        first = self._deferred.pop(0) if self._deferred else self._queue.get()
+        batch = [first]
+        size = len(first.prompts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if request.params == first.params and size + len(request.prompts) <= self.max_batch_size:
+                batch.append(request)
+                size += len(request.prompts)
+            else:
+                # Different decoding settings (or too big): it opens one of the next batches
+                self._deferred.append(request)
+        return batch
+
+
+def _make_handler(batcher, analyze):
+    class InferenceHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "batching": batcher.stats()})
+            else:
+                self._send(404, {"error": "Not found"})
+
+        def do_POST(self):
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path == "/generate":
+                    params = {key: payload[key] for key in ("max_length", "temperature", "top_p", "do_sample", "seed") if key in payload}
+                    self._send(200, {"texts": batcher.submit(payload["prompts"], **params)})
+                elif self.path == "/analyze":
+                    self._send(200, {"outdated": analyze(payload["contents"])})
+                else:
+                    self._send(404, {"error": "Not found"})
+            except (KeyError, ValueError) as e:
+                self._send(400, {"error": f"Bad request: {e}"})
+            except Exception as e:
+                logger.exception("Inference request failed")
+                self._send(500, {"error": str(e)})
+
+        def _send(self, code, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            logger.debug("%s - %s", self.address_string(), format % args)
+
+    return InferenceHandler
+
+
+# HTTP server owning the models: POST /generate, POST /analyze, GET /health
+def make_server(host, port, batcher, analyze):
+    server = ThreadingHTTPServer((host, port), _make_handler(batcher, analyze))
+    server.daemon_threads = True
+    return server
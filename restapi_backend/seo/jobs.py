@@ -0,0 +1,83 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import RefreshJob
+from .pipeline import confirm_refresh, preview_refresh
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# "thread" runs jobs in this process; "database" leaves them for `manage.py run_refresh_worker`
+def get_queue_mode():
+    return getattr(settings, "SEO_REFRESH_QUEUE", "thread")
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "SEO_REFRESH_WORKERS", 2),
+                    thread_name_prefix="seo-refresh",
+                )
+    return _executor
+
+
+# Create a pending job and hand it to the in-process pool (or leave it for a DB worker)
+def enqueue_refresh(blog, action, user=None):
+    job = RefreshJob.objects.create(
+        blog=blog,
+        action=action,
+        requested_by=user if user and user.is_authenticated else None,
+    )
+    if get_queue_mode() == "thread":
+        get_executor().submit(run_job, job.pk)
+    return job
+
+
+# Atomically move a pending job to running; returns False if another worker took it
+def claim_job(job_id):
+    return RefreshJob.objects.filter(pk=job_id, status=RefreshJob.STATUS_PENDING).update(
+        status=RefreshJob.STATUS_RUNNING,
+        started_at=timezone.now(),
+    ) == 1
+
+
+# Run the refresh pipeline for a job and store its result; returns False if it was already claimed
+def run_job(job_id):
+    close_old_connections()
+    try:
+        if not claim_job(job_id):
+            return False
+        job = RefreshJob.objects.select_related("blog").get(pk=job_id)
+        try:
+            if job.action == RefreshJob.ACTION_CONFIRM:
+                refresh, reused = confirm_refresh(job.blog)
+                job.result = dict(refresh, reused_preview=reused)
+            else:
+                job.result = preview_refresh(job.blog)
+            job.status = RefreshJob.STATUS_SUCCEEDED
+        except Exception as e:
+            logger.exception("Refresh job %s failed", job_id)
+            job.error = str(e)
+            job.status = RefreshJob.STATUS_FAILED
+        job.finished_at = timezone.now()
+        job.save(update_fields=["result", "error", "status", "finished_at"])
+        return True
+    finally:
+        close_old_connections()
+
+
+# Pending job ids in creation order
+def pending_job_ids(limit=None):
+    pending = RefreshJob.objects.filter(status=RefreshJob.STATUS_PENDING).values_list("pk", flat=True)
+    return list(pending[:limit] if limit else pending)
@@ -0,0 +1,249 @@
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Length, Ln
+
+from blog.models import Blog
+
+from .metrics import stage
+from .models import BlogKeyword, KeywordPhrase
+from .similarity import STOPWORDS
+
+# Candidates are the 1..MAX_PHRASE_WORDS-word n-grams of each run of content words between
+# stopwords and punctuation (RAKE's runs), so "drip campaigns" also matches "drip campaigns convert"
+BOUNDARY_RE = re.compile(r"[.,;:!?()\[\]{}\"“”|/\n]+|\s[-–—]+\s")
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#'&-]*[a-z0-9+#]|[a-z0-9]")
+MAX_PHRASE_WORDS = 3
+# Keep IN (...) lists under SQLite's bound-parameter limit
+LOOKUP_BATCH = 500
+
+logger = logging.getLogger(__name__)
+
+_indexer = None
+_indexer_lock = threading.Lock()
+
+
+# Candidate phrase -> occurrences in `text`. Numbers-only phrases (years, prices) are left out:
+# they are what the refresh rewrites, not what a post is about.
+def phrase_counts(text):
+    counts = Counter()
+    for fragment in BOUNDARY_RE.split((text or "").lower()):
+        run = []
+        for word in WORD_RE.findall(fragment) + [None]:
+            if word is not None and word not in STOPWORDS and len(word) > 1:
+                run.append(word)
+                continue
+            for size in range(1, min(len(run), MAX_PHRASE_WORDS) + 1):
+                for start in range(len(run) - size + 1):
+                    gram = run[start:start + size]
+                    if not all(w.isdigit() for w in gram):
+                        counts[" ".join(gram)[:255]] += 1
+            run = []
+    return counts
+
+
+def _post_counts(blog):
+    counts = phrase_counts(blog.content)
+    counts.update(phrase_counts(blog.title))
+    return counts
+
+
+def _batches(items, size=LOOKUP_BATCH):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+# Smoothed IDF, the same formula as the similarity index
+def idf(document_frequency, documents):
+    return math.log((1 + documents) / (1 + document_frequency)) + 1
+
+
+def _phrase_ids(phrases):
+    KeywordPhrase.objects.bulk_create(
+        [KeywordPhrase(phrase=phrase) for phrase in phrases], ignore_conflicts=True, batch_size=LOOKUP_BATCH
+    )
+    ids = {}
+    for batch in _batches(phrases):
+        ids.update(KeywordPhrase.objects.filter(phrase__in=batch).values_list("phrase", "id"))
+    return ids
+
+
+# Lower the document frequency of the given phrases by one, deleting those no post uses any more
+def _release_phrases(phrase_ids):
+    for batch in _batches(phrase_ids):
+        KeywordPhrase.objects.filter(pk__in=batch).update(document_frequency=F("document_frequency") - 1)
+        KeywordPhrase.objects.filter(pk__in=batch, document_frequency__lte=0).delete()
+
+
+# Bring one post's postings up to date: only phrases it gained or lost change document frequencies
+def index_keywords(blog):
+    counts = _post_counts(blog)
+    with transaction.atomic():
+        existing = {
+            posting.phrase.phrase: posting
+            for posting in BlogKeyword.objects.filter(blog_id=blog.pk).select_related("phrase")
+        }
+        removed = [posting for phrase, posting in existing.items() if phrase not in counts]
+        added = [phrase for phrase in counts if phrase not in existing]
+        changed = []
+        for phrase, posting in existing.items():
+            if phrase in counts and (posting.occurrences != counts[phrase] or posting.topic != blog.topic):
+                posting.occurrences = counts[phrase]
+                posting.weight = 1 + math.log(counts[phrase])
+                posting.topic = blog.topic
+                changed.append(posting)
+
+        for batch in _batches(removed):
+            BlogKeyword.objects.filter(pk__in=[posting.pk for posting in batch]).delete()
+        _release_phrases([posting.phrase_id for posting in removed])
+        if changed:
+            BlogKeyword.objects.bulk_update(changed, ["occurrences", "weight", "topic"], batch_size=LOOKUP_BATCH)
+        if added:
+            ids = _phrase_ids(added)
+            for batch in _batches(ids.values()):
+                KeywordPhrase.objects.filter(pk__in=batch).update(document_frequency=F("document_frequency") + 1)
+            BlogKeyword.objects.bulk_create(
+                [
+                    BlogKeyword(
+                        blog_id=blog.pk, phrase_id=ids[phrase], topic=blog.topic,
+                        occurrences=counts[phrase], weight=1 + math.log(counts[phrase]),
+                    )
+                    for phrase in added
+                ],
+                batch_size=LOOKUP_BATCH,
+            )
+    return len(added), len(removed)
+
+
+def get_indexer():
+    global _indexer
+    if _indexer is None:
+        with _indexer_lock:
+            if _indexer is None:
+                # One thread: a post's saves are indexed in order and never concurrently
+                _indexer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="seo-keywords")
+    return _indexer
+
+
+# Index a saved post once its transaction commits, so rolled-back saves aren't indexed. By default
+# this runs on a background thread and stays off the save's latency; SEO_KEYWORD_INDEX_ASYNC=0 runs
+# it right after the commit instead.
+def schedule_index_keywords(pk):
+    if getattr(settings, "SEO_KEYWORD_INDEX_ASYNC", True):
+        transaction.on_commit(lambda: get_indexer().submit(_index_in_background, pk))
+    else:
+        transaction.on_commit(lambda: index_post_keywords(pk))
+
+
+# Index the post as it is now (a later save queued meanwhile indexes the same state again, cheaply)
+def index_post_keywords(pk):
+    blog = Blog.objects.only("id", "title", "content", "topic").filter(pk=pk).first()
+    if blog is not None:
+        index_keywords(blog)
+
+
+def _index_in_background(pk):
+    close_old_connections()
+    try:
+        index_post_keywords(pk)
+    except Exception:
+        logger.exception("Keyword indexing of blog %s failed", pk)
+    finally:
+        close_old_connections()
+
+
+# Drop a post's postings (called before the post is deleted, while they still exist)
+def unindex_keywords(pk):
+    with transaction.atomic():
+        phrase_ids = list(BlogKeyword.objects.filter(blog_id=pk).values_list("phrase_id", flat=True))
+        BlogKeyword.objects.filter(blog_id=pk).delete()
+        _release_phrases(phrase_ids)
+
+
+# Rebuild the whole index from the posts table; returns the number of posts indexed
+def rebuild_keyword_index(batch_size=200):
+    with transaction.atomic():
+        BlogKeyword.objects.all().delete()
+        KeywordPhrase.objects.all().delete()
+        indexed = 0
+        blogs = Blog.objects.only("id", "title", "content", "topic").order_by("pk")
+        last_pk = 0
+        while True:
+            batch = list(blogs.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            post_counts = [_post_counts(blog) for blog in batch]
+            ids = _phrase_ids({phrase for counts in post_counts for phrase in counts})
+            BlogKeyword.objects.bulk_create(
+                [
+                    BlogKeyword(
+                        blog_id=blog.pk, phrase_id=ids[phrase], topic=blog.topic,
+                        occurrences=n, weight=1 + math.log(n),
+                    )
+                    for blog, counts in zip(batch, post_counts)
+                    for phrase, n in counts.items()
+                ],
+                batch_size=LOOKUP_BATCH,
+            )
+            indexed += len(batch)
+            last_pk = batch[-1].pk
+
+        postings = BlogKeyword.objects.filter(phrase=OuterRef("pk")).values("phrase").annotate(n=Count("*")).values("n")
+        KeywordPhrase.objects.update(document_frequency=Coalesce(Subquery(postings), 0))
+    return indexed
+
+
+# The `limit` highest TF-IDF phrases of `content`, with document frequencies from the corpus index
+def top_keywords(content, limit=10):
+    counts = phrase_counts(content)
+    if not counts:
+        return []
+    documents = Blog.objects.count()
+    frequencies = {}
+    for batch in _batches(counts):
+        frequencies.update(KeywordPhrase.objects.filter(phrase__in=batch).values_list("phrase", "document_frequency"))
+    scores = {
+        phrase: (1 + math.log(n)) * idf(frequencies.get(phrase, 0), documents)
+        for phrase, n in counts.items()
+    }
+    # Ties (common in short posts) go to the longer phrase
+    ranked = sorted(scores, key=lambda phrase: (-scores[phrase], -phrase.count(" "), phrase))
+    return ranked[:limit]
+
+
+# Phrases that sibling posts of the same topic use and this post doesn't, strongest first:
+# [{"phrase", "posts", "score"}], where score sums the phrase's TF-IDF over the siblings using it.
+def missed_keywords(blog, limit=None, min_posts=None):
+    limit = getattr(settings, "SEO_MISSED_KEYWORDS", 10) if limit is None else limit
+    min_posts = getattr(settings, "SEO_MISSED_KEYWORD_MIN_POSTS", 2) if min_posts is None else min_posts
+    if not blog.topic or limit <= 0:
+        return []
+    with stage("missed_keywords"):
+        return _missed_keywords(blog, limit, min_posts)
+
+
+def _missed_keywords(blog, limit, min_posts):
+    documents = Blog.objects.count()
+    phrase_idf = Ln(
+        Value(documents + 1.0, output_field=FloatField()) / (F("phrase__document_frequency") + Value(1.0)),
+        output_field=FloatField(),
+    ) + Value(1.0)
+    rows = (
+        BlogKeyword.objects.filter(topic=blog.topic)
+        .exclude(blog_id=blog.pk)
+        .exclude(phrase_id__in=BlogKeyword.objects.filter(blog_id=blog.pk).values("phrase_id"))
+        .values("phrase__phrase", "phrase__document_frequency")
+        .annotate(posts=Count("blog_id"), strength=Sum("weight"))
+        .filter(posts__gte=min_posts)
+        .annotate(score=F("strength") * phrase_idf)
+        .order_by("-score", Length("phrase__phrase").desc(), "phrase__phrase")[:limit]
+    )
+    return [{"phrase": row["phrase__phrase"], "posts": row["posts"], "score": round(row["score"], 4)} for row in rows]
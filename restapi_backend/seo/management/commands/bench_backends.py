@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from seo.backends import BACKENDS
+from seo.benchmarks import synthetic_content
+from seo.registry import current_rss_mb, registry
+
+
+class Command(BaseCommand):
+    help = "Compare generation backends (torch, torch-int8, onnx): load time, latency, output tokens/sec and memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backends", default=",".join(BACKENDS))
+        parser.add_argument("--prompts", type=int, default=8)
+        parser.add_argument("--batch-size", type=int, default=4)
+        parser.add_argument("--max-length", type=int, default=128)
+
+    def handle(self, *args, **options):
+        tokenizer = registry.get("tokenizer")
+        content = synthetic_content(options["prompts"] * 500)
+        prompts = [
+            f"Update this blog content to be SEO-friendly, preserve original tone: {content[i:i + 500]}"
+            for i in range(0, len(content), 500)
+        ]
+        batch_size = options["batch_size"]
+
+        for name in options["backends"].split(","):
+            rss_before = current_rss_mb()
+            started = time.perf_counter()
+            try:
+                backend = BACKENDS[name]()
+            except (ImportError, KeyError) as e:
+                self.stdout.write(self.style.WARNING(f"{name}: skipped ({e})"))
+                continue
+            load_seconds = time.perf_counter() - started
+
+            # One warm-up batch so lazy initialisation isn't counted as latency
+            backend.generate(prompts[:1], max_length=8)
+
+            latencies = []
+            output_tokens = 0
+            for start in range(0, len(prompts), batch_size):
+                batch_started = time.perf_counter()
+                texts = backend.generate(prompts[start:start + batch_size], max_length=options["max_length"])
+                latencies.append(time.perf_counter() - batch_started)
+                output_tokens += sum(len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"])
+
+            total = sum(latencies)
+            self.stdout.write(
+                f"{name:<11} load {load_seconds:6.1f}s  "
+                f"latency {total / len(latencies):6.2f}s/batch  "
+                f"{output_tokens / total:7.1f} tokens/sec  "
+                f"+{current_rss_mb() - rss_before:7.1f} MB RSS"
+            )
+            del backend
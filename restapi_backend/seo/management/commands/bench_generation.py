@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from seo.benchmarks import best_of, synthetic_content
+from seo.utils import generate_batch, get_generator
+
+
+class Command(BaseCommand):
+    help = "Benchmark batched chunk generation and report chunks/sec for each batch size."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chars", type=int, default=10000, help="Length of the synthetic post")
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument("--batch-sizes", default="1,2,4,8,16")
+        parser.add_argument("--max-length", type=int, default=256)
+        parser.add_argument("--repeat", type=int, default=1)
+
+    def handle(self, *args, **options):
+        content = synthetic_content(options["chars"])
+        size = options["chunk_size"]
+        prompts = [
+            f"Update this blog content to be SEO-friendly, preserve original tone: {content[i:i + size]}"
+            for i in range(0, len(content), size)
+        ]
+
+        # Load the model before timing so the first batch size isn't penalised
+        get_generator()
+
+        self.stdout.write(f"{len(prompts)} chunks of {size} chars")
+        for batch_size in [int(b) for b in options["batch_sizes"].split(",")]:
+            seconds = best_of(
+                lambda: generate_batch(prompts, max_length=options["max_length"], batch_size=batch_size),
+                repeat=options["repeat"],
+            )
+            self.stdout.write(
+                f"batch_size={batch_size:<3} {seconds:8.2f}s  {len(prompts) / seconds:7.2f} chunks/sec"
+            )
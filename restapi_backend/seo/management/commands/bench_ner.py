@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from seo.benchmarks import best_of, synthetic_corpus
+from seo.registry import registry
+from seo.utils import detect_outdated_many, outdated_from_doc
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare outdated-span detection speed: full spaCy pipeline, entity-only nlp.pipe, "
+        "the regex scanner, and the scanner with an NER pass for ambiguous spans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=32)
+        parser.add_argument("--processes", default="1,2,4", help="n_process values to try for nlp.pipe")
+        parser.add_argument("--repeat", type=int, default=1)
+        parser.add_argument("--scanner-only", action="store_true", help="Skip the spaCy paths")
+
+    def handle(self, *args, **options):
+        corpus = synthetic_corpus(options["posts"])
+        repeat = options["repeat"]
+
+        self._report("regex scanner", best_of(lambda: detect_outdated_many(corpus, use_ner=False), repeat), len(corpus))
+        if options["scanner_only"]:
+            return
+
+        full_nlp = registry.get("nlp")
+        ner = registry.get("ner")
+
+        def full_pipeline():
+            return [outdated_from_doc(full_nlp(content)) for content in corpus]
+
+        baseline = full_pipeline()
+        self._report("full pipeline, nlp(content)", best_of(full_pipeline, repeat), len(corpus))
+
+        for n_process in [int(n) for n in options["processes"].split(",")]:
+            def entity_only():
+                docs = ner.pipe(corpus, batch_size=options["batch_size"], n_process=n_process)
+                return [outdated_from_doc(doc) for doc in docs]
+
+            if entity_only() != baseline:
+                self.stdout.write(self.style.WARNING(f"n_process={n_process}: results differ from the full pipeline"))
+            self._report(f"entity-only nlp.pipe, n_process={n_process}", best_of(entity_only, repeat), len(corpus))
+
+        self._report(
+            "regex scanner + NER for ambiguous spans",
+            best_of(lambda: detect_outdated_many(corpus, batch_size=options["batch_size"], use_ner=True), repeat),
+            len(corpus),
+        )
+
+    def _report(self, label, seconds, docs):
+        self.stdout.write(
+            f"{label:<42} {seconds:8.3f}s  {docs / seconds:10.1f} docs/sec  {seconds * 1000 / docs:8.3f} ms/doc"
+        )
@@ -0,0 +1,211 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from seo.analysis import analysis_cache, analyze_many
+from seo.benchmarks import measure, measure_each, synthetic_blogs, use_stand_in_models
+from seo.chunking import chunk_text
+from seo.pipeline import generate_refresh_many
+from seo.rewrite import apply_edits, year_edits
+from seo.scanner import scan_outdated
+from seo.similarity import temporary_index
+from seo.utils import (
+    CHUNK_GENERATION,
+    count_tokens,
+    detect_outdated_many,
+    extract_keywords,
+    fetch_current_trends,
+    generate_batch,
+    generation_cache,
+    plan_refresh,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the refresh pipeline on a synthetic Blog corpus: each seo.utils stage plus the "
+        "preview/confirm views. Runs offline against a throwaway test database with stand-in models "
+        "unless --real-models is given, and can write JSON results to compare across commits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=50)
+        parser.add_argument("--min-chars", type=int, default=1500)
+        parser.add_argument("--max-chars", type=int, default=6000)
+        parser.add_argument("--distribution", default="uniform", choices=["uniform", "lognormal"])
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per whole-corpus benchmark")
+        parser.add_argument("--views", type=int, default=10, help="Posts sent through the preview/confirm views")
+        parser.add_argument(
+            "--seconds-per-token", type=float, default=0.0,
+            help="Simulated generation cost of the stand-in model",
+        )
+        parser.add_argument("--real-models", action="store_true", help="Use the configured tokenizer and generator")
+        parser.add_argument("--output", help="Write results as JSON to this path")
+        parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+
+    def handle(self, *args, **options):
+        baseline = self._load(options["compare"]) if options["compare"] else None
+        if not options["real_models"]:
+            use_stand_in_models(options["seconds_per_token"])
+        # Every run starts cold and never touches the shared persistent cache
+        for cache in (analysis_cache, generation_cache):
+            cache.persistent_alias = None
+            cache.clear()
+
+        # The throwaway database gets its own similarity index; its pks would overwrite real posts' rows
+        setup_test_environment()
+        with temporary_index():
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                results = self._run(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+
+        self._report(results, baseline)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def _run(self, options):
+        author = get_user_model().objects.create_user("bench", password="bench")
+        blogs = synthetic_blogs(
+            author, options["posts"], options["min_chars"], options["max_chars"],
+            seed=options["seed"], distribution=options["distribution"],
+        )
+        contents = [blog.content for blog in blogs]
+        repeat = options["repeat"]
+
+        outdated = detect_outdated_many(contents)
+        keywords = [extract_keywords(content) for content in contents]
+        year = datetime.now().year
+        plans = [
+            plan_refresh(blog.content, blog.title, spans, fetch_current_trends(blog.topic, year), words, blog.topic)
+            for blog, spans, words in zip(blogs, outdated, keywords)
+        ]
+        prompts = [prompt for plan in plans for prompt in plan["chunk_prompts"]]
+
+        def cold_analysis():
+            analysis_cache.clear()
+            analyze_many(contents)
+
+        benchmarks = {
+            "scan_outdated": measure(lambda: [scan_outdated(content) for content in contents], repeat),
+            "detect_outdated_many": measure(lambda: detect_outdated_many(contents), repeat),
+            "extract_keywords": measure(lambda: [extract_keywords(content) for content in contents], repeat),
+            "count_tokens": measure(lambda: count_tokens(contents), repeat),
+            "chunk_text": measure(
+                lambda: [chunk_text(content, 240, count_tokens) for content in contents], repeat
+            ),
+            "year_rewrite": measure(
+                lambda: [apply_edits(content, year_edits(spans, year)) for content, spans in zip(contents, outdated)],
+                repeat,
+            ),
+            "plan_refresh": measure(
+                lambda: [
+                    plan_refresh(blog.content, blog.title, spans, [], words, blog.topic)
+                    for blog, spans, words in zip(blogs, outdated, keywords)
+                ],
+                repeat,
+            ),
+            "analyze_many_cold": measure(cold_analysis, repeat),
+            "analyze_many_warm": measure(lambda: analyze_many(contents), repeat),
+            "generate_batch": measure(lambda: generate_batch(prompts, **CHUNK_GENERATION), repeat),
+            "generate_refresh_many": measure(lambda: generate_refresh_many(blogs), repeat),
+        }
+        for result in benchmarks.values():
+            result["per_post_ms"] = round(result["min_ms"] / len(blogs), 3)
+        benchmarks.update(self._views(author, blogs[:options["views"]]))
+
+        return {
+            "meta": {
+                "git_commit": _git_commit(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "models": "configured" if options["real_models"] else "stand-in",
+                "generation_backend": (
+                    getattr(settings, "SEO_GENERATION_BACKEND", "torch") if options["real_models"] else "stand-in"
+                ),
+                "refresh_mode": getattr(settings, "SEO_REFRESH_MODE", "full"),
+            },
+            "corpus": {
+                "posts": len(blogs),
+                "distribution": options["distribution"],
+                "min_chars": options["min_chars"],
+                "max_chars": options["max_chars"],
+                "total_chars": sum(len(content) for content in contents),
+                "chunk_prompts": len(prompts),
+                "seed": options["seed"],
+            },
+            "benchmarks": benchmarks,
+        }
+
+    # End-to-end latency of the preview and confirm endpoints, one request per post
+    def _views(self, author, blogs):
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        client.force_authenticate(author)
+        versions = {}
+
+        def preview(blog):
+            response = client.get(f"/api/refresh-blog/{blog.pk}/preview/")
+            if response.status_code != 200:
+                raise CommandError(f"Preview of blog {blog.pk} failed: {response.data}")
+            versions[blog.pk] = response.data["preview_version"]
+
+        def confirm(blog):
+            response = client.post(
+                f"/api/refresh-blog/{blog.pk}/confirm/", {"preview_version": versions[blog.pk]}, format="json"
+            )
+            if response.status_code != 200:
+                raise CommandError(f"Confirm of blog {blog.pk} failed: {response.data}")
+
+        return {
+            "view_preview": measure_each(preview, blogs),
+            "view_confirm": measure_each(confirm, blogs),
+        }
+
+    def _report(self, results, baseline):
+        corpus = results["corpus"]
+        self.stdout.write(
+            f"{corpus['posts']} posts ({corpus['distribution']}, {corpus['total_chars']} chars, "
+            f"{corpus['chunk_prompts']} chunk prompts), models: {results['meta']['models']}"
+        )
+        previous = baseline["benchmarks"] if baseline else {}
+        for name, result in results["benchmarks"].items():
+            line = f"{name:<24} min {result['min_ms']:10.2f} ms  p50 {result['p50_ms']:10.2f} ms"
+            if "per_post_ms" in result:
+                line += f"  {result['per_post_ms']:8.3f} ms/post"
+            if name in previous and previous[name]["min_ms"]:
+                ratio = result["min_ms"] / previous[name]["min_ms"]
+                style = self.style.SUCCESS if ratio <= 0.95 else self.style.WARNING if ratio >= 1.05 else str
+                line += style(f"  {ratio:5.2f}x vs {baseline['meta'].get('git_commit') or 'baseline'}")
+            self.stdout.write(line)
+
+    def _load(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Can't read baseline results {path}: {e}")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from seo.benchmarks import best_of, synthetic_content
+from seo.rewrite import apply_edits, year_edits
+from seo.scanner import scan_outdated
+
+
+# The substitution loop update_content used before the rewrite engine: one full string rebuild per span
+# (applied back to front so earlier offsets stay valid)
+def _rebuild_per_span(content, outdated, year):
+    for edit in reversed(year_edits(outdated, year)):
+        content = content[:edit.start] + edit.replacement + content[edit.end:]
+    return content
+
+
+class Command(BaseCommand):
+    help = "Benchmark year substitution: per-span string rebuilding vs the single-pass rewrite engine."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="10000,50000,200000", help="Post lengths in characters")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        for size in [int(s) for s in options["sizes"].split(",")]:
+            content = synthetic_content(size)
+            outdated = [(span.text, span.start, span.end) for span in scan_outdated(content)]
+            years = len(year_edits(outdated, "2099"))
+
+            naive = best_of(lambda: _rebuild_per_span(content, outdated, "2099"), options["repeat"])
+            engine = best_of(lambda: apply_edits(content, year_edits(outdated, "2099")), options["repeat"])
+            if _rebuild_per_span(content, outdated, "2099") != apply_edits(content, year_edits(outdated, "2099"))[0]:
+                self.stdout.write(self.style.WARNING(f"{size} chars: outputs differ"))
+            self.stdout.write(
+                f"{size:>8} chars, {years:>5} years: per-span rebuild {naive * 1000:8.2f} ms, "
+                f"rewrite engine {engine * 1000:7.2f} ms ({naive / engine:5.1f}x)"
+            )
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from seo.similarity import rebuild_index, similarity_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the related-posts similarity index from every Blog post (recomputes IDF weights). "
+        "Saves made while it runs wait for it to finish. With --related, print the posts most similar to a post."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--related", type=int, metavar="PK", help="Only look up the posts related to this post")
+        parser.add_argument("-k", type=int, default=5, help="Number of related posts to print")
+
+    def handle(self, *args, **options):
+        if options["related"] is None:
+            start = time.perf_counter()
+            indexed = rebuild_index()
+            self.stdout.write(self.style.SUCCESS(
+                f"Indexed {indexed} post(s) in {time.perf_counter() - start:.2f}s "
+                f"({similarity_index.dimensions} dimensions) at {similarity_index.path}"
+            ))
+            return
+
+        if not similarity_index.exists():
+            self.stderr.write("No similarity index yet; run this command without --related first.")
+            return
+        start = time.perf_counter()
+        matches = similarity_index.related(options["related"], options["k"])
+        elapsed = (time.perf_counter() - start) * 1000
+        for pk, score in matches:
+            self.stdout.write(f"{pk:>8}  {score:.4f}")
+        self.stdout.write(f"{len(matches)} related post(s) among {len(similarity_index)} in {elapsed:.2f} ms")
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from seo.bulk import create_run, run_bulk_refresh
+from seo.models import BulkRefreshRun
+
+
+class Command(BaseCommand):
+    help = "Refresh many blogs at once, batching NLP and generation across posts. Resumable with --resume."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--topic")
+        parser.add_argument("--author", help="Author username")
+        parser.add_argument("--older-than-days", type=int, help="Only blogs not updated in this many days")
+        parser.add_argument("--not-refreshed-days", type=int, help="Only blogs not refreshed in this many days")
+        parser.add_argument("--apply", action="store_true", help="Save refreshed content instead of storing previews")
+        parser.add_argument("--posts-per-batch", type=int, help="Posts processed together (default SEO_BULK_POSTS_PER_BATCH)")
+        parser.add_argument("--batch-size", type=int, help="Prompts per model.generate call (default SEO_GENERATION_BATCH_SIZE)")
+        parser.add_argument("--resume", type=int, metavar="RUN_ID", help="Continue an interrupted or failed run from its checkpoint")
+
+    def handle(self, *args, **options):
+        if options["resume"]:
+            if not BulkRefreshRun.objects.filter(pk=options["resume"]).exists():
+                raise CommandError(f"Bulk refresh run {options['resume']} does not exist")
+            run_id = options["resume"]
+        else:
+            filters = {
+                "topic": options["topic"],
+                "author": options["author"],
+                "older_than_days": options["older_than_days"],
+                "not_refreshed_days": options["not_refreshed_days"],
+            }
+            try:
+                run = create_run(filters, apply=options["apply"])
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(f"Bulk refresh {run.pk}: {run.total} blog(s) selected")
+            run_id = run.pk
+
+        run = run_bulk_refresh(
+            run_id,
+            posts_per_batch=options["posts_per_batch"],
+            batch_size=options["batch_size"],
+            progress=self._report,
+            resume_running=bool(options["resume"]),
+        )
+        if run is None:
+            raise CommandError(f"Bulk refresh run {run_id} is already completed or running elsewhere")
+        if run.status == BulkRefreshRun.STATUS_FAILED:
+            raise CommandError(f"Bulk refresh {run.pk} failed: {run.error}. Resume with --resume {run.pk}")
+        self.stdout.write(self.style.SUCCESS(f"Bulk refresh {run.pk} completed: {run.processed} blog(s)"))
+
+    def _report(self, run):
+        rate = run.posts_per_minute
+        self.stdout.write(
+            f"  {run.processed}/{run.total} posts" + (f" ({rate} posts/min)" if rate else "")
+        )
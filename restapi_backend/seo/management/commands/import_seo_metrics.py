@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from seo.models import RefreshEvent
+from seo.tracking import FORMATS, IMPORT_BATCH_SIZE, compute_rollups, detect_format, import_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Import daily SEO metrics (date, blog_id or page URL, impressions, clicks, position, sessions) from "
+        "CSV, JSON-array or JSON Lines exports, then update the before/after rollups of affected refreshes. "
+        "Files are streamed, so exports of any size can be imported."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", help="Export files (format from the extension unless --format)")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Records written per bulk insert")
+        parser.add_argument("--rebuild-rollups", action="store_true", help="Recompute the rollups of every refresh")
+
+    def handle(self, *args, **options):
+        if not options["paths"] and not options["rebuild_rollups"]:
+            raise CommandError("Give at least one export file, or --rebuild-rollups")
+
+        for path in options["paths"]:
+            fmt = options["format"] or detect_format(path)
+            if fmt not in FORMATS:
+                raise CommandError(f"Can't tell the format of {path}; pass --format ({', '.join(FORMATS)})")
+            try:
+                with open(path, newline="", encoding="utf-8-sig") as f:
+                    summary = import_metrics(
+                        f, fmt, batch_size=max(1, options["batch_size"]),
+                        progress=lambda s: self.stdout.write(f"  {s['read']} read, {s['created']} new"),
+                    )
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Can't import {path}: {e}")
+            self.stdout.write(self.style.SUCCESS(
+                f"{path}: {summary['created']} new day(s) of {summary['read']} record(s); "
+                f"{summary['duplicates']} already stored, {summary['unknown_blogs']} for unknown posts, "
+                f"{summary['invalid']} invalid; rollups updated for {summary['events']} refresh(es)"
+            ))
+            for error in summary["errors"]:
+                self.stderr.write(f"  {error}")
+
+        if options["rebuild_rollups"]:
+            events = RefreshEvent.objects.all()
+            compute_rollups(events.iterator(chunk_size=500))
+            self.stdout.write(self.style.SUCCESS(f"Rollups rebuilt for {events.count()} refresh(es)"))
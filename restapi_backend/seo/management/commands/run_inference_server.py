@@ -0,0 +1,47 @@
+from functools import partial
+
+from django.core.management.base import BaseCommand
+
+from seo.backends import load_backend
+from seo.inference_client import disable_remote
+from seo.inference_server import MicroBatcher, make_server
+from seo.registry import registry
+from seo.utils import detect_outdated_many
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the shared inference server that owns the generation and NER models and micro-batches "
+        "requests from all web workers. Point workers at it with SEO_INFERENCE_SERVER_URL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument("--max-batch-size", type=int, default=16, help="Most prompts per model.generate call")
+        parser.add_argument("--max-wait-ms", type=float, default=10, help="How long a batch waits for more requests")
+
+    def handle(self, *args, **options):
+        # This process owns the models, so it must never forward work to an inference server itself
+        disable_remote()
+        backend = load_backend()
+        registry.warm("ner")
+
+        batcher = MicroBatcher(
+            backend.generate,
+            max_batch_size=options["max_batch_size"],
+            max_wait=options["max_wait_ms"] / 1000,
+        )
+        server = make_server(
+            options["host"],
+            options["port"],
+            batcher,
+            partial(detect_outdated_many, use_ner=True),
+        )
+        self.stdout.write(f"Inference server ({backend.name}) listening on http://{options['host']}:{options['port']}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
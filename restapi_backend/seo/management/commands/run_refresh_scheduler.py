@@ -0,0 +1,47 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from seo.scheduler import Scheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh posts whose RefreshPolicy is due, with a bounded worker pool, a posts-per-minute limit and "
+        "a load-average guard (defaults from SEO_SCHEDULER). Several schedulers can run against one database; "
+        "each claims different posts. SIGINT/SIGTERM stop it after the running tasks finish."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, help="Refresh tasks run concurrently")
+        parser.add_argument("--posts-per-task", type=int, help="Posts claimed and generated together per task")
+        parser.add_argument("--max-per-minute", type=float, help="Most posts started per minute (0 = unlimited)")
+        parser.add_argument("--max-load", type=float, help="Pause while the 1-minute load average per CPU is above this (0 = off)")
+        parser.add_argument("--poll-interval", type=float, help="Seconds to wait when nothing is due")
+        parser.add_argument("--once", action="store_true", help="Refresh everything due now and exit")
+
+    def handle(self, *args, **options):
+        scheduler = Scheduler(
+            workers=options["workers"],
+            posts_per_task=options["posts_per_task"],
+            max_per_minute=options["max_per_minute"],
+            max_load=options["max_load"],
+            poll_interval=options["poll_interval"],
+        )
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: scheduler.stop())
+
+        self.stdout.write(
+            f"Refresh scheduler: {scheduler.workers} worker(s), {scheduler.posts_per_task} post(s) per task"
+        )
+        totals = {}
+
+        def report(outcomes):
+            for status in outcomes.values():
+                totals[status] = totals.get(status, 0) + 1
+            if outcomes:
+                summary = ", ".join(f"{n} {status}" for status, n in sorted(totals.items()))
+                self.stdout.write(f"Refreshed blog(s) {', '.join(map(str, outcomes))}; totals: {summary}")
+
+        scheduler.run(once=options["once"], on_task_done=report)
+        self.stdout.write(self.style.SUCCESS(f"Scheduler stopped after starting {scheduler.started} post(s)"))
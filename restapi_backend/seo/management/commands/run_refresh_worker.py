@@ -0,0 +1,36 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from seo.bulk import pending_run_ids, run_bulk_refresh
+from seo.jobs import pending_job_ids, run_job
+
+
+class Command(BaseCommand):
+    help = "Run queued refresh jobs and bulk refresh runs from the database (use with SEO_REFRESH_QUEUE=database)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2, help="Jobs to run concurrently")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to wait when the queue is empty")
+        parser.add_argument("--once", action="store_true", help="Drain the queue once and exit")
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="seo-refresh") as pool:
+            while True:
+                job_ids = pending_job_ids(limit=workers * 4)
+                if job_ids:
+                    ran = sum(pool.map(run_job, job_ids))
+                    self.stdout.write(f"Ran {ran} refresh job(s)")
+                    continue
+                run_ids = pending_run_ids()
+                if run_ids:
+                    # Bulk runs batch across posts internally, so run them one at a time
+                    run = run_bulk_refresh(run_ids[0])
+                    if run:
+                        self.stdout.write(f"Bulk refresh {run.pk}: {run.processed}/{run.total} ({run.status})")
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog.models import Blog
+from seo.models import RefreshPolicy
+from seo.scheduler import schedule_blogs
+
+
+class Command(BaseCommand):
+    help = (
+        "Give posts without a refresh policy one (first run one interval after their last refresh), "
+        "or with --disable turn scheduled refreshes off. Show the schedule with --status."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--topic", help="Only posts in this topic")
+        parser.add_argument("--interval-days", type=int, help="Days between refreshes (default SEO_REFRESH_INTERVAL_DAYS)")
+        parser.add_argument("--auto-apply", action="store_true", help="Save refreshes directly instead of as previews")
+        parser.add_argument("--disable", action="store_true", help="Disable the policies of the selected posts")
+        parser.add_argument("--status", action="store_true", help="Only print how many policies are due, leased and failing")
+
+    def handle(self, *args, **options):
+        if options["status"]:
+            return self._status()
+        if options["interval_days"] is not None and options["interval_days"] < 1:
+            raise CommandError("--interval-days must be at least 1")
+
+        blogs = Blog.objects.all()
+        if options["topic"]:
+            blogs = blogs.filter(topic__iexact=options["topic"])
+        if options["disable"]:
+            disabled = RefreshPolicy.objects.filter(blog__in=blogs).update(enabled=False)
+            self.stdout.write(self.style.SUCCESS(f"Disabled {disabled} refresh policy(ies)"))
+            return
+
+        interval = timedelta(days=options["interval_days"]) if options["interval_days"] else None
+        created = schedule_blogs(blogs, interval=interval, auto_apply=options["auto_apply"])
+        self.stdout.write(self.style.SUCCESS(f"Scheduled {created} post(s)"))
+
+    def _status(self):
+        now = timezone.now()
+        policies = RefreshPolicy.objects.filter(enabled=True)
+        self.stdout.write(
+            f"{policies.count()} enabled, {policies.filter(next_run_at__lte=now).count()} due, "
+            f"{policies.filter(leased_until__gt=now).count()} running, {policies.filter(failures__gt=0).count()} failing"
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Blog
+from seo.analysis import analyze_many
+from seo.staleness import record_staleness
+
+
+class Command(BaseCommand):
+    help = "Compute the staleness score of posts that don't have one yet (or of every post with --all)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Rescore posts that already have a score")
+        parser.add_argument("--batch-size", type=int, default=200, help="Posts analysed and updated together")
+
+    def handle(self, *args, **options):
+        blogs = Blog.objects.only("id", "content").order_by("pk")
+        if not options["all"]:
+            blogs = blogs.filter(staleness_score__isnull=True)
+
+        scored = 0
+        last_pk = 0
+        while True:
+            batch = list(blogs.filter(pk__gt=last_pk)[:options["batch_size"]])
+            if not batch:
+                break
+            record_staleness(batch, analyze_many([blog.content for blog in batch]))
+            scored += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f"Scored {scored} post(s)")
+        self.stdout.write(self.style.SUCCESS(f"Done: {scored} post(s) scored"))
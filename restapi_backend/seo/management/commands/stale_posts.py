@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from seo.staleness import ORDERINGS, months_to_days, select_stale
+
+
+class Command(BaseCommand):
+    help = "List posts due for a refresh, oldest first (or most outdated first with --order score)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--topic")
+        parser.add_argument("--months", type=float, help="Only posts not refreshed in this many months")
+        parser.add_argument("--min-score", type=float, help="Only posts with at least this staleness score")
+        parser.add_argument("--order", default="oldest", choices=ORDERINGS)
+        parser.add_argument("--limit", type=int, default=50)
+        parser.add_argument("--explain", action="store_true", help="Print the database query plan instead")
+
+    def handle(self, *args, **options):
+        months = options["months"]
+        try:
+            blogs = select_stale(
+                topic=options["topic"],
+                older_than_days=months_to_days(months) if months is not None else None,
+                min_score=options["min_score"],
+                order=options["order"],
+                limit=options["limit"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options["explain"]:
+            self.stdout.write(str(blogs.query))
+            self.stdout.write(blogs.explain())
+            return
+        for blog in blogs:
+            score = "-" if blog.staleness_score is None else f"{blog.staleness_score:.2f}"
+            self.stdout.write(f"{blog.pk:>7}  {blog.last_refreshed_at:%Y-%m-%d}  {score:>6}  {blog.topic or '':<20} {blog.title}")
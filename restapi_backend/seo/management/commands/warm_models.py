@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from seo.registry import registry
+
+
+class Command(BaseCommand):
+    help = "Load the SEO refresh models into memory ahead of the first request and report load time / memory use."
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help="Models to load (default: all registered models)")
+
+    def handle(self, *args, **options):
+        stats = registry.warm(*options["names"])
+        for name, info in stats.items():
+            if not info["loaded"]:
+                continue
+            self.stdout.write(
+                f"{name}: loaded in {info['load_seconds']}s, +{info['rss_delta_mb']} MB RSS"
+            )
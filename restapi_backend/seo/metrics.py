@@ -0,0 +1,127 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_current_trace = ContextVar("seo_trace", default=None)
+
+
+class Metrics:
+    """
+    Per-process stage timings and counters for the refresh path, rendered in the Prometheus
+    text format. Each worker keeps its own numbers; Prometheus sums them across scrape targets.
+    """
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self._stages = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            counts, total = self._stages.get(stage) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[bisect_left(self.buckets, seconds)] += 1
+            self._stages[stage] = (counts, total + seconds)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    # Prometheus exposition text; `caches` are TieredCache instances whose hit/miss counters are included
+    def render(self, caches=()):
+        with self._lock:
+            stages = {stage: (list(counts), total) for stage, (counts, total) in self._stages.items()}
+            counters = dict(self._counters)
+
+        lines = [
+            "# HELP seo_stage_seconds Time spent in each stage of the SEO refresh pipeline.",
+            "# TYPE seo_stage_seconds histogram",
+        ]
+        for stage, (counts, total) in sorted(stages.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'seo_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'seo_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'seo_stage_seconds_count{{stage="{stage}"}} {cumulative}')
+
+        for name in sorted({name for name, _ in counters}):
+            lines.append(f"# TYPE seo_{name}_total counter")
+            for (counter, labels), value in sorted(counters.items()):
+                if counter == name:
+                    lines.append(f"seo_{name}_total{_labels(labels)} {value}")
+
+        if caches:
+            lines.append("# HELP seo_cache_lookups_total Cache lookups by cache and result.")
+            lines.append("# TYPE seo_cache_lookups_total counter")
+            for cache in caches:
+                stats = cache.stats()
+                for result in ("hits", "persistent_hits", "misses"):
+                    labels = (("cache", cache.name), ("result", result))
+                    lines.append(f"seo_cache_lookups_total{_labels(labels)} {stats[result]}")
+            lines.append("# TYPE seo_cache_entries gauge")
+            for cache in caches:
+                lines.append(f'seo_cache_entries{{cache="{cache.name}"}} {cache.stats()["entries"]}')
+        return "\n".join(lines) + "\n"
+
+
+class Trace:
+    """Stage durations recorded while handling one request, for the Server-Timing header."""
+
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def server_timing(self):
+        return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.stages.items())
+
+
+metrics = Metrics()
+
+
+# Time a block as `name`: recorded in the process metrics and in the current request trace, if any
+@contextmanager
+def stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        metrics.observe(name, seconds)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(name, seconds)
+
+
+# Collect the stages run inside the block into a Trace
+@contextmanager
+def trace():
+    current = Trace()
+    token = _current_trace.set(current)
+    try:
+        yield current
+    finally:
+        _current_trace.reset(token)
+
+
+def count(name, amount=1, **labels):
+    metrics.inc(name, amount, **labels)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
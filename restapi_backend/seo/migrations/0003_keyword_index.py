@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_staleness'),
+        ('seo', '0002_bulkrefreshrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KeywordPhrase',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phrase', models.CharField(max_length=255, unique=True)),
+                ('document_frequency', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BlogKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(blank=True, max_length=100, null=True)),
+                ('occurrences', models.PositiveIntegerField(default=1)),
+                ('weight', models.FloatField(default=1.0)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keyword_postings', to='blog.blog')),
+                ('phrase', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='seo.keywordphrase')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['topic', 'phrase'], name='blogkeyword_topic_phrase_idx')],
+                'constraints': [models.UniqueConstraint(fields=('blog', 'phrase'), name='blogkeyword_blog_phrase_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:14
+
+import django.db.models.deletion
+import seo.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_staleness'),
+        ('seo', '0003_keyword_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefreshPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('enabled', models.BooleanField(default=True)),
+                ('interval', models.DurationField(default=seo.models.default_refresh_interval)),
+                ('auto_apply', models.BooleanField(default=False)),
+                ('next_run_at', models.DateTimeField()),
+                ('leased_until', models.DateTimeField(blank=True, null=True)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('last_status', models.CharField(blank=True, choices=[('succeeded', 'Succeeded'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='', max_length=20)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('blog', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='refresh_policy', to='blog.blog')),
+            ],
+            options={
+                'verbose_name_plural': 'refresh policies',
+                'indexes': [models.Index(fields=['enabled', 'next_run_at'], name='refreshpolicy_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:17
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Posts refreshed since last_refreshed_at was added have one known refresh to compare against
+def backfill_refresh_events(apps, schema_editor):
+    Blog = apps.get_model("blog", "Blog")
+    RefreshEvent = apps.get_model("seo", "RefreshEvent")
+    refreshed = Blog.objects.filter(last_refreshed_at__gt=models.F("created_at") + timedelta(minutes=1))
+    RefreshEvent.objects.bulk_create(
+        [RefreshEvent(blog_id=pk, refreshed_at=at) for pk, at in refreshed.values_list("pk", "last_refreshed_at")],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_staleness'),
+        ('seo', '0004_refresh_policy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RefreshEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('refreshed_at', models.DateTimeField()),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='refresh_events', to='blog.blog')),
+            ],
+            options={
+                'ordering': ['-refreshed_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RefreshImpact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window_days', models.PositiveSmallIntegerField()),
+                ('before_days', models.PositiveIntegerField(default=0)),
+                ('before_impressions', models.PositiveBigIntegerField(default=0)),
+                ('before_clicks', models.PositiveBigIntegerField(default=0)),
+                ('before_sessions', models.PositiveBigIntegerField(default=0)),
+                ('before_position', models.FloatField(blank=True, null=True)),
+                ('after_days', models.PositiveIntegerField(default=0)),
+                ('after_impressions', models.PositiveBigIntegerField(default=0)),
+                ('after_clicks', models.PositiveBigIntegerField(default=0)),
+                ('after_sessions', models.PositiveBigIntegerField(default=0)),
+                ('after_position', models.FloatField(blank=True, null=True)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='impacts', to='seo.refreshevent')),
+            ],
+            options={
+                'ordering': ['window_days'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SeoMetricDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('impressions', models.PositiveIntegerField(default=0)),
+                ('clicks', models.PositiveIntegerField(default=0)),
+                ('position', models.FloatField(blank=True, null=True)),
+                ('sessions', models.PositiveIntegerField(default=0)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_metrics', to='blog.blog')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='refreshevent',
+            index=models.Index(fields=['blog', 'refreshed_at'], name='refreshevent_blog_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='refreshimpact',
+            constraint=models.UniqueConstraint(fields=('event', 'window_days'), name='refreshimpact_event_window_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='seometricdaily',
+            constraint=models.UniqueConstraint(fields=('blog', 'date'), name='seometricdaily_blog_date_uniq'),
+        ),
+        migrations.RunPython(backfill_refresh_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_staleness'),
+        ('seo', '0005_seo_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('kind', models.CharField(choices=[('snapshot', 'Snapshot'), ('delta', 'Delta')], max_length=10)),
+                ('source', models.CharField(choices=[('original', 'Original'), ('edit', 'Edit'), ('refresh', 'Refresh'), ('restore', 'Restore')], max_length=10)),
+                ('data', models.BinaryField()),
+                ('checksum', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='blog.blog')),
+            ],
+            options={
+                'ordering': ['blog', 'number'],
+                'constraints': [models.UniqueConstraint(fields=('blog', 'number'), name='blogrevision_blog_number_uniq')],
+            },
+        ),
+    ]
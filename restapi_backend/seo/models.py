@@ -1,3 +1,255 @@
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
 from django.db import models
 
-# Create your models here.
+from blog.models import Blog
+
+
+class RefreshJob(models.Model):
+    ACTION_PREVIEW = "preview"
+    ACTION_CONFIRM = "confirm"
+    ACTION_CHOICES = [
+        (ACTION_PREVIEW, "Preview"),
+        (ACTION_CONFIRM, "Confirm"),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="refresh_jobs")
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES, default=ACTION_PREVIEW)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="refresh_jobs")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"{self.action} Blog {self.blog_id} ({self.status})"
+
+
+class BulkRefreshRun(models.Model):
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    # topic / author / older_than_days / not_refreshed_days used to select the blogs
+    filters = models.JSONField(default=dict, blank=True)
+    # Save refreshed content directly instead of storing previews for review
+    apply = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    # Checkpoint: blogs are processed in pk order, so a resumed run continues after this id
+    last_blog_id = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="bulk_refresh_runs")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Bulk refresh {self.pk} ({self.processed}/{self.total}, {self.status})"
+
+    @property
+    def posts_per_minute(self):
+        if not self.started_at or not self.processed:
+            return None
+        end = self.finished_at or self.updated_at
+        minutes = (end - self.started_at).total_seconds() / 60
+        return round(self.processed / minutes, 2) if minutes > 0 else None
+
+
+def default_refresh_interval():
+    return timedelta(days=getattr(settings, "SEO_REFRESH_INTERVAL_DAYS", 182))
+
+
+# When a post is next refreshed by `manage.py run_refresh_scheduler`, and how its last scheduled refresh went
+class RefreshPolicy(models.Model):
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_SKIPPED = "skipped"
+    STATUS_CHOICES = [
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+        (STATUS_SKIPPED, "Skipped"),
+    ]
+
+    blog = models.OneToOneField(Blog, on_delete=models.CASCADE, related_name="refresh_policy")
+    enabled = models.BooleanField(default=True)
+    interval = models.DurationField(default=default_refresh_interval)
+    # Save the refresh directly instead of storing it as a preview for review
+    auto_apply = models.BooleanField(default=False)
+    next_run_at = models.DateTimeField()
+    # Set while a scheduler works on the post; an expired lease (crashed worker) makes it due again
+    leased_until = models.DateTimeField(null=True, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True, default="")
+    # Consecutive failures, for exponential backoff
+    failures = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+
+    class Meta:
+        verbose_name_plural = "refresh policies"
+        indexes = [models.Index(fields=["enabled", "next_run_at"], name="refreshpolicy_due_idx")]
+
+    def __str__(self):
+        return f"Refresh Blog {self.blog_id} every {self.interval.days} days (next {self.next_run_at:%Y-%m-%d})"
+
+    @property
+    def interval_days(self):
+        return self.interval.days
+
+    @interval_days.setter
+    def interval_days(self, days):
+        self.interval = timedelta(days=days)
+
+
+# Corpus keyword index: every candidate phrase with the number of posts it occurs in
+class KeywordPhrase(models.Model):
+    phrase = models.CharField(max_length=255, unique=True)
+    document_frequency = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.phrase} ({self.document_frequency} posts)"
+
+
+# Posting: a phrase occurring in a post. `topic` copies Blog.topic so sibling-post lookups
+# ("strong in this topic, missing here") read one index instead of joining every post.
+class BlogKeyword(models.Model):
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="keyword_postings")
+    phrase = models.ForeignKey(KeywordPhrase, on_delete=models.CASCADE, related_name="postings")
+    topic = models.CharField(max_length=100, blank=True, null=True)
+    occurrences = models.PositiveIntegerField(default=1)
+    # Sublinear term frequency, 1 + ln(occurrences)
+    weight = models.FloatField(default=1.0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["blog", "phrase"], name="blogkeyword_blog_phrase_uniq")]
+        indexes = [models.Index(fields=["topic", "phrase"], name="blogkeyword_topic_phrase_idx")]
+
+    def __str__(self):
+        return f"Blog {self.blog_id}: {self.phrase_id} x{self.occurrences}"
+
+
+# Search performance of a post on one day, imported from Search Console / analytics exports. Append-only:
+# re-importing a day that is already stored keeps the first row.
+class SeoMetricDaily(models.Model):
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="daily_metrics")
+    date = models.DateField()
+    impressions = models.PositiveIntegerField(default=0)
+    clicks = models.PositiveIntegerField(default=0)
+    # Average ranking position for the day (lower is better); null when the export has none
+    position = models.FloatField(null=True, blank=True)
+    sessions = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["blog", "date"], name="seometricdaily_blog_date_uniq")]
+
+    def __str__(self):
+        return f"Blog {self.blog_id} on {self.date}: {self.clicks}/{self.impressions}"
+
+
+# A refresh saved onto a post; the reference point for before/after comparisons
+class RefreshEvent(models.Model):
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="refresh_events")
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-refreshed_at"]
+        indexes = [models.Index(fields=["blog", "refreshed_at"], name="refreshevent_blog_idx")]
+
+    def __str__(self):
+        return f"Blog {self.blog_id} refreshed {self.refreshed_at:%Y-%m-%d}"
+
+
+# Precomputed totals for the `window_days` days before and after a refresh (the refresh day itself
+# is in neither), kept current by the metrics importer so dashboards read one row per window
+class RefreshImpact(models.Model):
+    event = models.ForeignKey(RefreshEvent, on_delete=models.CASCADE, related_name="impacts")
+    window_days = models.PositiveSmallIntegerField()
+    before_days = models.PositiveIntegerField(default=0)
+    before_impressions = models.PositiveBigIntegerField(default=0)
+    before_clicks = models.PositiveBigIntegerField(default=0)
+    before_sessions = models.PositiveBigIntegerField(default=0)
+    before_position = models.FloatField(null=True, blank=True)
+    after_days = models.PositiveIntegerField(default=0)
+    after_impressions = models.PositiveBigIntegerField(default=0)
+    after_clicks = models.PositiveBigIntegerField(default=0)
+    after_sessions = models.PositiveBigIntegerField(default=0)
+    after_position = models.FloatField(null=True, blank=True)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["window_days"]
+        constraints = [models.UniqueConstraint(fields=["event", "window_days"], name="refreshimpact_event_window_uniq")]
+
+    def __str__(self):
+        return f"{self.event} ({self.window_days}-day window)"
+
+
+# One version of a post's title/content/meta tags. Every SNAPSHOT_EVERY-th revision (and the first) is
+# stored whole; the others as a line delta against the previous revision. Both are zlib-compressed JSON.
+class BlogRevision(models.Model):
+    KIND_SNAPSHOT = "snapshot"
+    KIND_DELTA = "delta"
+    KIND_CHOICES = [
+        (KIND_SNAPSHOT, "Snapshot"),
+        (KIND_DELTA, "Delta"),
+    ]
+
+    SOURCE_ORIGINAL = "original"
+    SOURCE_EDIT = "edit"
+    SOURCE_REFRESH = "refresh"
+    SOURCE_RESTORE = "restore"
+    SOURCE_CHOICES = [
+        (SOURCE_ORIGINAL, "Original"),
+        (SOURCE_EDIT, "Edit"),
+        (SOURCE_REFRESH, "Refresh"),
+        (SOURCE_RESTORE, "Restore"),
+    ]
+
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="revisions")
+    number = models.PositiveIntegerField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES)
+    data = models.BinaryField()
+    # sha256 of the version this revision rebuilds to
+    checksum = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["blog", "number"]
+        constraints = [models.UniqueConstraint(fields=["blog", "number"], name="blogrevision_blog_number_uniq")]
+
+    def __str__(self):
+        return f"Blog {self.blog_id} revision {self.number} ({self.source}, {self.kind})"
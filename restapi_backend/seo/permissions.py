@@ -1,4 +1,12 @@
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
 from rest_framework.permissions import BasePermission
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+def _has_metrics_token(request):
+    token = getattr(settings, "SEO_METRICS_TOKEN", "")
+    return bool(token) and constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}")
 
 class IsSuperUser(BasePermission):
     """
@@ -6,3 +14,21 @@ class IsSuperUser(BasePermission):
     """
     def has_permission(self, request, view):
         return bool(request.user and request.user.is_superuser)
+
+class MetricsAuthentication(JWTAuthentication):
+    """
+    JWT authentication that leaves `Bearer <SEO_METRICS_TOKEN>` to HasMetricsToken
+    instead of rejecting it as a malformed JWT.
+    """
+    def authenticate(self, request):
+        if _has_metrics_token(request):
+            return None
+        return super().authenticate(request)
+
+class HasMetricsToken(BasePermission):
+    """
+    Allows scrapers presenting `Authorization: Bearer <SEO_METRICS_TOKEN>`, and superusers.
+    Superuser-only when no token is configured.
+    """
+    def has_permission(self, request, view):
+        return _has_metrics_token(request) or bool(request.user and request.user.is_superuser)
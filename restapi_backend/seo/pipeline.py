@@ -0,0 +1,243 @@
+import hashlib
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from blog.models import Blog
+
+from .analysis import analyze_content, analyze_many
+from .metrics import count, stage
+from .models import RefreshPolicy
+from .keywords import missed_keywords, schedule_index_keywords
+from .similarity import index_blog, related_posts
+from .tracking import record_refresh
+from .revisions import blog_state, track_refresh
+from .staleness import record_staleness, staleness_score
+from .utils import (
+    CHUNK_GENERATION,
+    TITLE_GENERATION,
+    assemble_content,
+    fetch_current_trends,
+    generate_batch,
+    generate_text,
+    generation_cacheable,
+    iter_generate_batch,
+    plan_refresh,
+    regenerated_segments,
+    source_range,
+    update_meta_tags,
+)
+
+
+class RefreshError(Exception):
+    pass
+
+
+class PreviewConflict(RefreshError):
+    pass
+
+
+# Fingerprint of the source fields a refresh is generated from
+def source_hash(blog):
+    source = "\x1f".join([blog.title or "", blog.content or "", blog.topic or ""])
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+# Run analysis + generation for a blog and return the refreshed fields (nothing is saved)
+def generate_refresh(blog, incremental=None):
+    try:
+        return generate_refresh_many([blog], incremental=incremental)[0]
+    except Exception as e:
+        raise RefreshError(str(e)) from e
+
+
+# Same as generate_refresh for many blogs, sharing nlp.pipe and generation batches across posts
+def generate_refresh_many(blogs, batch_size=None, incremental=None):
+    analyses = analyze_many([blog.content for blog in blogs])
+    with stage("db_save"):
+        record_staleness(blogs, analyses)
+    current_year = datetime.now().year
+    trends = [fetch_current_trends(blog.topic, current_year) for blog in blogs]
+    with stage("plan"):
+        plans = [
+            plan_refresh(
+                blog.content, _with_variation(blog.title), analysis["outdated"], blog_trends,
+                analysis["keywords"], blog.topic, incremental=incremental,
+            )
+            for blog, analysis, blog_trends in zip(blogs, analyses, trends)
+        ]
+
+    titles = generate_batch([plan["title_prompt"] for plan in plans], batch_size=batch_size, **TITLE_GENERATION)
+    chunk_prompts = [prompt for plan in plans for prompt in plan["chunk_prompts"]]
+    chunks = generate_batch(chunk_prompts, batch_size=batch_size, **CHUNK_GENERATION)
+
+    refreshes = []
+    offset = 0
+    for blog, analysis, blog_trends, plan, title in zip(blogs, analyses, trends, plans, titles):
+        chunk_count = len(plan["chunk_prompts"])
+        content = assemble_content(plan, chunks[offset:offset + chunk_count])
+        offset += chunk_count
+        refreshes.append(_build_refresh(blog, analysis, blog_trends, plan, title, content))
+    _score_refreshes(refreshes)
+    return refreshes
+
+
+# Generate a preview step by step, yielding (event, data) as each part is ready:
+# "title" first, then one "chunk" per rewritten chunk in order, then "done" with the stored preview.
+def iter_preview_refresh(blog, incremental=None):
+    analysis = analyze_content(blog.content)
+    trends = fetch_current_trends(blog.topic, datetime.now().year)
+    with stage("plan"):
+        plan = plan_refresh(
+            blog.content, _with_variation(blog.title), analysis["outdated"], trends,
+            analysis["keywords"], blog.topic, incremental=incremental,
+        )
+
+    updated_title = generate_text(plan["title_prompt"], **TITLE_GENERATION)
+    yield "title", {"title": updated_title, "chunks": len(plan["chunks"]), "regenerating": len(plan["regenerate"])}
+
+    updated_chunks = []
+    batches = iter_generate_batch(
+        plan["chunk_prompts"],
+        batch_size=getattr(settings, "SEO_STREAM_BATCH_SIZE", 1),
+        sort_by_length=False,
+        **CHUNK_GENERATION
+    )
+    for prompt_index, text in batches:
+        updated_chunks.append(text)
+        index = plan["regenerate"][prompt_index]
+        start, end = source_range(plan, index)
+        yield "chunk", {"index": index, "text": text, "source_start": start, "source_end": end}
+
+    refresh = _build_refresh(blog, analysis, trends, plan, updated_title, assemble_content(plan, updated_chunks))
+    _score_refreshes([refresh])
+    preview = store_preview(blog, refresh)
+    yield "done", {
+        "preview_content": preview["content"],
+        "preview_meta_tags": preview["meta_tags"],
+        "trends_used": preview["trends_used"],
+        "regenerated_segments": preview["regenerated_segments"],
+        "related_posts": preview["related_posts"],
+        "missed_keywords": preview["missed_keywords"],
+        "preview_version": preview["version"],
+    }
+
+
+# Sampling mode gets a timestamp so every title prompt differs; deterministic modes leave it out
+# so the same title maps to the same cached result
+def _with_variation(title):
+    variation_prompt = "rewrite in SEO-friendly way with unique style variation"
+    if not generation_cacheable():
+        variation_prompt += f" {datetime.now().timestamp()}"
+    return f"{title} {variation_prompt}"
+
+
+def _build_refresh(blog, analysis, trends, plan, updated_title, updated_content):
+    current_year = datetime.now().year
+    new_keywords = ", ".join(analysis["keywords"] + [f"SEO optimized {current_year}", f"latest {blog.topic} trends"])
+    updated_meta = update_meta_tags(dict(blog.meta_tags or {}), new_keywords, updated_title, updated_content)
+    count("refresh_chunks", len(plan["chunks"]), kind="planned")
+    count("refresh_chunks", len(plan["regenerate"]), kind="regenerated")
+
+    return {
+        "title": updated_title,
+        "content": updated_content,
+        "meta_tags": updated_meta,
+        "trends_used": trends,
+        "regenerated_segments": regenerated_segments(plan),
+        "segments_total": len(plan["chunks"]),
+        "related_posts": related_posts(blog),
+        "missed_keywords": missed_keywords(blog),
+    }
+
+
+# Staleness score of the generated content, kept with the refresh (and so with a stored preview)
+# so applying it later doesn't analyse the content again on the request path
+def _score_refreshes(refreshes):
+    analyses = analyze_many([refresh["content"] for refresh in refreshes])
+    for refresh, analysis in zip(refreshes, analyses):
+        refresh["staleness_score"] = staleness_score(refresh["content"], analysis["outdated"])
+
+
+# Save a generated refresh onto the blog and drop any stored preview.
+# Generation runs outside any transaction; the write is one conditional UPDATE that only succeeds if the
+# post hasn't been edited since `blog` was loaded (raises PreviewConflict otherwise), so no lock or
+# transaction is ever held while a model is running.
+def apply_refresh(blog, refresh):
+    now = timezone.now()
+    score = refresh.get("staleness_score")
+    if score is None:  # a preview stored before scores were kept with it
+        score = staleness_score(refresh["content"], analyze_content(refresh["content"])["outdated"])
+    fields = {
+        "title": refresh["title"],
+        "content": refresh["content"],
+        "meta_tags": refresh["meta_tags"],
+        "preview_data": None,
+        "last_refreshed_at": now,
+        "staleness_score": score,
+        "updated_at": now,
+    }
+    before = blog_state(blog)
+    with stage("db_save"), transaction.atomic():
+        updated = Blog.objects.filter(pk=blog.pk, updated_at=blog.updated_at).update(**fields)
+        if updated:
+            # The revision history stores the refresh as a delta against the version it replaced
+            track_refresh(blog.pk, before, refresh)
+    if not updated:
+        raise PreviewConflict("The post was edited while the refresh was generated. Generate a new preview.")
+    for name, value in fields.items():
+        setattr(blog, name, value)
+    # update() sends no post_save, so the keyword and similarity indexes are updated here
+    schedule_index_keywords(blog.pk)
+    index_blog(blog)
+    # Any refresh, scheduled or not, puts the next scheduled one a full interval away
+    RefreshPolicy.objects.filter(blog_id=blog.pk).update(next_run_at=now + F("interval"))
+    record_refresh(blog.pk, now)
+    return blog
+
+
+# Persist a generated refresh as the blog's pending preview, tagged with the source hash and a version token
+def store_preview(blog, refresh):
+    preview = dict(
+        refresh,
+        source_hash=source_hash(blog),
+        version=uuid.uuid4().hex,
+        generated_at=timezone.now().isoformat(),
+    )
+    # update() skips auto_now so storing a preview doesn't count as editing the post
+    with stage("db_save"):
+        Blog.objects.filter(pk=blog.pk).update(preview_data=preview)
+    blog.preview_data = preview
+    return preview
+
+
+# Generate a refresh and store it as the blog's preview
+def preview_refresh(blog, incremental=None):
+    return store_preview(blog, generate_refresh(blog, incremental=incremental))
+
+
+# The stored preview, if it was generated from the blog's current source
+def current_preview(blog):
+    preview = blog.preview_data
+    if preview and preview.get("source_hash") == source_hash(blog):
+        return preview
+    return None
+
+
+# Apply the stored preview if it still matches the source, otherwise regenerate.
+# Returns (refresh, reused_preview).
+def confirm_refresh(blog, version=None):
+    preview = current_preview(blog)
+    if version and (preview is None or preview.get("version") != version):
+        raise PreviewConflict("Preview is out of date. Generate a new preview before confirming.")
+
+    if preview is not None:
+        refresh, reused = preview, True
+    else:
+        refresh, reused = generate_refresh(blog), False
+    apply_refresh(blog, refresh)
+    return refresh, reused
@@ -0,0 +1,124 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+NLP_MODEL_NAME = "en_core_web_sm"
+GENERATION_MODEL_NAME = "google/flan-t5-base"
+
+
+# Current resident set size of this process in MB (Linux /proc, else peak RSS)
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        return 0.0
+
+
+class ModelRegistry:
+    """
+    Lazily loads heavy models on first use and keeps one shared copy per process.
+    Loaders are registered by name; nothing is imported or loaded until get()/warm().
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._prewarm = []
+        self._models = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, prewarm=True):
+        self._loaders[name] = loader
+        if prewarm:
+            self._prewarm.append(name)
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def get(self, name):
+        # Fast path without the lock once a model is loaded
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        with self._lock:
+            if name not in self._models:
+                self._load(name)
+            return self._models[name]
+
+    def warm(self, *names):
+        for name in names or tuple(self._prewarm):
+            self.get(name)
+        return self.stats()
+
+    def unload(self, name):
+        with self._lock:
+            self._models.pop(name, None)
+            self._stats.pop(name, None)
+
+    def stats(self):
+        return {
+            name: dict(self._stats.get(name, {}), loaded=self.is_loaded(name))
+            for name in self._loaders
+        }
+
+    def _load(self, name):
+        if name not in self._loaders:
+            raise KeyError(f"No model registered under '{name}'")
+        rss_before = current_rss_mb()
+        started = time.perf_counter()
+        self._models[name] = self._loaders[name]()
+        load_seconds = time.perf_counter() - started
+        self._stats[name] = {
+            "load_seconds": round(load_seconds, 3),
+            "rss_delta_mb": round(current_rss_mb() - rss_before, 1),
+        }
+        logger.info("Loaded model '%s' in %.2fs (+%.1f MB RSS)", name, load_seconds, self._stats[name]["rss_delta_mb"])
+
+
+# Components detect_outdated never reads; only doc.ents is used
+NER_EXCLUDED_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+
+# Load the full spaCy pipeline
+def _load_nlp():
+    import spacy
+    return spacy.load(NLP_MODEL_NAME)
+
+
+# Load spaCy with only the entity recognizer (and tok2vec, if ner listens to it)
+def _load_ner():
+    import spacy
+    nlp = spacy.load(NLP_MODEL_NAME, exclude=NER_EXCLUDED_COMPONENTS)
+    if "tok2vec" in nlp.pipe_names and "ner" not in nlp.get_pipe("tok2vec").listening_components:
+        nlp.remove_pipe("tok2vec")
+    return nlp
+
+
+# Load the Hugging Face tokenizer on its own (chunking needs it without the model)
+def _load_tokenizer():
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(GENERATION_MODEL_NAME)
+
+
+# Load the generation backend selected by SEO_GENERATION_BACKEND (torch / torch-int8 / onnx),
+# or a client for the shared inference server when SEO_INFERENCE_SERVER_URL is set
+def _load_generator():
+    from .backends import load_generator
+    return load_generator()
+
+
+registry = ModelRegistry()
+registry.register("nlp", _load_nlp, prewarm=False)
+registry.register("ner", _load_ner)
+registry.register("tokenizer", _load_tokenizer)
+registry.register("generator", _load_generator)
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import zlib
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import BlogRevision
+
+
+class RevisionError(Exception):
+    pass
+
+
+# The versioned fields of a post
+def blog_state(blog):
+    return {"title": blog.title or "", "content": blog.content or "", "meta_tags": blog.meta_tags or {}}
+
+
+# The versioned fields of a dict such as a generated refresh
+def as_state(values):
+    return {"title": values["title"] or "", "content": values["content"] or "", "meta_tags": values["meta_tags"] or {}}
+
+
+def state_checksum(state):
+    payload = json.dumps(state, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _pack(value):
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _unpack(data):
+    return json.loads(zlib.decompress(bytes(data)))
+
+
+def _lines(text):
+    return text.splitlines(keepends=True)
+
+
+# Line delta turning `old` into `new`: [start, end] copies old lines, a string is inserted as is
+def make_delta(old, new):
+    a, b = _lines(old), _lines(new)
+    ops = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(b[j1:j2]))
+    return ops
+
+
+def apply_delta(old, ops):
+    a = _lines(old)
+    return "".join(op if isinstance(op, str) else "".join(a[op[0]:op[1]]) for op in ops)
+
+
+# Delta of a whole state: only changed fields are stored, content as a line delta
+def _state_delta(old, new):
+    delta = {}
+    if new["title"] != old["title"]:
+        delta["title"] = new["title"]
+    if new["meta_tags"] != old["meta_tags"]:
+        delta["meta_tags"] = new["meta_tags"]
+    if new["content"] != old["content"]:
+        delta["content"] = make_delta(old["content"], new["content"])
+    return delta
+
+
+def _apply_state_delta(state, delta):
+    state = dict(state)
+    if "title" in delta:
+        state["title"] = delta["title"]
+    if "meta_tags" in delta:
+        state["meta_tags"] = delta["meta_tags"]
+    if "content" in delta:
+        state["content"] = apply_delta(state["content"], delta["content"])
+    return state
+
+
+def snapshot_every():
+    return max(1, getattr(settings, "SEO_REVISION_SNAPSHOT_EVERY", 10))
+
+
+# Store `state` as the post's next revision (nothing is stored if it equals the latest one).
+# `previous` is the state of the latest revision when the caller already has it; otherwise it is rebuilt.
+def record_revision(blog_id, state, source, previous=None):
+    state = as_state(state)
+    latest = BlogRevision.objects.filter(blog_id=blog_id).order_by("-number").first()
+    checksum = state_checksum(state)
+    if latest is not None and latest.checksum == checksum:
+        return latest
+
+    number = latest.number + 1 if latest else 1
+    if latest is None or (number - 1) % snapshot_every() == 0:
+        kind, data = BlogRevision.KIND_SNAPSHOT, _pack(state)
+    else:
+        if previous is None or state_checksum(previous) != latest.checksum:
+            previous = rebuild(blog_id, latest.number)
+        kind, data = BlogRevision.KIND_DELTA, _pack(_state_delta(previous, state))
+    return BlogRevision.objects.create(
+        blog_id=blog_id, number=number, kind=kind, source=source, data=data, checksum=checksum
+    )
+
+
+# Record a refresh that replaced `before` with `after`. The first refresh also stores the original
+# version, and a version edited by hand since the last revision is stored before the refresh.
+def track_refresh(blog_id, before, after, source=BlogRevision.SOURCE_REFRESH):
+    before = as_state(before)
+    latest = BlogRevision.objects.filter(blog_id=blog_id).order_by("-number").only("checksum").first()
+    if latest is None:
+        record_revision(blog_id, before, BlogRevision.SOURCE_ORIGINAL)
+    elif latest.checksum != state_checksum(before):
+        record_revision(blog_id, before, BlogRevision.SOURCE_EDIT)
+    return record_revision(blog_id, after, source, previous=before)
+
+
+# The post as it was at revision `number`: the nearest snapshot at or before it plus the deltas after that
+def rebuild(blog_id, number):
+    snapshot = (
+        BlogRevision.objects.filter(blog_id=blog_id, number__lte=number, kind=BlogRevision.KIND_SNAPSHOT)
+        .order_by("-number")
+        .values_list("number", flat=True)
+        .first()
+    )
+    if snapshot is None:
+        raise RevisionError(f"Blog {blog_id} has no revision {number}")
+    revisions = list(
+        BlogRevision.objects.filter(blog_id=blog_id, number__gte=snapshot, number__lte=number).order_by("number")
+    )
+    if revisions[-1].number != number:
+        raise RevisionError(f"Blog {blog_id} has no revision {number}")
+
+    state = _unpack(revisions[0].data)
+    for revision in revisions[1:]:
+        state = _apply_state_delta(state, _unpack(revision.data))
+    if state_checksum(state) != revisions[-1].checksum:
+        raise RevisionError(f"Revision {number} of blog {blog_id} doesn't rebuild to its checksum")
+    return state
+
+
+# Put a post back to revision `number`; the restore is itself recorded as a new revision
+def restore_revision(blog, number):
+    state = rebuild(blog.pk, number)
+    with transaction.atomic():
+        track_refresh(blog.pk, blog_state(blog), state, source=BlogRevision.SOURCE_RESTORE)
+        blog.title, blog.content, blog.meta_tags = state["title"], state["content"], state["meta_tags"]
+        blog.preview_data = None
+        blog.save(update_fields=["title", "content", "meta_tags", "preview_data", "updated_at"])
+    return blog
+
+
+# Line diff in the shape of jsdiff's diffLines (parts with value/count and added or removed set)
+def diff_parts(old, new):
+    a, b = _lines(old or ""), _lines(new or "")
+    parts = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            parts.append({"value": "".join(a[i1:i2]), "count": i2 - i1})
+            continue
+        if i2 > i1:
+            parts.append({"value": "".join(a[i1:i2]), "count": i2 - i1, "removed": True})
+        if j2 > j1:
+            parts.append({"value": "".join(b[j1:j2]), "count": j2 - j1, "added": True})
+    return parts
+
+
+# Field-by-field diff of two versions, with added/removed line counts for the content
+def diff_states(old, new):
+    old_meta, new_meta = old["meta_tags"] or {}, new["meta_tags"] or {}
+    fields = {
+        "title": diff_parts(old["title"], new["title"]),
+        "content": diff_parts(old["content"], new["content"]),
+        "meta_description": diff_parts(old_meta.get("description", ""), new_meta.get("description", "")),
+        "meta_keywords": diff_parts(old_meta.get("keywords", ""), new_meta.get("keywords", "")),
+    }
+    content = fields["content"]
+    return {
+        "fields": fields,
+        "lines_added": sum(part["count"] for part in content if part.get("added")),
+        "lines_removed": sum(part["count"] for part in content if part.get("removed")),
+    }
@@ -0,0 +1,81 @@
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+# Replace text[start:end] (offsets into the original text) with `replacement`
+Edit = namedtuple("Edit", ["start", "end", "replacement"])
+
+# A standalone year; digits around it mean it's part of a longer number
+YEAR = re.compile(r"(?<!\d)(?:19|20)\d{2}(?!\d)")
+AS_OF = re.compile(r"[Aa]s\s+of\b")
+
+
+class OverlappingEditError(ValueError):
+    pass
+
+
+class OffsetMap:
+    """
+    Translates offsets between the original text and the text produced by apply_edits.
+    Offsets inside a replaced range map to the start of its replacement.
+    """
+
+    def __init__(self, edits):
+        self._source_starts = []
+        self._source_ends = []
+        self._target_starts = []
+        self._target_ends = []
+        delta = 0
+        for edit in edits:
+            self._source_starts.append(edit.start)
+            self._source_ends.append(edit.end)
+            self._target_starts.append(edit.start + delta)
+            delta += len(edit.replacement) - (edit.end - edit.start)
+            self._target_ends.append(edit.end + delta)
+
+    def to_target(self, offset):
+        return self._translate(offset, self._source_starts, self._source_ends, self._target_starts, self._target_ends)
+
+    def to_source(self, offset):
+        return self._translate(offset, self._target_starts, self._target_ends, self._source_starts, self._source_ends)
+
+    @staticmethod
+    def _translate(offset, from_starts, from_ends, to_starts, to_ends):
+        i = bisect_right(from_starts, offset) - 1
+        if i < 0:
+            return offset
+        if offset < from_ends[i]:
+            return to_starts[i]
+        return to_ends[i] + (offset - from_ends[i])
+
+
+# Apply non-overlapping edits in one pass. Edits may be given in any order; offsets always refer to
+# the original text. Returns (new_text, OffsetMap). Raises OverlappingEditError if two edits overlap.
+def apply_edits(text, edits):
+    edits = sorted(edits, key=lambda edit: (edit.start, edit.end))
+    parts = []
+    position = 0
+    for edit in edits:
+        if not 0 <= edit.start <= edit.end <= len(text):
+            raise ValueError(f"Edit {edit.start}:{edit.end} is outside the text (length {len(text)})")
+        if edit.start < position:
+            raise OverlappingEditError(f"Edit {edit.start}:{edit.end} overlaps an earlier edit ending at {position}")
+        parts.append(text[position:edit.start])
+        parts.append(edit.replacement)
+        position = edit.end
+    parts.append(text[position:])
+    return "".join(parts), OffsetMap(edits)
+
+
+# Edits that replace the year of each outdated (text, start, end) span with `year`. Only spans that are
+# a year ("2019") or an "as of" date ("As of March 2021") are rewritten, and only the year digits in
+# them; stats, prices and quantities ("1500 users", "2000 visitors") are left to the generator.
+def year_edits(outdated, year):
+    edits = []
+    for old, start, end in outdated:
+        if not (YEAR.fullmatch(old) or AS_OF.match(old)):
+            continue
+        match = YEAR.search(old)
+        if match:
+            edits.append(Edit(start + match.start(), start + match.end(), str(year)))
+    return edits
@@ -0,0 +1,63 @@
+import re
+from collections import namedtuple
+from datetime import datetime
+
+# A candidate outdated span. `ambiguous` spans are bare numbers that NER can confirm or reject.
+Span = namedtuple("Span", ["text", "start", "end", "kind", "ambiguous"])
+
+MONTH = (
+    r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?"
+    r"|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?"
+)
+NUMBER = r"(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?"
+SCALE = r"(?:\s?(?:thousand|million|billion|trillion|[kKmMbB]n?)\b)?"
+UNIT = (
+    r"(?:kg|g|lbs?|pounds|tons?|km|m|cm|mm|mi|miles|meters|metres|feet|ft|inches"
+    r"|[KMGT]B|hours?|hrs?|minutes?|mins?|seconds?|secs?|days?|weeks?|months?|years?"
+    r"|users|customers|people|employees|visitors|downloads|times|x)"
+)
+YEAR = r"(?:19|20)\d{2}"
+
+# One alternation scanned left to right; earlier groups win when two could start at the same place.
+# Ranges ("2019-2020", "10 - 20") are history, not a stale current figure, so neither end is a span.
+# The leading lookahead rejects most positions (ordinary letters) before any alternative is tried.
+OUTDATED_PATTERN = re.compile(
+    rf"""
+    (?=[\d$€£¥AaUEG])
+    (?: (?P<as_of>\b[Aa]s\s+of\s+(?:{MONTH}\s+(?:\d{{1,2}},?\s+)?)?{YEAR}\b)
+    | (?P<currency>(?:[$€£¥]|\b(?:USD|EUR|GBP)\s?){NUMBER}{SCALE})
+    | (?P<percent>(?<![\w.]){NUMBER}\s?(?:%|percent\b|per\s+cent\b))
+    | (?P<quantity>(?<![\w.]){NUMBER}{SCALE}\s?{UNIT}\b)
+    | (?P<year>(?<![\w.,$€£¥–—-])(?<![–—-]\s){YEAR}(?![\w%]|[.,]\d|\s?[–—-]\s?\d))
+    | (?P<number>(?<![\w.,–—-])(?<![–—-]\s){NUMBER}(?![\w%]|[.,]\d|\s?[–—-]\s?\d))
+    )
+    """,
+    re.VERBOSE,
+)
+
+
+# Single regex pass over the content: years before current_year, stats, money, quantities and "as of" dates
+def scan_outdated(content, current_year=None):
+    current_year = current_year or datetime.now().year
+    spans = []
+    for match in OUTDATED_PATTERN.finditer(content):
+        kind = match.lastgroup
+        if kind == "year" and int(match.group()) >= current_year:
+            continue
+        if kind == "as_of" and int(match.group()[-4:]) >= current_year:
+            continue
+        spans.append(Span(match.group(), match.start(), match.end(), kind, kind == "number"))
+    return spans
+
+
+# Text around a span (snapped to whitespace) for a cheap NER second pass
+def context_window(content, span, radius=80):
+    start = max(0, span.start - radius)
+    end = min(len(content), span.end + radius)
+    if start > 0:
+        space = content.find(" ", start, span.start)
+        start = space + 1 if space != -1 else start
+    if end < len(content):
+        space = content.rfind(" ", span.end, end)
+        end = space if space != -1 else end
+    return start, content[start:end]
@@ -0,0 +1,236 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .metrics import count, stage
+from .models import RefreshPolicy
+from .pipeline import PreviewConflict, apply_refresh, generate_refresh_many, store_preview
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, "SEO_SCHEDULER", {}).get(name, default)
+
+
+# Create policies for posts that have none; the first run is one interval after their last refresh
+def schedule_blogs(blogs, interval=None, auto_apply=False):
+    interval = interval or RefreshPolicy._meta.get_field("interval").get_default()
+    policies = [
+        RefreshPolicy(
+            blog_id=blog.pk, interval=interval, auto_apply=auto_apply,
+            next_run_at=(blog.last_refreshed_at or timezone.now()) + interval,
+        )
+        for blog in blogs.filter(refresh_policy__isnull=True).only("id", "last_refreshed_at")
+    ]
+    RefreshPolicy.objects.bulk_create(policies, batch_size=500, ignore_conflicts=True)
+    return len(policies)
+
+
+# Delay before retrying after `failures` consecutive failures: doubles from BACKOFF_BASE up to
+# BACKOFF_MAX, less up to 10% jitter so posts that failed together don't all retry together
+def backoff_delay(failures):
+    base = _setting("BACKOFF_BASE", 300)
+    delay = min(base * 2 ** max(failures - 1, 0), _setting("BACKOFF_MAX", 24 * 3600))
+    return timedelta(seconds=delay * random.uniform(0.9, 1.0))
+
+
+# Lease up to `limit` due policies, most overdue first. Rows another scheduler is claiming are
+# skipped (SELECT ... FOR UPDATE SKIP LOCKED where supported; SQLite serialises the write
+# transaction instead) and the lease keeps them out of later claims while the refresh runs.
+def claim_due(limit, lease=None):
+    now = timezone.now()
+    lease = lease or timedelta(minutes=_setting("LEASE_MINUTES", 30))
+    with transaction.atomic():
+        ids = list(
+            RefreshPolicy.objects.select_for_update(skip_locked=True)
+            .filter(enabled=True, next_run_at__lte=now)
+            .filter(Q(leased_until__isnull=True) | Q(leased_until__lt=now))
+            .order_by("next_run_at")
+            .values_list("pk", flat=True)[:limit]
+        )
+        if ids:
+            RefreshPolicy.objects.filter(pk__in=ids).update(leased_until=now + lease)
+    return ids
+
+
+# Refresh the posts of the given policies together (shared generation batches) and record each outcome.
+# If the batch fails, each post is retried on its own so one bad post doesn't back off the others.
+def run_policies(policy_ids):
+    policies = list(RefreshPolicy.objects.filter(pk__in=policy_ids).select_related("blog"))
+    if not policies:
+        return {}
+    try:
+        with stage("scheduled_refresh"):
+            refreshes = generate_refresh_many([policy.blog for policy in policies])
+    except Exception as e:
+        if len(policies) > 1:
+            outcomes = {}
+            for policy in policies:
+                outcomes.update(run_policies([policy.pk]))
+            return outcomes
+        _record(policies[0], RefreshPolicy.STATUS_FAILED, error=e)
+        return {policies[0].blog_id: RefreshPolicy.STATUS_FAILED}
+
+    outcomes = {}
+    for policy, refresh in zip(policies, refreshes):
+        try:
+            if policy.auto_apply:
+                apply_refresh(policy.blog, refresh)
+            else:
+                store_preview(policy.blog, refresh)
+        except PreviewConflict:
+            # Edited while generating: the author just touched it, so it counts as fresh
+            _record(policy, RefreshPolicy.STATUS_SKIPPED)
+        except Exception as e:
+            _record(policy, RefreshPolicy.STATUS_FAILED, error=e)
+        else:
+            _record(policy, RefreshPolicy.STATUS_SUCCEEDED)
+        outcomes[policy.blog_id] = policy.last_status
+    return outcomes
+
+
+def _record(policy, outcome, error=None):
+    now = timezone.now()
+    policy.last_run_at = now
+    policy.last_status = outcome
+    policy.leased_until = None
+    if outcome == RefreshPolicy.STATUS_FAILED:
+        logger.warning("Scheduled refresh of blog %s failed (%s in a row): %s", policy.blog_id, policy.failures + 1, error)
+        policy.failures += 1
+        policy.last_error = str(error)
+        policy.next_run_at = now + backoff_delay(policy.failures)
+    else:
+        policy.failures = 0
+        policy.last_error = ""
+        policy.next_run_at = now + policy.interval
+    policy.save(update_fields=["last_run_at", "last_status", "leased_until", "failures", "last_error", "next_run_at"])
+    count("scheduled_refreshes", status=outcome)
+
+
+class RateLimiter:
+    """Token bucket: at most `per_minute` posts started per minute, with bursts of up to `burst`."""
+
+    def __init__(self, per_minute, burst=None):
+        self.rate = per_minute / 60.0 if per_minute else None
+        self.capacity = burst or max(1, per_minute or 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def available(self):
+        if self.rate is None:
+            return self.capacity
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return int(self.tokens)
+
+    def take(self, n):
+        if self.rate is not None:
+            self.tokens -= n
+
+    # Seconds until one more token is available
+    def wait_time(self):
+        if self.rate is None or self.available() >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+# 1-minute load average per CPU, or None where the OS doesn't report it
+def load_per_cpu():
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+
+class Scheduler:
+    """
+    Long-running loop behind `manage.py run_refresh_scheduler`. Due posts are claimed only as
+    worker slots free up, `posts_per_task` at a time, so a backlog of thousands drains at a
+    steady rate: at most `workers` tasks run at once, at most `max_per_minute` posts start per
+    minute, and nothing new starts while the load average per CPU is above `max_load`.
+    """
+
+    def __init__(self, workers=None, posts_per_task=None, max_per_minute=None, max_load=None, poll_interval=None):
+        self.workers = max(1, workers or _setting("WORKERS", 2))
+        self.posts_per_task = max(1, posts_per_task or _setting("POSTS_PER_TASK", 4))
+        self.limiter = RateLimiter(
+            _setting("MAX_PER_MINUTE", 30) if max_per_minute is None else max_per_minute, burst=self.posts_per_task
+        )
+        self.max_load = _setting("MAX_LOAD_PER_CPU", 0.8) if max_load is None else max_load
+        self.poll_interval = _setting("POLL_INTERVAL", 30) if poll_interval is None else poll_interval
+        self.stopping = threading.Event()
+        self.started = 0
+
+    def stop(self):
+        self.stopping.set()
+
+    # Run until stop(); with `once`, exit when nothing is due and all tasks have finished
+    def run(self, once=False, on_task_done=None):
+        running = set()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="seo-scheduler") as pool:
+            while not self.stopping.is_set():
+                if len(running) >= self.workers:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    self._finished(done, on_task_done)
+                    continue
+
+                pause = self._throttle()
+                if pause:
+                    self.stopping.wait(pause)
+                    continue
+
+                close_old_connections()
+                ids = claim_due(min(self.posts_per_task, self.limiter.available()))
+                if not ids:
+                    if once and not running:
+                        break
+                    if running:
+                        done, running = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                        self._finished(done, on_task_done)
+                    else:
+                        self.stopping.wait(self.poll_interval)
+                    continue
+
+                self.limiter.take(len(ids))
+                self.started += len(ids)
+                running.add(pool.submit(_run_task, ids))
+
+            done, _ = wait(running)
+            self._finished(done, on_task_done)
+
+    # Seconds to hold off claiming work (CPU budget or rate limit), 0 to go ahead
+    def _throttle(self):
+        load = load_per_cpu()
+        if self.max_load and load is not None and load > self.max_load:
+            logger.info("Load %.2f per CPU is above %.2f, pausing scheduled refreshes", load, self.max_load)
+            return min(self.poll_interval, 5)
+        return self.limiter.wait_time()
+
+    def _finished(self, done, callback):
+        for future in done:
+            outcomes = future.result()
+            if callback:
+                callback(outcomes)
+
+
+def _run_task(policy_ids):
+    close_old_connections()
+    try:
+        return run_policies(policy_ids)
+    except Exception:
+        # Outcomes couldn't be recorded (e.g. the database went away); leases expire and the posts come back
+        logger.exception("Scheduled refresh task for policies %s failed", policy_ids)
+        return {}
+    finally:
+        close_old_connections()
@@ -0,0 +1,65 @@
+from rest_framework import serializers
+from blog.models import Blog
+from .models import BlogRevision, BulkRefreshRun, RefreshJob, RefreshPolicy
+
+
+class RefreshJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.UUIDField(source="id", read_only=True)
+
+    class Meta:
+        model = RefreshJob
+        fields = ("job_id", "blog", "action", "status", "result", "error", "created_at", "started_at", "finished_at")
+        read_only_fields = fields
+
+
+class BulkRefreshRunSerializer(serializers.ModelSerializer):
+    posts_per_minute = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = BulkRefreshRun
+        fields = (
+            "id", "filters", "apply", "status", "total", "processed", "last_blog_id",
+            "posts_per_minute", "error", "created_at", "started_at", "updated_at", "finished_at",
+        )
+        read_only_fields = fields
+
+
+# Body of a bulk refresh request: the filters of seo.bulk.select_blogs plus whether to apply directly
+class BulkRefreshRequestSerializer(serializers.Serializer):
+    topic = serializers.CharField(required=False, allow_blank=True)
+    author = serializers.CharField(required=False, allow_blank=True)
+    older_than_days = serializers.IntegerField(required=False, allow_null=True, min_value=0, max_value=36500)
+    not_refreshed_days = serializers.IntegerField(required=False, allow_null=True, min_value=0, max_value=36500)
+    apply = serializers.BooleanField(default=False)
+
+
+class StalePostSerializer(serializers.ModelSerializer):
+    author = serializers.ReadOnlyField(source="author.username")
+
+    class Meta:
+        model = Blog
+        fields = ("id", "title", "topic", "author", "last_refreshed_at", "staleness_score", "updated_at")
+        read_only_fields = fields
+
+
+class RefreshPolicySerializer(serializers.ModelSerializer):
+    interval_days = serializers.IntegerField(min_value=1, required=False)
+
+    class Meta:
+        model = RefreshPolicy
+        fields = (
+            "blog", "enabled", "interval_days", "auto_apply", "next_run_at",
+            "last_run_at", "last_status", "failures", "last_error",
+        )
+        read_only_fields = ("blog", "last_run_at", "last_status", "failures", "last_error")
+        extra_kwargs = {"next_run_at": {"required": False}}
+
+
+class BlogRevisionSerializer(serializers.ModelSerializer):
+    # Stored (compressed) size in bytes, annotated by the view
+    size = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = BlogRevision
+        fields = ("number", "kind", "source", "checksum", "size", "created_at")
+        read_only_fields = fields
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from blog.models import Blog
+
+from .keywords import schedule_index_keywords, unindex_keywords
+from .scheduler import schedule_blogs
+from .similarity import index_blog, unindex_blog
+
+INDEXED_FIELDS = {"title", "content", "topic"}
+
+
+# Keep the corpus keyword index and the similarity index in step with saved posts. Both are updated
+# after commit, so rolled-back saves aren't indexed and the save itself doesn't wait on keyword
+# extraction. Saves limited to other fields don't change either index.
+@receiver(post_save, sender=Blog, dispatch_uid="seo_index_blog")
+def blog_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    if created and getattr(settings, "SEO_SCHEDULE_NEW_POSTS", True):
+        schedule_blogs(Blog.objects.filter(pk=instance.pk))
+    if update_fields is not None and not INDEXED_FIELDS & set(update_fields):
+        return
+    schedule_index_keywords(instance.pk)
+    if getattr(settings, "SEO_SIMILARITY_AUTO_UPDATE", True):
+        transaction.on_commit(lambda: index_blog(instance))
+
+
+# pre_delete: the post's keyword postings are still there to decrement document frequencies
+@receiver(pre_delete, sender=Blog, dispatch_uid="seo_unindex_blog")
+def blog_deleted(sender, instance, **kwargs):
+    pk = instance.pk
+    unindex_keywords(pk)
+    if getattr(settings, "SEO_SIMILARITY_AUTO_UPDATE", True):
+        transaction.on_commit(lambda: unindex_blog(pk))
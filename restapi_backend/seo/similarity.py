@@ -0,0 +1,352 @@
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import tempfile
+import threading
+import uuid
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+
+import numpy as np
+from django.conf import settings
+
+from .metrics import stage
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers in different processes aren't serialised
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#'-]*[a-z0-9+#]|[a-z0-9]")
+# Title terms count this many times towards a post's term frequencies
+TITLE_WEIGHT = 3
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just let me more most my myself
+new no nor not now of off on once only or other our ours ourselves out over own same she should so some
+such than that the their theirs them themselves then there these they this those through to too under
+until up us very was we were what when where which while who whom why will with would you your yours
+yourself yourselves
+""".split())
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+# Column and sign of a term in the hashed feature space (crc32, so every process agrees)
+@lru_cache(maxsize=65536)
+def _feature(term, dimensions):
+    h = zlib.crc32(term.encode("utf-8"))
+    return h % dimensions, 1.0 if h & 0x80000000 else -1.0
+
+
+def _term_counts(title, content):
+    counts = Counter(tokenize(content))
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+    return counts
+
+
+class SimilarityIndex:
+    """
+    TF-IDF vectors of every Blog (title + content) for "related posts" lookups.
+
+    Terms are hashed into a fixed number of signed columns, so each post is one L2-normalised
+    float32 row and dot products are cosine similarities. IDF weights come from the last full
+    build; posts saved since then are vectorised with those weights and written into their row in
+    place. Rows live in memory-mapped .npy files that every worker maps read-only, so they share
+    one copy in the page cache and see in-place updates without reloading. A full build or a
+    capacity increase writes a new generation directory and switches the CURRENT pointer to it.
+    """
+
+    def __init__(self, path, dimensions=512):
+        self.path = str(path)
+        self.dimensions = dimensions
+        self._loaded = None
+        # (ids, vectors, idf, default_idf) of the mapped generation, swapped as one tuple
+        self._state = None
+        # Reentrant: writers re-check the current generation while holding it
+        self._lock = threading.RLock()
+
+    # -- reading -----------------------------------------------------------------------------
+
+    def _current(self):
+        try:
+            with open(os.path.join(self.path, "CURRENT")) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        generation = self._current()
+        if generation != self._loaded:
+            with self._lock:
+                if generation != self._loaded:
+                    self._open(generation)
+        return self._state
+
+    def _open(self, generation):
+        self._state = None
+        self._loaded = generation
+        if generation is None:
+            return
+        directory = os.path.join(self.path, generation)
+        try:
+            with open(os.path.join(directory, "vocab.json")) as f:
+                vocab = json.load(f)
+            ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode="r")
+            vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning("Can't open similarity index %s: %s", directory, e)
+            return
+        if vocab["dimensions"] != self.dimensions:
+            logger.warning(
+                "Similarity index has %s dimensions, settings ask for %s; rebuild it", vocab["dimensions"], self.dimensions
+            )
+            return
+        self._state = (ids, vectors, vocab["idf"], vocab["default_idf"])
+
+    def exists(self):
+        return self._load() is not None
+
+    # Switch to the index under `path`; the next lookup maps whatever generation is there
+    def relocate(self, path):
+        with self._lock:
+            self.path = str(path)
+            self._loaded = None
+            self._state = None
+
+    def __len__(self):
+        state = self._load()
+        return int(np.count_nonzero(state[0])) if state else 0
+
+    # The k posts most similar to `pk` as (pk, score) pairs, best first; [] if `pk` isn't indexed
+    def related(self, pk, k=5, min_score=0.0):
+        state = self._load()
+        if not state:
+            return []
+        ids, vectors = state[0], state[1]
+        rows = np.flatnonzero(ids == pk)
+        if not len(rows) or k <= 0:
+            return []
+        scores = np.asarray(vectors @ vectors[rows[0]])
+        scores[ids == 0] = -np.inf
+        scores[rows[0]] = -np.inf
+        k = min(k, len(scores) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(ids[i]), round(float(scores[i]), 4)) for i in top if scores[i] > min_score]
+
+    def vectorize(self, title, content):
+        _, _, idf, default_idf = self._load()
+        return self._vector(_term_counts(title, content), idf, default_idf)
+
+    def _vector(self, counts, idf, default_idf):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        if not counts:
+            return vector
+        columns, weights = [], []
+        for term, tf in counts.items():
+            column, sign = _feature(term, self.dimensions)
+            columns.append(column)
+            weights.append(sign * (1.0 + math.log(tf)) * idf.get(term, default_idf))
+        np.add.at(vector, columns, weights)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    # -- writing -----------------------------------------------------------------------------
+
+    @contextmanager
+    def _write_lock(self):
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock, open(os.path.join(self.path, "lock"), "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # Full rebuild. `documents` is a callable returning a fresh iterable of (pk, title, content);
+    # it is read twice (document frequencies, then vectors) so posts never all sit in memory.
+    def build(self, documents, capacity=None):
+        df = Counter()
+        total = 0
+        for _, title, content in documents():
+            df.update(_term_counts(title, content).keys())
+            total += 1
+
+        # Smoothed IDF; terms seen in one post only get `default_idf`, which is also used for unseen terms
+        default_idf = math.log((1 + total) / 2) + 1
+        idf = {term: round(math.log((1 + total) / (1 + n)) + 1, 4) for term, n in df.items() if n > 1}
+        capacity = max(capacity or 0, int(total * 1.25) + 64)
+
+        with self._write_lock():
+            generation, directory = self._new_generation()
+            ids = np.lib.format.open_memmap(os.path.join(directory, "ids.npy"), "w+", np.int64, (capacity,))
+            vectors = np.lib.format.open_memmap(
+                os.path.join(directory, "vectors.npy"), "w+", np.float32, (capacity, self.dimensions)
+            )
+            row = 0
+            for pk, title, content in documents():
+                if row == capacity:
+                    break  # posts created between the two passes are added by the save signal
+                vectors[row] = self._vector(_term_counts(title, content), idf, default_idf)
+                ids[row] = pk
+                row += 1
+            ids.flush()
+            vectors.flush()
+            del ids, vectors
+            self._write_vocab(directory, idf, default_idf, total)
+            self._switch(generation)
+        return row
+
+    # Add or replace one post's row
+    def update(self, pk, title, content):
+        if not self._load():
+            return False
+        vector = self.vectorize(title, content)
+        with self._write_lock():
+            ids = self._load()[0]
+            rows = np.flatnonzero(ids == pk)
+            if not len(rows):
+                rows = np.flatnonzero(ids == 0)
+            if not len(rows):
+                self._grow()
+                rows = np.flatnonzero(self._state[0] == 0)
+            directory = os.path.join(self.path, self._loaded)
+            vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r+")
+            vectors[rows[0]] = vector
+            vectors.flush()
+            # The id goes in last so readers never match a half-written row
+            ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode="r+")
+            ids[rows[0]] = pk
+            ids.flush()
+        return True
+
+    def remove(self, pk):
+        if not self._load():
+            return False
+        with self._write_lock():
+            rows = np.flatnonzero(self._load()[0] == pk)
+            if not len(rows):
+                return False
+            ids = np.load(os.path.join(self.path, self._loaded, "ids.npy"), mmap_mode="r+")
+            ids[rows] = 0
+            ids.flush()
+        return True
+
+    # Copy the current rows into a generation with twice the capacity (called with the write lock held)
+    def _grow(self):
+        old_ids, old_vectors = self._state[:2]
+        capacity = max(64, len(old_ids) * 2)
+        generation, directory = self._new_generation()
+        ids = np.lib.format.open_memmap(os.path.join(directory, "ids.npy"), "w+", np.int64, (capacity,))
+        vectors = np.lib.format.open_memmap(
+            os.path.join(directory, "vectors.npy"), "w+", np.float32, (capacity, self.dimensions)
+        )
+        ids[:len(old_ids)] = old_ids
+        vectors[:len(old_ids)] = old_vectors
+        ids.flush()
+        vectors.flush()
+        del ids, vectors
+        shutil.copyfile(os.path.join(self.path, self._loaded, "vocab.json"), os.path.join(directory, "vocab.json"))
+        self._switch(generation)
+
+    def _new_generation(self):
+        generation = uuid.uuid4().hex[:12]
+        directory = os.path.join(self.path, generation)
+        os.makedirs(directory)
+        return generation, directory
+
+    def _write_vocab(self, directory, idf, default_idf, documents):
+        with open(os.path.join(directory, "vocab.json"), "w") as f:
+            json.dump(
+                {"dimensions": self.dimensions, "documents": documents, "default_idf": default_idf, "idf": idf}, f
+            )
+
+    # Point CURRENT at `generation` (atomic rename) and delete older generations. Workers that still
+    # map an old generation keep reading it until their next lookup notices the switch.
+    def _switch(self, generation):
+        pointer = os.path.join(self.path, "CURRENT")
+        with open(pointer + ".tmp", "w") as f:
+            f.write(generation)
+        os.replace(pointer + ".tmp", pointer)
+        self._open(generation)
+        for name in os.listdir(self.path):
+            path = os.path.join(self.path, name)
+            if name != generation and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+
+similarity_index = SimilarityIndex(
+    getattr(settings, "SEO_SIMILARITY_INDEX_DIR", os.path.join(settings.BASE_DIR, ".seo_index")),
+    dimensions=getattr(settings, "SEO_SIMILARITY_DIMENSIONS", 512),
+)
+
+
+# Point the shared index at an empty temporary directory while the block runs. Test databases
+# (the test runner, bench_refresh) use it so their posts never overwrite rows of the real index.
+@contextmanager
+def temporary_index():
+    previous = similarity_index.path
+    with tempfile.TemporaryDirectory(prefix="seo_index_") as path:
+        similarity_index.relocate(path)
+        try:
+            yield similarity_index
+        finally:
+            similarity_index.relocate(previous)
+
+
+# Every post as (pk, title, content), streamed in pk order
+def iter_blog_documents(chunk_size=500):
+    from blog.models import Blog
+    return Blog.objects.order_by("pk").values_list("pk", "title", "content").iterator(chunk_size=chunk_size)
+
+
+def rebuild_index():
+    return similarity_index.build(iter_blog_documents)
+
+
+# Keep a post's row current after it was written; failures are logged, never raised into the save
+def index_blog(blog):
+    try:
+        similarity_index.update(blog.pk, blog.title, blog.content)
+    except (OSError, ValueError) as e:
+        logger.warning("Similarity index update for blog %s failed: %s", blog.pk, e)
+
+
+def unindex_blog(pk):
+    try:
+        similarity_index.remove(pk)
+    except (OSError, ValueError) as e:
+        logger.warning("Similarity index removal of blog %s failed: %s", pk, e)
+
+
+# Internal-link suggestions for a post: [{"id", "title", "topic", "score"}], most similar first
+def related_posts(blog, k=None):
+    from blog.models import Blog
+
+    k = getattr(settings, "SEO_RELATED_POSTS", 5) if k is None else k
+    with stage("related_posts"):
+        matches = similarity_index.related(blog.pk, k, min_score=getattr(settings, "SEO_RELATED_MIN_SCORE", 0.05))
+        if not matches:
+            return []
+        posts = Blog.objects.only("id", "title", "topic").in_bulk([pk for pk, _ in matches])
+    return [
+        {"id": pk, "title": posts[pk].title, "topic": posts[pk].topic, "score": score}
+        for pk, score in matches
+        if pk in posts
+    ]
@@ -0,0 +1,66 @@
+import math
+from datetime import timedelta
+
+from django.utils import timezone
+
+from blog.models import Blog
+
+ORDERINGS = ("oldest", "score")
+# Longest "not refreshed in N months" window accepted; older than that is every post anyway
+MAX_MONTHS = 1200
+
+
+# Outdated spans per 1,000 characters of content
+def staleness_score(content, outdated):
+    if not content:
+        return 0.0
+    return round(len(outdated) * 1000 / len(content), 4)
+
+
+# Store the score of each analysed blog (one bulk UPDATE; updated_at is left alone)
+def record_staleness(blogs, analyses):
+    scored = []
+    for blog, analysis in zip(blogs, analyses):
+        if blog.pk is None:
+            continue
+        blog.staleness_score = staleness_score(blog.content, analysis["outdated"])
+        scored.append(blog)
+    if scored:
+        Blog.objects.bulk_update(scored, ["staleness_score"])
+    return scored
+
+
+# Days in a "not refreshed in `months` months" window (30-day months); raises ValueError unless
+# `months` is a finite positive number of at most MAX_MONTHS
+def months_to_days(months):
+    if not (math.isfinite(months) and 0 < months <= MAX_MONTHS):
+        raise ValueError(f"months must be a number greater than 0 and at most {MAX_MONTHS}")
+    return round(months * 30)
+
+
+# Posts due for a refresh: optionally in `topic`, not refreshed for `older_than_days`, with a score of at
+# least `min_score`. "oldest" orders by last refresh (topic, last_refreshed_at index); "score" puts the
+# most outdated first and skips unscored posts ((topic, -staleness_score) index, or (-staleness_score, id)
+# without a topic). Content is not loaded.
+def select_stale(topic=None, older_than_days=None, min_score=None, order="oldest", limit=50):
+    if order not in ORDERINGS:
+        raise ValueError(f"order must be one of: {', '.join(ORDERINGS)}")
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    if min_score is not None and not math.isfinite(min_score):
+        raise ValueError("min_score must be a finite number")
+    blogs = Blog.objects.select_related("author").only(
+        "id", "title", "topic", "last_refreshed_at", "staleness_score", "updated_at", "author__username"
+    )
+    if topic:
+        blogs = blogs.filter(topic=topic)
+    if older_than_days is not None:
+        blogs = blogs.filter(last_refreshed_at__lt=timezone.now() - timedelta(days=older_than_days))
+    if min_score is not None:
+        blogs = blogs.filter(staleness_score__gte=min_score)
+
+    if order == "score":
+        blogs = blogs.filter(staleness_score__isnull=False).order_by("-staleness_score", "id")
+    else:
+        blogs = blogs.order_by("last_refreshed_at", "id")
+    return blogs[:limit]
@@ -0,0 +1,63 @@
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from rest_framework.renderers import BaseRenderer
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets DRF accept `Accept: text/event-stream` (EventSource) requests.
+    Streaming views return their own response; this only renders errors raised before the stream starts.
+    """
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return f"event: error\ndata: {json.dumps(data)}\n\n"
+
+
+# Format (event, data) pairs as server-sent events; failures become a final "error" event
+def sse_events(events):
+    try:
+        for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    except Exception as e:
+        logger.exception("Streaming refresh failed")
+        yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
+
+
+# One generator step in a worker thread. Steps land on arbitrary executor threads, so the database
+# connections they open (cache lookups, store_preview) are closed the way a request's would be.
+def _step(iterator):
+    close_old_connections()
+    try:
+        return next(iterator, _DONE)
+    finally:
+        close_old_connections()
+
+
+# Under ASGI Django buffers sync iterators completely before sending them,
+# so step through the generator in a worker thread and hand chunks to the event loop as they arrive
+async def iterate_in_thread(iterator):
+    iterator = iter(iterator)
+    step = sync_to_async(_step, thread_sensitive=False)
+    while True:
+        item = await step(iterator)
+        if item is _DONE:
+            break
+        yield item
+
+
+# Pick a sync or async body for StreamingHttpResponse depending on how the request is served
+def stream_body(request, iterator):
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        return iterate_in_thread(iterator)
+    return iterator
@@ -0,0 +1,28 @@
+from contextlib import ExitStack
+
+from django.test.runner import DiscoverRunner
+
+from .analysis import analysis_cache
+from .similarity import temporary_index
+from .utils import generation_cache
+
+
+class SeoTestRunner(DiscoverRunner):
+    """
+    DiscoverRunner that keeps test runs away from state shared with the real site: the
+    similarity index in SEO_SIMILARITY_INDEX_DIR gets an empty temporary stand-in (test posts'
+    pks would overwrite real rows), and the analysis/generation caches stay in memory instead of
+    writing test results into the persistent cache.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._isolation = ExitStack()
+        self._isolation.enter_context(temporary_index())
+        for cache in (analysis_cache, generation_cache):
+            self._isolation.callback(setattr, cache, "persistent_alias", cache.persistent_alias)
+            cache.persistent_alias = None
+
+    def teardown_test_environment(self, **kwargs):
+        self._isolation.close()
+        super().teardown_test_environment(**kwargs)
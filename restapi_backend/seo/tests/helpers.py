@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+
+from blog.models import Blog
+from seo.analysis import analysis_cache
+from seo.benchmarks import use_stand_in_models
+from seo.utils import generation_cache
+
+
+class StandInModelsMixin:
+    """Run the refresh pipeline offline on the benchmark stand-in tokenizer and generator."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tokenizer, cls.backend = use_stand_in_models()
+
+    def setUp(self):
+        super().setUp()
+        analysis_cache.clear()
+        generation_cache.clear()
+
+    # Prompts sent to the generator while the block runs
+    @contextmanager
+    def capture_prompts(self):
+        prompts = []
+        generate = self.backend.generate
+
+        def recording(batch, **kwargs):
+            prompts.extend(batch)
+            return generate(batch, **kwargs)
+
+        self.backend.generate = recording
+        try:
+            yield prompts
+        finally:
+            self.backend.generate = generate
+
+
+def make_blog(author=None, **fields):
+    author = author or User.objects.get_or_create(username="writer")[0]
+    fields.setdefault("title", "Best SEO tools for 2019")
+    fields.setdefault("content", "In 2019 we had 1500 users.\n\nOur newsletter grew every month.")
+    fields.setdefault("topic", "seo")
+    fields.setdefault("meta_tags", {"description": "SEO tools", "keywords": "seo, tools"})
+    return Blog.objects.create(author=author, **fields)
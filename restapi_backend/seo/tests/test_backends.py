@@ -0,0 +1,109 @@
+import sys
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from seo.backends import (
+    GenerationBackend, OnnxBackend, QuantizedTorchBackend, RemoteBackend, TorchBackend, load_backend, load_generator,
+)
+from seo.registry import registry
+
+
+class FakeInputs(dict):
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    """Tokenizer double returning array batches; remembers each batch it was asked to encode."""
+    pad_token_id = 0
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, prompts, **kwargs):
+        self.batches.append(list(prompts))
+        width = max(len(prompt.split()) for prompt in prompts)
+        mask = np.array([[1] * len(p.split()) + [0] * (width - len(p.split())) for p in prompts])
+        return FakeInputs(input_ids=mask * 5, attention_mask=mask)
+
+    def batch_decode(self, outputs, skip_special_tokens=True):
+        return [f"out-{int(row.sum())}" for row in outputs]
+
+
+class FakeModel:
+    def generate(self, input_ids, attention_mask, **kwargs):
+        return input_ids
+
+
+class FakeBackend(GenerationBackend):
+    name = "fake"
+
+    def load_model(self):
+        return FakeModel()
+
+
+class FakeTokenizerMixin:
+    def setUp(self):
+        super().setUp()
+        self.tokenizer = FakeTokenizer()
+        loader = registry._loaders.get("tokenizer")
+        registry.unload("tokenizer")
+        registry.register("tokenizer", lambda: self.tokenizer, prewarm=False)
+        self.addCleanup(registry.register, "tokenizer", loader, prewarm=False)
+        self.addCleanup(registry.unload, "tokenizer")
+
+
+class GenerationBackendTests(FakeTokenizerMixin, SimpleTestCase):
+    def test_unseeded_prompts_share_a_batch(self):
+        texts = FakeBackend().generate(["a b", "c d e"], do_sample=False)
+        self.assertEqual(texts, ["out-10", "out-15"])
+        self.assertEqual(self.tokenizer.batches, [["a b", "c d e"]])
+
+    def test_seeded_prompts_are_generated_one_at_a_time(self):
+        set_seed = mock.Mock()
+        with mock.patch.dict(sys.modules, {"transformers": SimpleNamespace(set_seed=set_seed)}):
+            texts = FakeBackend().generate(["a b", "c d e"], seed=7)
+        self.assertEqual(texts, ["out-10", "out-15"])
+        self.assertEqual(self.tokenizer.batches, [["a b"], ["c d e"]])
+        self.assertEqual(set_seed.call_args_list, [mock.call(7), mock.call(7)])
+
+
+# Model loading is replaced: torch loads the fake model, the optimized backends fail the way they do
+# without optimum or a quantized engine
+@mock.patch.object(TorchBackend, "load_model", lambda self: FakeModel())
+@mock.patch.object(OnnxBackend, "load_model", mock.Mock(side_effect=ImportError("No module named 'optimum'")))
+@mock.patch.object(QuantizedTorchBackend, "load_model", mock.Mock(side_effect=RuntimeError("NoQEngine")))
+class LoadBackendTests(FakeTokenizerMixin, SimpleTestCase):
+    @override_settings(SEO_GENERATION_BACKEND="torch")
+    def test_backend_from_settings(self):
+        self.assertIsInstance(load_backend(), TorchBackend)
+
+    def test_unavailable_backends_fall_back_to_torch(self):
+        for name in ("onnx", "torch-int8"):
+            with self.assertLogs("seo.backends", "WARNING") as logs:
+                backend = load_backend(name)
+            self.assertEqual(type(backend), TorchBackend)
+            self.assertIn(f"'{name}' is unavailable", logs.output[0])
+
+    def test_torch_failures_are_raised(self):
+        with mock.patch.object(TorchBackend, "load_model", side_effect=ImportError("No module named 'torch'")):
+            with self.assertRaises(ImportError):
+                load_backend("torch")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            load_backend("tensorrt")
+
+    @override_settings(SEO_INFERENCE_SERVER_URL="http://127.0.0.1:9/")
+    @mock.patch("seo.inference_client._client", None)
+    def test_inference_server_url_selects_the_remote_backend(self):
+        generator = load_generator()
+        self.assertIsInstance(generator, RemoteBackend)
+        self.assertEqual(generator.client.url, "http://127.0.0.1:9")
+
+    @override_settings(SEO_INFERENCE_SERVER_URL="", SEO_GENERATION_BACKEND="torch")
+    def test_without_a_server_the_backend_runs_in_process(self):
+        self.assertIsInstance(load_generator(), TorchBackend)
@@ -0,0 +1,43 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from seo.models import BulkRefreshRun
+
+URL = "/api/refresh-blog/bulk/"
+
+
+# Runs are left pending for `run_refresh_worker` instead of starting in the request's thread pool
+@override_settings(SEO_REFRESH_QUEUE="db")
+class CreateBulkRefreshTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+
+    def test_form_false_is_a_preview_run(self):
+        response = self.client.post(URL, {"topic": "seo", "apply": "false"})
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(BulkRefreshRun.objects.get(pk=response.data["id"]).apply)
+
+    def test_apply_defaults_to_false(self):
+        response = self.client.post(URL, {"topic": "seo"}, format="json")
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(response.data["apply"])
+
+    def test_apply_true(self):
+        response = self.client.post(URL, {"apply": True, "older_than_days": 30}, format="json")
+        self.assertEqual(response.status_code, 202)
+        run = BulkRefreshRun.objects.get(pk=response.data["id"])
+        self.assertTrue(run.apply)
+        self.assertEqual(run.filters, {"older_than_days": 30})
+
+    def test_rejects_invalid_bodies(self):
+        for body in ([{"topic": "seo"}], {"apply": "maybe"}, {"older_than_days": -1}, {"not_refreshed_days": "x"}):
+            response = self.client.post(URL, body, format="json")
+            self.assertEqual(response.status_code, 400, body)
+        self.assertFalse(BulkRefreshRun.objects.exists())
+
+    def test_requires_a_superuser(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("writer", password="pw"))
+        self.assertEqual(client.post(URL, {}, format="json").status_code, 403)
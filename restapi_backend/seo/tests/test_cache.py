@@ -0,0 +1,90 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+
+from seo.cache import TieredCache, make_key
+
+PERSISTENT = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "persistent": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "seo-cache-tests"},
+}
+
+
+class MakeKeyTests(SimpleTestCase):
+    def test_stable_and_order_independent_for_dicts(self):
+        self.assertEqual(make_key("ns", "a", {"x": 1, "y": 2}), make_key("ns", "a", {"y": 2, "x": 1}))
+        self.assertNotEqual(make_key("ns", "a"), make_key("other", "a"))
+        self.assertNotEqual(make_key("ns", "a", 1), make_key("ns", "a", "1"))
+
+
+class MemoryTierTests(SimpleTestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TieredCache("test", max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "b" is now the least recently used
+        cache.set("c", 3)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+        self.assertEqual(cache.stats()["entries"], 2)
+
+    def test_stats_count_hits_and_misses(self):
+        cache = TieredCache("test")
+        cache.get("a")
+        cache.set("a", 0)
+        self.assertEqual(cache.get("a", "default"), 0)  # falsy values are hits too
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (1, 1, 0.5))
+
+    def test_entries_expire_after_the_timeout(self):
+        cache = TieredCache("test", timeout=10)
+        with mock.patch("seo.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with mock.patch("seo.cache.time.monotonic", return_value=109.0):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch("seo.cache.time.monotonic", return_value=110.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_get_or_compute_computes_once(self):
+        cache = TieredCache("test")
+        compute = mock.Mock(return_value=[])
+        self.assertEqual(cache.get_or_compute("a", compute), [])
+        self.assertEqual(cache.get_or_compute("a", compute), [])
+        compute.assert_called_once_with()
+
+
+@override_settings(CACHES=PERSISTENT)
+class PersistentTierTests(SimpleTestCase):
+    def setUp(self):
+        caches["persistent"].clear()
+
+    def test_entries_survive_a_new_process_and_are_promoted(self):
+        TieredCache("test", persistent_alias="persistent").set("a", {"spans": [1, 2]})
+
+        # A fresh instance (another worker, or after a restart) starts with an empty memory tier
+        cache = TieredCache("test", max_entries=2, persistent_alias="persistent")
+        self.assertEqual(cache.get("a"), {"spans": [1, 2]})
+        self.assertEqual(cache.stats()["persistent_hits"], 1)
+        self.assertEqual(cache.get("a"), {"spans": [1, 2]})
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_evicted_entries_come_back_from_the_persistent_tier(self):
+        cache = TieredCache("test", max_entries=1, persistent_alias="persistent")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual((cache.stats()["persistent_hits"], cache.stats()["misses"]), (1, 0))
+
+    def test_clear_only_empties_the_memory_tier(self):
+        cache = TieredCache("test", persistent_alias="persistent")
+        cache.set("a", 1)
+        cache.clear()
+        self.assertEqual(cache.get("a"), 1)
+
+    def test_unknown_alias_falls_back_to_memory_only(self):
+        cache = TieredCache("test", persistent_alias="missing")
+        with self.assertLogs("seo.cache", "WARNING"):
+            cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.persistent_alias)
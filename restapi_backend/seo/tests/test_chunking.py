@@ -0,0 +1,71 @@
+from django.test import SimpleTestCase
+
+from seo.chunking import chunk_text, paragraph_spans, sentence_spans, separator
+
+
+def word_counts(texts):
+    return [len(text.split()) for text in texts]
+
+
+TEXT = (
+    "  First sentence here. Second one follows!\n\n"
+    "Another paragraph starts. It has \"Quoted\" text? Yes.\n   \n"
+    "Last paragraph."
+)
+
+
+class SpanTests(SimpleTestCase):
+    def test_paragraphs_are_trimmed(self):
+        self.assertEqual(
+            [TEXT[s:e] for s, e in paragraph_spans(TEXT)],
+            [
+                "First sentence here. Second one follows!",
+                "Another paragraph starts. It has \"Quoted\" text? Yes.",
+                "Last paragraph.",
+            ],
+        )
+
+    def test_sentences(self):
+        start, end = paragraph_spans(TEXT)[1]
+        self.assertEqual(
+            [TEXT[s:e] for s, e in sentence_spans(TEXT, start, end)],
+            ["Another paragraph starts.", "It has \"Quoted\" text?", "Yes."],
+        )
+
+    def test_abbreviations_before_lowercase_do_not_split(self):
+        text = "Use e.g. this one. Then stop."
+        self.assertEqual([text[s:e] for s, e in sentence_spans(text, 0, len(text))], ["Use e.g. this one.", "Then stop."])
+
+
+class ChunkTextTests(SimpleTestCase):
+    def test_chunks_respect_the_budget_and_point_into_the_text(self):
+        chunks = chunk_text(TEXT, 6, word_counts)
+        for chunk in chunks:
+            self.assertLessEqual(chunk.tokens, 6)
+            self.assertEqual(TEXT[chunk.start:chunk.end], chunk.text)
+        self.assertEqual(
+            " ".join(chunk.text for chunk in chunks).split(), TEXT.split(),
+        )
+
+    def test_sentences_are_packed_across_paragraphs(self):
+        chunks = chunk_text(TEXT, 100, word_counts)
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0].text, TEXT.strip())
+
+    def test_chunks_can_stay_inside_paragraphs(self):
+        chunks = chunk_text(TEXT, 100, word_counts, cross_paragraphs=False)
+        self.assertEqual([chunk.text for chunk in chunks], [TEXT[s:e] for s, e in paragraph_spans(TEXT)])
+
+    def test_long_sentences_split_on_words(self):
+        text = "one two three four five six seven."
+        chunks = chunk_text(text, 3, word_counts)
+        self.assertEqual([chunk.text for chunk in chunks], ["one two three", "four five six", "seven."])
+
+    def test_empty_text(self):
+        self.assertEqual(chunk_text("  \n\n ", 10, word_counts), [])
+
+    def test_separator_keeps_paragraph_breaks(self):
+        chunks = chunk_text(TEXT, 100, word_counts, cross_paragraphs=False)
+        self.assertEqual(separator(TEXT, chunks[0], chunks[1]), "\n\n")
+        sentences = chunk_text("One here. Two here.", 2, word_counts)
+        self.assertEqual(separator("One here. Two here.", sentences[0], sentences[1]), " ")
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from django.test import SimpleTestCase
+
+from seo.scanner import scan_outdated
+from seo.utils import assemble_content, plan_refresh, regenerated_segments
+
+from .helpers import StandInModelsMixin
+
+CONTENT = (
+    "Our numbers from 2019 were great.\n\n"
+    "This paragraph is evergreen advice about seo and AI-powered seo.\n\n\n"
+    "It has odd spacing  inside and stays.\n\n"
+    "Growth reached 45% last quarter."
+)
+
+
+def outdated(content):
+    return [(span.text, span.start, span.end) for span in scan_outdated(content)]
+
+
+class IncrementalPlanTests(StandInModelsMixin, SimpleTestCase):
+    def plan(self, content=CONTENT, incremental=True):
+        return plan_refresh(content, "Title", outdated(content), [], ["seo"], "seo", incremental=incremental)
+
+    def test_only_chunks_with_outdated_spans_are_regenerated(self):
+        plan = self.plan()
+        self.assertEqual(len(plan["chunks"]), 4)
+        self.assertEqual(plan["regenerate"], [0, 3])
+        self.assertEqual([plan["reasons"][i] for i in plan["regenerate"]], ["outdated", "outdated"])
+        self.assertEqual(len(plan["chunk_prompts"]), 2)
+
+    def test_missing_target_keywords_regenerate_the_first_chunk(self):
+        content = "Evergreen intro.\n\nGrowth reached 45% last quarter."
+        plan = plan_refresh(content, "Title", outdated(content), [], [], "gardening", incremental=True)
+        self.assertEqual(plan["reasons"], ["keywords", "outdated"])
+
+    def test_full_mode_regenerates_everything(self):
+        plan = self.plan(incremental=False)
+        self.assertEqual(plan["regenerate"], list(range(len(plan["chunks"]))))
+
+    def test_kept_chunks_and_the_whitespace_between_them_are_unchanged(self):
+        plan = self.plan()
+        content = assemble_content(plan, ["FIRST.", "LAST."])
+        self.assertEqual(
+            content,
+            "FIRST.\n\n"
+            "This paragraph is evergreen advice about seo and AI-powered seo.\n\n\n"
+            "It has odd spacing  inside and stays.\n\n"
+            "LAST.",
+        )
+
+    def test_years_are_updated_before_planning(self):
+        plan = self.plan()
+        self.assertIn(str(datetime.now().year), plan["chunks"][0].text)
+        self.assertIn(str(datetime.now().year), plan["chunk_prompts"][0])
+
+    def test_regenerated_segments_point_into_the_original_content(self):
+        plan = self.plan()
+        segments = regenerated_segments(plan)
+        self.assertEqual([segment["index"] for segment in segments], [0, 3])
+        first, last = segments
+        self.assertEqual(CONTENT[first["source_start"]:first["source_end"]], "Our numbers from 2019 were great.")
+        self.assertEqual(CONTENT[last["source_start"]:last["source_end"]], "Growth reached 45% last quarter.")
+
+    def test_nothing_to_regenerate_returns_the_content(self):
+        content = f"Evergreen advice: the best seo {datetime.now().year} tools are AI-powered seo tools."
+        plan = self.plan(content)
+        self.assertEqual(plan["regenerate"], [])
+        self.assertEqual(assemble_content(plan, []), content)
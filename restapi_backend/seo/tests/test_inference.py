@@ -0,0 +1,138 @@
+import socket
+import threading
+import time
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from seo.backends import RemoteBackend
+from seo.benchmarks import StandInBackend
+from seo.inference_client import InferenceClient, InferenceUnavailable
+from seo.inference_server import MicroBatcher, make_server
+
+
+class FakeBackend:
+    """Upper-cases each prompt and records the prompts and parameters of every call."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, prompts, **params):
+        self.calls.append((list(prompts), params))
+        if self.fail:
+            raise RuntimeError("model crashed")
+        return [prompt.upper() for prompt in prompts]
+
+
+# A local port nothing listens on
+def refused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class MicroBatcherTests(SimpleTestCase):
+    def submit_concurrently(self, batcher, requests_):
+        results = [None] * len(requests_)
+
+        def call(i, prompts, params):
+            try:
+                results[i] = batcher.submit(prompts, **params)
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=call, args=(i, *request)) for i, request in enumerate(requests_)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results
+
+    def test_requests_within_the_window_share_one_call(self):
+        backend = FakeBackend()
+        batcher = MicroBatcher(backend, max_batch_size=16, max_wait=0.5)
+        results = self.submit_concurrently(batcher, [(["a", "b"], {}), (["c"], {}), (["d", "e", "f"], {})])
+        self.assertEqual(len(backend.calls), 1)
+        self.assertEqual(sorted(backend.calls[0][0]), ["a", "b", "c", "d", "e", "f"])
+        # Each caller gets exactly its own prompts back, in order
+        self.assertEqual(results, [["A", "B"], ["C"], ["D", "E", "F"]])
+        self.assertEqual(batcher.stats()["requests"], 3)
+
+    def test_a_full_batch_is_flushed_without_waiting_for_the_window(self):
+        backend = FakeBackend()
+        batcher = MicroBatcher(backend, max_batch_size=2, max_wait=5)
+        started = time.monotonic()
+        self.assertEqual(batcher.submit(["a", "b"]), ["A", "B"])
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_large_requests_are_split_into_max_size_calls(self):
+        backend = FakeBackend()
+        batcher = MicroBatcher(backend, max_batch_size=4, max_wait=0.01)
+        prompts = [f"p{i}" for i in range(10)]
+        self.assertEqual(batcher.submit(prompts), [prompt.upper() for prompt in prompts])
+        self.assertEqual([len(call[0]) for call in backend.calls], [4, 4, 2])
+
+    def test_different_decoding_parameters_are_not_mixed(self):
+        backend = FakeBackend()
+        batcher = MicroBatcher(backend, max_batch_size=16, max_wait=0.3)
+        results = self.submit_concurrently(batcher, [(["a"], {"do_sample": False}), (["b"], {"seed": 1})])
+        self.assertEqual(results, [["A"], ["B"]])
+        self.assertEqual(
+            sorted((call[0], sorted(call[1].items())) for call in backend.calls),
+            [(["a"], [("do_sample", False)]), (["b"], [("seed", 1)])],
+        )
+
+    def test_a_failed_call_fails_every_request_in_it(self):
+        batcher = MicroBatcher(FakeBackend(fail=True), max_batch_size=16, max_wait=0.3)
+        with self.assertLogs("seo.inference_server", "ERROR"):
+            results = self.submit_concurrently(batcher, [(["a"], {}), (["b"], {})])
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+
+class InferenceServerTests(SimpleTestCase):
+    def setUp(self):
+        self.backend = FakeBackend()
+        self.server = make_server("127.0.0.1", 0, MicroBatcher(self.backend, max_wait=0.01), lambda contents: [])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def test_client_round_trip(self):
+        client = InferenceClient(self.url, timeout=5)
+        self.assertEqual(client.generate(["a", "b"], max_length=20, do_sample=False), ["A", "B"])
+        self.assertEqual(self.backend.calls, [(["a", "b"], {"max_length": 20, "do_sample": False})])
+
+    def test_bad_requests(self):
+        self.assertEqual(requests.post(self.url + "/generate", json={}, timeout=5).status_code, 400)
+        self.assertEqual(requests.get(self.url + "/health", timeout=5).json()["status"], "ok")
+
+
+class InferenceClientFallbackTests(SimpleTestCase):
+    def setUp(self):
+        self.client = InferenceClient(f"http://127.0.0.1:{refused_port()}", timeout=2, retry_after=30)
+
+    def test_refused_connection_marks_the_server_down(self):
+        with self.assertLogs("seo.inference_client", "WARNING"), self.assertRaises(InferenceUnavailable):
+            self.client.generate(["a"])
+        self.assertFalse(self.client.available())
+        # Skipped without another connection attempt until retry_after has passed
+        with mock.patch.object(self.client._session, "post") as post, self.assertRaises(InferenceUnavailable):
+            self.client.generate(["a"])
+        post.assert_not_called()
+
+    def test_remote_backend_falls_back_to_a_local_backend(self):
+        local = StandInBackend()
+        with mock.patch("seo.backends.load_backend", return_value=local) as load, \
+                self.assertLogs("seo.inference_client", "WARNING"):
+            backend = RemoteBackend(self.client)
+            self.assertEqual(backend.generate(["rewrite: hello world"], max_length=10), ["hello world"])
+            self.assertEqual(backend.generate(["rewrite: again"]), ["again"])
+        load.assert_called_once_with()
+
+    @override_settings(SEO_INFERENCE_FALLBACK=False)
+    def test_without_fallback_the_error_is_raised(self):
+        with self.assertLogs("seo.inference_client", "WARNING"), self.assertRaises(InferenceUnavailable):
+            RemoteBackend(self.client).generate(["a"])
@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from seo.jobs import claim_job, enqueue_refresh, pending_job_ids, run_job
+from seo.models import RefreshJob
+
+from .helpers import make_blog
+
+
+# Jobs stay pending until run_job is called by the test; run_job's connection cleanup is disabled
+# so it doesn't close the test transaction's connection
+@override_settings(SEO_REFRESH_QUEUE="db")
+@mock.patch("seo.jobs.close_old_connections", mock.Mock())
+class RefreshJobLifecycleTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("writer", password="pw")
+        self.blog = make_blog(self.user)
+
+    def test_a_job_starts_pending(self):
+        job = enqueue_refresh(self.blog, RefreshJob.ACTION_PREVIEW, self.user)
+        self.assertEqual(job.status, RefreshJob.STATUS_PENDING)
+        self.assertEqual(job.requested_by, self.user)
+        self.assertEqual(pending_job_ids(), [job.pk])
+
+    def test_pending_running_succeeded(self):
+        job = enqueue_refresh(self.blog, RefreshJob.ACTION_PREVIEW)
+        seen = {}
+
+        def preview(blog):
+            running = RefreshJob.objects.get(pk=job.pk)
+            seen.update(status=running.status, started=running.started_at is not None)
+            return {"title": "New title", "version": "abc"}
+
+        with mock.patch("seo.jobs.preview_refresh", side_effect=preview):
+            self.assertTrue(run_job(job.pk))
+        self.assertEqual(seen, {"status": RefreshJob.STATUS_RUNNING, "started": True})
+        job.refresh_from_db()
+        self.assertEqual(job.status, RefreshJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.result, {"title": "New title", "version": "abc"})
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(pending_job_ids(), [])
+
+    def test_confirm_jobs_record_whether_the_preview_was_reused(self):
+        job = enqueue_refresh(self.blog, RefreshJob.ACTION_CONFIRM)
+        with mock.patch("seo.jobs.confirm_refresh", return_value=({"title": "New title"}, True)):
+            run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.result, {"title": "New title", "reused_preview": True})
+
+    def test_a_failure_is_recorded(self):
+        job = enqueue_refresh(self.blog, RefreshJob.ACTION_PREVIEW)
+        with mock.patch("seo.jobs.preview_refresh", side_effect=RuntimeError("model crashed")), \
+                self.assertLogs("seo.jobs", "ERROR"):
+            self.assertTrue(run_job(job.pk))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error, job.result), (RefreshJob.STATUS_FAILED, "model crashed", None))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_a_job_is_only_run_once(self):
+        job = enqueue_refresh(self.blog, RefreshJob.ACTION_PREVIEW)
+        self.assertTrue(claim_job(job.pk))
+        self.assertFalse(claim_job(job.pk))
+        with mock.patch("seo.jobs.preview_refresh") as preview:
+            self.assertFalse(run_job(job.pk))
+        preview.assert_not_called()
+
+    def test_thread_mode_hands_the_job_to_the_pool(self):
+        executor = mock.Mock()
+        with override_settings(SEO_REFRESH_QUEUE="thread"), mock.patch("seo.jobs.get_executor", return_value=executor):
+            job = enqueue_refresh(self.blog, RefreshJob.ACTION_PREVIEW)
+        executor.submit.assert_called_once_with(run_job, job.pk)
+
+    def test_api(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(f"/api/refresh-blog/{self.blog.pk}/jobs/", {"action": "confirm"}, format="json")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], RefreshJob.STATUS_PENDING)
+        self.assertEqual(client.get(f"/api/refresh-jobs/{response.data['job_id']}/").data["action"], "confirm")
+        response = client.post(f"/api/refresh-blog/{self.blog.pk}/jobs/", {"action": "publish"}, format="json")
+        self.assertEqual(response.status_code, 400)
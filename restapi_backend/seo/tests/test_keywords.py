@@ -0,0 +1,95 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from blog.models import Blog
+from seo.keywords import missed_keywords, phrase_counts, top_keywords
+from seo.models import BlogKeyword, KeywordPhrase
+
+from .helpers import make_blog
+
+
+class PhraseCountsTests(SimpleTestCase):
+    def test_runs_between_stopwords_and_punctuation(self):
+        counts = phrase_counts("Drip campaigns convert. The drip campaigns of 2019!")
+        self.assertEqual(counts["drip campaigns"], 2)
+        self.assertEqual(counts["drip campaigns convert"], 1)
+        self.assertNotIn("convert drip", counts)
+        self.assertNotIn("2019", counts)
+        self.assertNotIn("the", counts)
+
+
+# Indexing normally runs on a background thread after commit; here it runs inline when the
+# captured on_commit callbacks are executed
+@override_settings(SEO_KEYWORD_INDEX_ASYNC=False)
+class KeywordIndexTests(TestCase):
+    def save(self, blog=None, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            if blog is None:
+                return make_blog(**fields)
+            for name, value in fields.items():
+                setattr(blog, name, value)
+            blog.save()
+            return blog
+
+    def df(self, phrase):
+        return KeywordPhrase.objects.filter(phrase=phrase).values_list("document_frequency", flat=True).first()
+
+    def test_indexing_waits_for_the_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            blog = make_blog(title="Drip campaigns", content="Drip campaigns convert.")
+        self.assertFalse(BlogKeyword.objects.filter(blog=blog).exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.df("drip campaigns"), 1)
+
+    def test_document_frequencies_follow_edits_and_deletes(self):
+        first = self.save(title="Drip campaigns", content="Drip campaigns convert.")
+        second = self.save(title="Newsletters", content="Drip campaigns and newsletters.")
+        self.assertEqual(self.df("drip campaigns"), 2)
+        self.assertEqual(self.df("newsletters"), 1)
+
+        self.save(second, content="Only newsletters now.")
+        self.assertEqual(self.df("drip campaigns"), 1)
+        self.assertEqual(BlogKeyword.objects.get(blog=second, phrase__phrase="newsletters").occurrences, 2)
+
+        first.delete()
+        self.assertIsNone(self.df("drip campaigns"))
+        self.assertIsNone(self.df("convert"))
+        self.assertEqual(self.df("newsletters"), 1)
+        self.assertFalse(BlogKeyword.objects.filter(blog_id=first.pk).exists())
+
+    def test_unused_phrases_are_pruned(self):
+        blog = self.save(title="Drip campaigns", content="Drip campaigns convert.")
+        self.save(blog, title="Podcasts", content="Podcasts grow.")
+        self.assertEqual(
+            set(KeywordPhrase.objects.values_list("phrase", flat=True)), {"podcasts", "podcasts grow", "grow"}
+        )
+        self.assertFalse(KeywordPhrase.objects.filter(document_frequency__lte=0).exists())
+
+    def test_saves_of_other_fields_are_not_indexed(self):
+        blog = self.save(title="Drip campaigns", content="Drip campaigns convert.")
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            blog.preview_data = {"version": "x"}
+            blog.save(update_fields=["preview_data"])
+        self.assertEqual(callbacks, [])
+
+    def test_top_keywords_rank_what_a_post_is_about(self):
+        for i in range(4):
+            self.save(title=f"Post {i}", content=f"Marketing tips number{i}.")
+        keywords = top_keywords("Marketing tips. Drip campaigns convert. Drip campaigns scale.", limit=3)
+        self.assertEqual(keywords[0], "drip campaigns")
+        self.assertNotIn("marketing tips", keywords)
+
+    def test_missed_keywords_come_from_sibling_posts(self):
+        for i in range(3):
+            self.save(title=f"Email {i}", content="Drip campaigns and subject lines.", topic="email")
+        self.save(title="Other", content="Podcasts everywhere.", topic="audio")
+        self.save(title="Podcast", content="Podcasts everywhere.", topic="audio")
+        blog = self.save(title="Email basics", content="Subject lines matter.", topic="email")
+
+        missed = missed_keywords(blog, limit=5, min_posts=2)
+        phrases = [entry["phrase"] for entry in missed]
+        self.assertEqual(phrases[0], "drip campaigns")
+        self.assertEqual(missed[0]["posts"], 3)
+        self.assertNotIn("subject lines", phrases)
+        self.assertNotIn("podcasts", phrases)
+        self.assertEqual(missed_keywords(Blog(pk=blog.pk, topic=None)), [])
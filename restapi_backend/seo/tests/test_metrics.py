@@ -0,0 +1,43 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+URL = "/api/seo/metrics/"
+
+
+class MetricsAccessTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.reader = User.objects.create_user("reader", password="pw")
+
+    def jwt_client(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+        return client
+
+    @override_settings(SEO_METRICS_TOKEN="")
+    def test_without_token_only_superusers_can_read(self):
+        self.assertEqual(APIClient().get(URL).status_code, 401)
+        self.assertEqual(self.jwt_client(self.reader).get(URL).status_code, 403)
+        response = self.jwt_client(self.admin).get(URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+
+    @override_settings(SEO_METRICS_TOKEN="scrape-me")
+    def test_token_is_accepted(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer scrape-me")
+        self.assertEqual(client.get(URL).status_code, 200)
+
+    @override_settings(SEO_METRICS_TOKEN="scrape-me")
+    def test_wrong_token_is_rejected(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer guess")
+        self.assertEqual(client.get(URL).status_code, 401)
+        self.assertEqual(APIClient().get(URL).status_code, 401)
+        self.assertEqual(self.jwt_client(self.reader).get(URL).status_code, 403)
+
+    @override_settings(SEO_METRICS_TOKEN="scrape-me")
+    def test_superusers_can_read_with_a_token_configured(self):
+        self.assertEqual(self.jwt_client(self.admin).get(URL).status_code, 200)
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from blog.models import Blog
+from seo.models import BlogRevision
+from seo.pipeline import PreviewConflict, apply_refresh, confirm_refresh, current_preview, generate_refresh
+
+from .helpers import StandInModelsMixin, make_blog
+
+
+class PreviewConfirmTests(StandInModelsMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("writer", password="pw")
+        self.blog = make_blog(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def preview(self, **params):
+        response = self.client.get(f"/api/refresh-blog/{self.blog.pk}/preview/", params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def confirm(self, version):
+        return self.client.post(
+            f"/api/refresh-blog/{self.blog.pk}/confirm/", {"preview_version": version}, format="json"
+        )
+
+    def test_preview_is_stored_without_changing_the_post(self):
+        data = self.preview()
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.title, "Best SEO tools for 2019")
+        self.assertEqual(self.blog.preview_data["version"], data["preview_version"])
+        self.assertEqual(self.blog.preview_data["content"], data["preview_content"])
+        self.assertIn(str(datetime.now().year), data["preview_content"])
+
+    def test_confirm_applies_the_stored_preview_without_regenerating(self):
+        data = self.preview()
+        with self.capture_prompts() as prompts:
+            response = self.confirm(data["preview_version"])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["reused_preview"])
+        self.assertEqual(prompts, [])
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.content, data["preview_content"])
+        self.assertIsNone(self.blog.preview_data)
+
+    def test_confirm_uses_the_staleness_score_stored_with_the_preview(self):
+        data = self.preview()
+        self.blog.refresh_from_db()
+        score = self.blog.preview_data["staleness_score"]
+        self.assertIsNotNone(score)
+        with mock.patch("seo.pipeline.analyze_content") as analyze, mock.patch("seo.pipeline.analyze_many") as many:
+            self.assertEqual(self.confirm(data["preview_version"]).status_code, 200)
+        analyze.assert_not_called()
+        many.assert_not_called()
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.staleness_score, score)
+
+    def test_confirming_an_older_preview_version_is_a_conflict(self):
+        first = self.preview()
+        self.preview()
+        response = self.confirm(first["preview_version"])
+        self.assertEqual(response.status_code, 409)
+        self.blog.refresh_from_db()
+        self.assertEqual(self.blog.title, "Best SEO tools for 2019")
+
+    @override_settings(SEO_GENERATION_MODE="greedy")
+    def test_reopening_a_greedy_preview_is_served_from_the_generation_cache(self):
+        first = self.preview()
+        with self.capture_prompts() as prompts:
+            second = self.preview()
+        self.assertEqual(prompts, [])
+        self.assertEqual(second["preview_content"], first["preview_content"])
+
+    def test_editing_the_post_invalidates_its_preview(self):
+        data = self.preview()
+        self.blog.refresh_from_db()
+        self.blog.content = "Rewritten by hand."
+        self.blog.save()
+        self.assertIsNone(current_preview(self.blog))
+        self.assertEqual(self.confirm(data["preview_version"]).status_code, 409)
+
+    def test_confirm_without_a_preview_generates_one(self):
+        with self.capture_prompts() as prompts:
+            response = self.confirm(None)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["reused_preview"])
+        self.assertTrue(prompts)
+
+    def test_apply_refuses_to_overwrite_an_edit_made_during_generation(self):
+        stale = Blog.objects.get(pk=self.blog.pk)
+        refresh = generate_refresh(stale)
+        Blog.objects.filter(pk=self.blog.pk).update(
+            content="Edited meanwhile.", updated_at=timezone.now() + timedelta(seconds=1)
+        )
+        with self.assertRaises(PreviewConflict):
+            apply_refresh(stale, refresh)
+        self.assertEqual(Blog.objects.get(pk=self.blog.pk).content, "Edited meanwhile.")
+        self.assertFalse(BlogRevision.objects.exists())
+
+    def test_confirm_refresh_records_revisions(self):
+        refresh, reused = confirm_refresh(self.blog)
+        self.assertFalse(reused)
+        self.assertEqual(
+            list(BlogRevision.objects.values_list("number", "source")),
+            [(1, BlogRevision.SOURCE_ORIGINAL), (2, BlogRevision.SOURCE_REFRESH)],
+        )
+
+    def test_diff_preview_returns_parts_instead_of_bodies(self):
+        data = self.preview(diff=1)
+        self.assertNotIn("preview_content", data)
+        self.assertEqual(set(data["fields"]), {"title", "content", "meta_description", "meta_keywords"})
+        old = "".join(part["value"] for part in data["fields"]["content"] if not part.get("added"))
+        self.assertEqual(old, self.blog.content)
+        new = "".join(part["value"] for part in data["fields"]["content"] if not part.get("removed"))
+        self.blog.refresh_from_db()
+        self.assertEqual(new, self.blog.preview_data["content"])
@@ -0,0 +1,128 @@
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from seo.models import BlogRevision
+from seo.revisions import (
+    RevisionError, apply_delta, blog_state, diff_parts, make_delta, rebuild, record_revision,
+    restore_revision, state_checksum, track_refresh,
+)
+
+from .helpers import make_blog
+
+
+def version(n):
+    return {
+        "title": f"Title {n}",
+        "content": "Intro stays.\n" + "".join(f"Line {i} of version {n}\n" for i in range(n % 3 + 1)) + "Outro stays.\n",
+        "meta_tags": {"description": f"Description {n}"},
+    }
+
+
+class DeltaTests(SimpleTestCase):
+    def test_round_trip(self):
+        cases = [
+            ("", ""), ("", "new\n"), ("old\n", ""), ("a\nb\nc\n", "a\nB\nc\nd"),
+            ("no newline", "no newline\n"), ("x\n" * 50, "x\n" * 20 + "y\n" + "x\n" * 30),
+        ]
+        for old, new in cases:
+            self.assertEqual(apply_delta(old, make_delta(old, new)), new, (old, new))
+
+    def test_unchanged_lines_are_stored_as_ranges(self):
+        self.assertEqual(make_delta("a\nb\nc\n", "a\nX\nc\n"), [[0, 1], "X\n", [2, 3]])
+
+    def test_diff_parts_have_the_diff_lines_shape(self):
+        self.assertEqual(
+            diff_parts("a\nb\n", "a\nc\nd\n"),
+            [
+                {"value": "a\n", "count": 1},
+                {"value": "b\n", "count": 1, "removed": True},
+                {"value": "c\nd\n", "count": 2, "added": True},
+            ],
+        )
+        self.assertEqual(diff_parts("same", "same"), [{"value": "same", "count": 1}])
+
+
+@override_settings(SEO_REVISION_SNAPSHOT_EVERY=3)
+class RevisionHistoryTests(TestCase):
+    def setUp(self):
+        self.blog = make_blog()
+
+    def test_every_version_rebuilds_across_snapshots(self):
+        for n in range(1, 9):
+            record_revision(self.blog.pk, version(n), BlogRevision.SOURCE_REFRESH)
+        revisions = list(BlogRevision.objects.filter(blog=self.blog).values_list("number", "kind"))
+        self.assertEqual([kind for _, kind in revisions], ["snapshot", "delta", "delta"] * 2 + ["snapshot", "delta"])
+        for number, _ in revisions:
+            self.assertEqual(rebuild(self.blog.pk, number), version(number))
+
+    def test_unchanged_version_is_not_stored_again(self):
+        first = record_revision(self.blog.pk, version(1), BlogRevision.SOURCE_REFRESH)
+        self.assertEqual(record_revision(self.blog.pk, version(1), BlogRevision.SOURCE_EDIT), first)
+        self.assertEqual(BlogRevision.objects.count(), 1)
+
+    def test_refresh_records_the_original_and_hand_edits(self):
+        track_refresh(self.blog.pk, version(1), version(2))
+        track_refresh(self.blog.pk, version(3), version(4))
+        self.assertEqual(
+            list(BlogRevision.objects.values_list("number", "source")),
+            [(1, "original"), (2, "refresh"), (3, "edit"), (4, "refresh")],
+        )
+        self.assertEqual(rebuild(self.blog.pk, 3), version(3))
+
+    def test_missing_or_corrupt_revisions_raise(self):
+        record_revision(self.blog.pk, version(1), BlogRevision.SOURCE_REFRESH)
+        record_revision(self.blog.pk, version(2), BlogRevision.SOURCE_REFRESH)
+        with self.assertRaises(RevisionError):
+            rebuild(self.blog.pk, 5)
+        BlogRevision.objects.filter(number=2).update(checksum=state_checksum(version(9)))
+        with self.assertRaises(RevisionError):
+            rebuild(self.blog.pk, 2)
+
+    def test_restore_puts_back_an_old_version_as_a_new_revision(self):
+        original = blog_state(self.blog)
+        track_refresh(self.blog.pk, original, version(1))
+        for field, value in version(1).items():
+            setattr(self.blog, field, value)
+        self.blog.save()
+        restore_revision(self.blog, 1)
+        self.blog.refresh_from_db()
+        self.assertEqual(blog_state(self.blog), original)
+        self.assertEqual(
+            list(BlogRevision.objects.values_list("number", "source")),
+            [(1, "original"), (2, "refresh"), (3, "restore")],
+        )
+        self.assertEqual(rebuild(self.blog.pk, 3), original)
+
+
+class RevisionViewTests(TestCase):
+    def setUp(self):
+        self.blog = make_blog()
+        self.original = blog_state(self.blog)
+        track_refresh(self.blog.pk, self.original, version(1))
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+
+    def test_list_and_detail(self):
+        response = self.client.get(f"/api/refresh-blog/{self.blog.pk}/revisions/")
+        self.assertEqual([revision["number"] for revision in response.data], [2, 1])
+        response = self.client.get(f"/api/refresh-blog/{self.blog.pk}/revisions/1/")
+        self.assertEqual(response.data["content"], self.original["content"])
+        self.assertEqual(self.client.get(f"/api/refresh-blog/{self.blog.pk}/revisions/7/").status_code, 404)
+
+    def test_diff_between_revisions(self):
+        response = self.client.get(f"/api/refresh-blog/{self.blog.pk}/diff/", {"from": 1, "to": 2})
+        self.assertEqual(response.status_code, 200)
+        new = "".join(part["value"] for part in response.data["fields"]["content"] if not part.get("removed"))
+        self.assertEqual(new, version(1)["content"])
+        self.assertEqual(
+            self.client.get(f"/api/refresh-blog/{self.blog.pk}/diff/", {"from": "bogus"}).status_code, 404
+        )
+
+    def test_restore_requires_a_superuser(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("reader", password="pw"))
+        self.assertEqual(client.post(f"/api/refresh-blog/{self.blog.pk}/revisions/1/restore/").status_code, 403)
+        response = self.client.post(f"/api/refresh-blog/{self.blog.pk}/revisions/1/restore/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["content"], self.original["content"])
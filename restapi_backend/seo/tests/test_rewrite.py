@@ -0,0 +1,89 @@
+from django.test import SimpleTestCase
+
+from seo.rewrite import Edit, OffsetMap, OverlappingEditError, apply_edits, year_edits
+from seo.scanner import scan_outdated
+
+
+def rewrite_years(text, current_year=2026):
+    outdated = [(span.text, span.start, span.end) for span in scan_outdated(text, current_year)]
+    return apply_edits(text, year_edits(outdated, current_year))[0]
+
+
+class ApplyEditsTests(SimpleTestCase):
+    def test_applies_edits_in_any_order(self):
+        text = "one two three"
+        new, _ = apply_edits(text, [Edit(8, 13, "3"), Edit(0, 3, "1")])
+        self.assertEqual(new, "1 two 3")
+
+    def test_no_edits_returns_text_unchanged(self):
+        new, offsets = apply_edits("unchanged", [])
+        self.assertEqual(new, "unchanged")
+        self.assertEqual(offsets.to_target(4), 4)
+
+    def test_insertion_and_deletion(self):
+        new, _ = apply_edits("abcdef", [Edit(2, 2, "XY"), Edit(4, 6, "")])
+        self.assertEqual(new, "abXYcd")
+
+    def test_adjacent_edits_are_allowed(self):
+        new, _ = apply_edits("abcd", [Edit(0, 2, "x"), Edit(2, 4, "y")])
+        self.assertEqual(new, "xy")
+
+    def test_overlapping_edits_are_rejected(self):
+        with self.assertRaises(OverlappingEditError):
+            apply_edits("abcdef", [Edit(0, 3, "x"), Edit(2, 5, "y")])
+
+    def test_edit_outside_text_is_rejected(self):
+        with self.assertRaises(ValueError):
+            apply_edits("abc", [Edit(2, 5, "x")])
+
+
+class OffsetMapTests(SimpleTestCase):
+    def setUp(self):
+        # "In 2019 we grew" -> "In 2026!! we grew": the year is replaced by a longer string
+        self.text = "In 2019 we grew"
+        self.new, self.offsets = apply_edits(self.text, [Edit(3, 7, "2026!!")])
+
+    def test_offsets_before_an_edit_are_unchanged(self):
+        self.assertEqual(self.offsets.to_target(1), 1)
+        self.assertEqual(self.offsets.to_source(1), 1)
+
+    def test_offsets_after_an_edit_are_shifted(self):
+        source = self.text.index("we")
+        target = self.offsets.to_target(source)
+        self.assertEqual(self.new[target:target + 2], "we")
+        self.assertEqual(self.offsets.to_source(target), source)
+
+    def test_offsets_inside_an_edit_map_to_its_start(self):
+        self.assertEqual(self.offsets.to_target(5), 3)
+        self.assertEqual(self.offsets.to_source(6), 3)
+
+    def test_shifts_accumulate_over_several_edits(self):
+        new, offsets = apply_edits("a-b-c", [Edit(0, 1, "AAA"), Edit(2, 3, "")])
+        self.assertEqual(new, "AAA--c")
+        self.assertEqual(new[offsets.to_target(4)], "c")
+
+
+class YearEditsTests(SimpleTestCase):
+    def test_rewrites_standalone_years(self):
+        self.assertEqual(rewrite_years("In 2019, sales grew."), "In 2026, sales grew.")
+
+    def test_leaves_numbers_that_are_not_years(self):
+        self.assertEqual(rewrite_years("In 2019 we had 1500 users."), "In 2026 we had 1500 users.")
+        self.assertEqual(rewrite_years("We saw 10000 visitors."), "We saw 10000 visitors.")
+        self.assertEqual(rewrite_years("See page 1024."), "See page 1024.")
+        self.assertEqual(rewrite_years("We had 2000 users."), "We had 2000 users.")
+
+    def test_leaves_year_ranges(self):
+        self.assertEqual(rewrite_years("The 2019-2020 season"), "The 2019-2020 season")
+        self.assertEqual(rewrite_years("The 2019 – 2020 season"), "The 2019 – 2020 season")
+
+    def test_rewrites_the_year_of_as_of_dates(self):
+        self.assertEqual(rewrite_years("As of March 2021, prices rose."), "As of March 2026, prices rose.")
+        self.assertEqual(rewrite_years("as of 2020 it was free"), "as of 2026 it was free")
+
+    def test_leaves_current_and_future_years(self):
+        self.assertEqual(rewrite_years("Plans for 2026 and 2030."), "Plans for 2026 and 2030.")
+
+    def test_only_spans_shaped_like_years_produce_edits(self):
+        edits = year_edits([("1500 users", 0, 10), ("2019", 20, 24), ("$2019", 30, 35)], 2026)
+        self.assertEqual(edits, [Edit(20, 24, "2026")])
@@ -0,0 +1,50 @@
+from django.test import SimpleTestCase
+
+from seo.scanner import context_window, scan_outdated
+
+
+def kinds(text, current_year=2026):
+    return [(span.text, span.kind) for span in scan_outdated(text, current_year)]
+
+
+class ScanOutdatedTests(SimpleTestCase):
+    def test_past_years_only(self):
+        self.assertEqual(kinds("Back in 2019 we planned for 2026 and 2030."), [("2019", "year")])
+
+    def test_stats_money_and_quantities(self):
+        self.assertEqual(
+            kinds("Revenue hit $1.5 million, up 45% on 2,000 users and EUR 300."),
+            [("$1.5 million", "currency"), ("45%", "percent"), ("2,000 users", "quantity"), ("EUR 300", "currency")],
+        )
+
+    def test_as_of_dates(self):
+        self.assertEqual(kinds("As of March 5, 2021, it was free."), [("As of March 5, 2021", "as_of")])
+        self.assertEqual(kinds("as of 2027 it is free"), [])
+
+    def test_bare_numbers_are_ambiguous(self):
+        spans = scan_outdated("We shipped 42 features.", 2026)
+        self.assertEqual([(span.text, span.kind, span.ambiguous) for span in spans], [("42", "number", True)])
+
+    def test_offsets_point_into_the_text(self):
+        text = "Prices rose 12% in 2020 to $30."
+        for span in scan_outdated(text, 2026):
+            self.assertEqual(text[span.start:span.end], span.text)
+
+    def test_ranges_versions_and_identifiers_are_not_spans(self):
+        self.assertEqual(kinds("The 2019-2020 season, pages 10 - 20, v2.0.1 and model X200."), [])
+
+    def test_years_inside_longer_numbers_are_not_years(self):
+        self.assertEqual(kinds("Call 12019 or 2019.5 today"), [("12019", "number"), ("2019.5", "number")])
+
+
+class ContextWindowTests(SimpleTestCase):
+    def test_snaps_to_whitespace(self):
+        text = "alpha beta gamma 2019 delta epsilon zeta"
+        span = scan_outdated(text, 2026)[0]
+        start, window = context_window(text, span, radius=8)
+        self.assertEqual(window, "gamma 2019 delta")
+        self.assertEqual(text[start:start + len(window)], window)
+
+    def test_whole_text_when_short(self):
+        text = "In 2019."
+        self.assertEqual(context_window(text, scan_outdated(text, 2026)[0]), (0, text))
@@ -0,0 +1,156 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from blog.models import Blog
+from seo import scheduler
+from seo.models import RefreshPolicy
+from seo.scheduler import RateLimiter, Scheduler, backoff_delay, claim_due, run_policies, schedule_blogs
+
+from .helpers import StandInModelsMixin, make_blog
+
+
+# Policies are created explicitly here, not by the post_save hook
+@override_settings(SEO_SCHEDULE_NEW_POSTS=False)
+class ClaimDueTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.due = [
+            RefreshPolicy.objects.create(blog=make_blog(title=f"Due {i}"), next_run_at=now - timedelta(hours=3 - i))
+            for i in range(3)
+        ]
+        RefreshPolicy.objects.create(blog=make_blog(title="Later"), next_run_at=now + timedelta(days=1))
+        RefreshPolicy.objects.create(blog=make_blog(title="Off"), next_run_at=now, enabled=False)
+
+    def test_claims_the_most_overdue_first(self):
+        self.assertEqual(claim_due(2), [self.due[0].pk, self.due[1].pk])
+
+    def test_a_leased_policy_is_not_claimed_again(self):
+        first = claim_due(10)
+        self.assertEqual(first, [policy.pk for policy in self.due])
+        self.assertEqual(claim_due(10), [])
+        leased = RefreshPolicy.objects.filter(leased_until__isnull=False)
+        self.assertEqual(sorted(leased.values_list("pk", flat=True)), sorted(first))
+
+    def test_an_expired_lease_makes_the_policy_due_again(self):
+        claim_due(10, lease=timedelta(minutes=30))
+        RefreshPolicy.objects.filter(pk=self.due[1].pk).update(leased_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(claim_due(10), [self.due[1].pk])
+
+    def test_schedule_blogs_only_adds_missing_policies(self):
+        make_blog(title="New")
+        self.assertEqual(schedule_blogs(Blog.objects.all()), 1)
+        self.assertEqual(schedule_blogs(Blog.objects.all()), 0)
+
+
+@override_settings(SEO_SCHEDULER={"BACKOFF_BASE": 300, "BACKOFF_MAX": 3600})
+class BackoffTests(SimpleTestCase):
+    def test_delay_doubles_up_to_the_maximum(self):
+        with mock.patch("seo.scheduler.random.uniform", return_value=1.0):
+            delays = [backoff_delay(failures).total_seconds() for failures in range(1, 7)]
+        self.assertEqual(delays, [300, 600, 1200, 2400, 3600, 3600])
+
+    def test_jitter_only_shortens_the_delay(self):
+        for _ in range(50):
+            self.assertTrue(270 <= backoff_delay(1).total_seconds() <= 300)
+
+
+class RateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("seo.scheduler.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_tokens_refill_at_the_configured_rate(self):
+        limiter = RateLimiter(per_minute=60, burst=2)
+        self.assertEqual(limiter.available(), 2)
+        limiter.take(2)
+        self.assertEqual(limiter.available(), 0)
+        self.assertEqual(limiter.wait_time(), 1.0)
+        self.now += 0.5
+        self.assertEqual(limiter.available(), 0)
+        self.assertAlmostEqual(limiter.wait_time(), 0.5)
+        self.now += 0.5
+        self.assertEqual(limiter.available(), 1)
+        self.assertEqual(limiter.wait_time(), 0.0)
+
+    def test_refill_never_exceeds_the_burst(self):
+        limiter = RateLimiter(per_minute=60, burst=2)
+        self.now += 3600
+        self.assertEqual(limiter.available(), 2)
+
+    def test_no_limit(self):
+        limiter = RateLimiter(per_minute=0, burst=4)
+        limiter.take(100)
+        self.assertEqual(limiter.available(), 4)
+        self.assertEqual(limiter.wait_time(), 0.0)
+
+
+class ThrottleTests(SimpleTestCase):
+    def test_high_load_pauses_claiming(self):
+        sched = Scheduler(max_per_minute=0, max_load=0.5, poll_interval=30)
+        with mock.patch("seo.scheduler.load_per_cpu", return_value=2.0):
+            self.assertEqual(sched._throttle(), 5)
+        with mock.patch("seo.scheduler.load_per_cpu", return_value=0.1):
+            self.assertEqual(sched._throttle(), 0.0)
+
+    def test_unknown_load_falls_back_to_the_rate_limit(self):
+        sched = Scheduler(max_per_minute=60, posts_per_task=1, max_load=0.5)
+        sched.limiter.take(1)
+        with mock.patch("seo.scheduler.load_per_cpu", return_value=None):
+            self.assertGreater(sched._throttle(), 0)
+
+
+@override_settings(SEO_SCHEDULE_NEW_POSTS=False)
+class RunPoliciesTests(StandInModelsMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        self.good = RefreshPolicy.objects.create(blog=make_blog(title="Good 2019"), next_run_at=now)
+        self.bad = RefreshPolicy.objects.create(blog=make_blog(title="Bad 2019"), next_run_at=now)
+        claim_due(10)
+
+    def run_with_failing_post(self):
+        generate = scheduler.generate_refresh_many
+
+        def failing(blogs, **kwargs):
+            if any(blog.title.startswith("Bad") for blog in blogs):
+                raise RuntimeError("model crashed")
+            return generate(blogs, **kwargs)
+
+        with mock.patch("seo.scheduler.generate_refresh_many", side_effect=failing), \
+                self.assertLogs("seo.scheduler", "WARNING"):
+            return run_policies([self.good.pk, self.bad.pk])
+
+    def test_a_failing_post_does_not_fail_its_batch(self):
+        outcomes = self.run_with_failing_post()
+        self.assertEqual(outcomes, {
+            self.good.blog_id: RefreshPolicy.STATUS_SUCCEEDED, self.bad.blog_id: RefreshPolicy.STATUS_FAILED,
+        })
+        self.good.refresh_from_db()
+        self.assertIsNone(self.good.leased_until)
+        self.assertEqual(self.good.failures, 0)
+        self.assertIsNotNone(Blog.objects.get(pk=self.good.blog_id).preview_data)
+
+    def test_failures_back_off(self):
+        with mock.patch("seo.scheduler.random.uniform", return_value=1.0):
+            for expected in (1, 2):
+                before = timezone.now()
+                self.run_with_failing_post()
+                self.bad.refresh_from_db()
+                self.assertEqual(self.bad.failures, expected)
+                self.assertEqual(self.bad.last_error, "model crashed")
+                self.assertIsNone(self.bad.leased_until)
+                delay = (self.bad.next_run_at - before).total_seconds()
+                self.assertAlmostEqual(delay, backoff_delay(expected).total_seconds(), delta=5)
+
+    def test_success_resets_the_failure_count(self):
+        RefreshPolicy.objects.filter(pk=self.good.pk).update(failures=3, last_error="boom")
+        run_policies([self.good.pk])
+        self.good.refresh_from_db()
+        self.assertEqual((self.good.failures, self.good.last_error), (0, ""))
+        self.assertEqual(self.good.last_status, RefreshPolicy.STATUS_SUCCEEDED)
+        self.assertGreater(self.good.next_run_at, timezone.now() + self.good.interval - timedelta(minutes=1))
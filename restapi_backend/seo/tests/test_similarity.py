@@ -0,0 +1,88 @@
+import tempfile
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from seo.similarity import SimilarityIndex, similarity_index, temporary_index
+
+DOCUMENTS = [
+    (1, "Email marketing tips", "Email marketing campaigns with drip sequences and newsletter open rates."),
+    (2, "Newsletter growth", "Grow newsletter subscribers with email campaigns and better open rates."),
+    (3, "Sourdough baking", "Bake sourdough bread with a starter, flour, water and a hot oven."),
+    (4, "Bread for beginners", "A beginner bread recipe: flour, water, yeast and a hot oven."),
+    (5, "Kubernetes autoscaling", "Scale pods on cluster load with the horizontal pod autoscaler."),
+]
+
+
+class SimilarityIndexTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = directory.name
+        self.index = SimilarityIndex(self.path, dimensions=256)
+        self.index.build(lambda: iter(DOCUMENTS))
+
+    def test_build_indexes_every_document(self):
+        self.assertTrue(self.index.exists())
+        self.assertEqual(len(self.index), len(DOCUMENTS))
+
+    def test_related_ranks_similar_posts_first(self):
+        self.assertEqual(self.index.related(1, k=1)[0][0], 2)
+        self.assertEqual(self.index.related(3, k=1)[0][0], 4)
+
+    def test_related_excludes_the_post_itself_and_respects_k(self):
+        matches = self.index.related(1, k=3, min_score=-1.0)
+        self.assertEqual(len(matches), 3)
+        self.assertNotIn(1, [pk for pk, _ in matches])
+        scores = [score for _, score in matches]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_related_of_unknown_post_is_empty(self):
+        self.assertEqual(self.index.related(99), [])
+
+    def test_min_score_filters_weak_matches(self):
+        self.assertEqual(self.index.related(5, k=4, min_score=0.5), [])
+
+    def test_update_replaces_a_row(self):
+        self.index.update(5, "Sourdough starter", "Feed the sourdough starter flour and water before you bake bread.")
+        self.assertEqual(len(self.index), len(DOCUMENTS))
+        self.assertIn(self.index.related(5, k=1)[0][0], (3, 4))
+
+    def test_update_adds_new_posts_and_grows_past_capacity(self):
+        capacity = len(self.index._state[0])
+        for pk in range(10, 10 + capacity):
+            self.index.update(pk, f"Post {pk}", "Email campaigns and newsletter open rates.")
+        self.assertEqual(len(self.index), len(DOCUMENTS) + capacity)
+        self.assertGreater(len(self.index._state[0]), capacity)
+        # Rows written before the index grew are still there
+        self.assertIn(self.index.related(1, k=1)[0][0], [2] + list(range(10, 10 + capacity)))
+        self.assertIn(9 + capacity, [pk for pk, _ in self.index.related(2, k=capacity + 4)])
+
+    def test_remove_drops_a_row(self):
+        self.assertTrue(self.index.remove(2))
+        self.assertFalse(self.index.remove(2))
+        self.assertEqual(len(self.index), len(DOCUMENTS) - 1)
+        self.assertNotIn(2, [pk for pk, _ in self.index.related(1, k=4)])
+
+    def test_other_instances_see_writes(self):
+        reader = SimilarityIndex(self.path, dimensions=256)
+        self.index.update(6, "Email drip", "Drip email campaigns lift newsletter open rates.")
+        self.assertIn(6, [pk for pk, _ in reader.related(1, k=2)])
+
+    def test_update_without_a_built_index_does_nothing(self):
+        with tempfile.TemporaryDirectory() as path:
+            index = SimilarityIndex(path, dimensions=256)
+            self.assertFalse(index.update(1, "Title", "Content"))
+            self.assertEqual(index.related(1), [])
+
+
+class TemporaryIndexTests(SimpleTestCase):
+    def test_tests_never_use_the_configured_index(self):
+        self.assertNotEqual(similarity_index.path, str(settings.SEO_SIMILARITY_INDEX_DIR))
+
+    def test_temporary_index_restores_the_previous_path(self):
+        previous = similarity_index.path
+        with temporary_index() as index:
+            self.assertNotEqual(index.path, previous)
+            self.assertFalse(index.exists())
+        self.assertEqual(similarity_index.path, previous)
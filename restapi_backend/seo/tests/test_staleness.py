@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from blog.models import Blog
+from seo.staleness import months_to_days, select_stale, staleness_score
+
+URL = "/api/refresh-blog/stale/"
+
+
+class StalenessScoreTests(SimpleTestCase):
+    def test_spans_per_thousand_characters(self):
+        self.assertEqual(staleness_score("x" * 2000, [("2019", 0, 4)] * 3), 1.5)
+        self.assertEqual(staleness_score("", []), 0.0)
+
+    def test_months_to_days(self):
+        self.assertEqual(months_to_days(6), 180)
+        self.assertEqual(months_to_days(0.5), 15)
+        for months in (0, -1, float("inf"), float("nan"), 10 ** 9):
+            with self.assertRaises(ValueError):
+                months_to_days(months)
+
+
+class SelectStaleTests(TestCase):
+    def setUp(self):
+        author = User.objects.create_user("writer", password="pw")
+        now = timezone.now()
+        self.old = Blog.objects.create(title="Old", content="a", topic="seo", author=author, staleness_score=1.0)
+        self.older = Blog.objects.create(title="Older", content="b", topic="seo", author=author, staleness_score=3.0)
+        self.fresh = Blog.objects.create(title="Fresh", content="c", topic="ads", author=author, staleness_score=2.0)
+        self.unscored = Blog.objects.create(title="Unscored", content="d", topic="seo", author=author)
+        for blog, age in ((self.old, 200), (self.older, 400), (self.fresh, 5), (self.unscored, 300)):
+            Blog.objects.filter(pk=blog.pk).update(last_refreshed_at=now - timedelta(days=age))
+
+    def test_oldest_first(self):
+        self.assertEqual(
+            [blog.title for blog in select_stale()], ["Older", "Unscored", "Old", "Fresh"]
+        )
+
+    def test_most_outdated_first_skips_unscored_posts(self):
+        self.assertEqual([blog.title for blog in select_stale(order="score")], ["Older", "Fresh", "Old"])
+
+    def test_filters(self):
+        self.assertEqual([blog.title for blog in select_stale(topic="seo", older_than_days=250)], ["Older", "Unscored"])
+        self.assertEqual([blog.title for blog in select_stale(min_score=2.0, order="score")], ["Older", "Fresh"])
+        self.assertEqual(len(select_stale(limit=2)), 2)
+
+    def test_invalid_arguments(self):
+        for kwargs in ({"order": "newest"}, {"limit": 0}, {"min_score": float("nan")}):
+            with self.assertRaises(ValueError):
+                select_stale(**kwargs)
+
+    def test_view(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        response = client.get(URL, {"months": "8", "order": "score"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post["title"] for post in response.data], ["Older"])
+
+    def test_view_rejects_invalid_parameters_with_400(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        for params in ({"months": "inf"}, {"months": "nan"}, {"months": "-2"}, {"months": "1e300"},
+                       {"months": "x"}, {"limit": "-1"}, {"order": "random"}):
+            self.assertEqual(client.get(URL, params).status_code, 400, params)
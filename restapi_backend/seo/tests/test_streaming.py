@@ -0,0 +1,84 @@
+import json
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from seo.streaming import iterate_in_thread
+
+from .helpers import StandInModelsMixin, make_blog
+
+
+# (event, data) pairs of a server-sent event stream
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class StreamPreviewViewTests(StandInModelsMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("writer", password="pw")
+        self.blog = make_blog(self.user)
+        self.url = f"/api/refresh-blog/{self.blog.pk}/preview/stream/"
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def stream(self):
+        response = self.client.get(self.url, HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        return parse_events(b"".join(response.streaming_content).decode())
+
+    def test_title_then_chunks_then_done(self):
+        events = self.stream()
+        names = [name for name, _ in events]
+        self.assertEqual(names[0], "title")
+        self.assertEqual(names[-1], "done")
+        self.assertEqual(set(names[1:-1]), {"chunk"})
+        self.assertEqual(len(names) - 2, events[0][1]["regenerating"])
+        indexes = [data["index"] for _, data in events[1:-1]]
+        self.assertEqual(indexes, sorted(indexes))
+        self.blog.refresh_from_db()
+        self.assertEqual(events[-1][1]["preview_version"], self.blog.preview_data["version"])
+
+    def test_a_failure_ends_the_stream_with_an_error_event(self):
+        def failing(blog, incremental=None):
+            yield "title", {"title": "New title"}
+            raise RuntimeError("model crashed")
+
+        with mock.patch("seo.views.iter_preview_refresh", failing), self.assertLogs("seo.streaming", "ERROR"):
+            events = self.stream()
+        self.assertEqual(events, [("title", {"title": "New title"}), ("error", {"error": "model crashed"})])
+        self.blog.refresh_from_db()
+        self.assertIsNone(self.blog.preview_data)
+
+    def test_requires_login(self):
+        response = APIClient().get(self.url, HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(parse_events(response.content.decode())[0][0], "error")
+
+
+class IterateInThreadTests(SimpleTestCase):
+    def test_steps_run_off_the_event_loop_and_close_their_connections(self):
+        threads = []
+
+        def items():
+            for item in ("a", "b"):
+                threads.append(threading.get_ident())
+                yield item
+
+        async def collect():
+            return [item async for item in iterate_in_thread(items())]
+
+        with mock.patch("seo.streaming.close_old_connections") as close:
+            self.assertEqual(async_to_sync(collect)(), ["a", "b"])
+        self.assertNotIn(threading.get_ident(), threads)
+        # Before and after each of the three steps (the last one finds the generator exhausted)
+        self.assertEqual(close.call_count, 6)
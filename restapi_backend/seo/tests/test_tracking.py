@@ -0,0 +1,142 @@
+import io
+import json
+from datetime import date, datetime, timedelta
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from seo.models import RefreshImpact, SeoMetricDaily
+from seo.tracking import _iter_json_array, import_metrics, parse_record, record_refresh, refresh_impact
+
+from .helpers import make_blog
+
+
+class ParseRecordTests(SimpleTestCase):
+    def test_blog_id_columns_and_number_formats(self):
+        row = parse_record({
+            "Blog ID": "12", "Date": "2024-06-15", "Impressions": "1,234", "Clicks": "56",
+            "Average Position": "3.5", "Sessions": "", "ignored": "x",
+        })
+        self.assertEqual(
+            (row.blog_id, row.date, row.impressions, row.clicks, row.position, row.sessions),
+            (12, date(2024, 6, 15), 1234, 56, 3.5, 0),
+        )
+
+    def test_post_id_from_the_page_url_and_ga4_dates(self):
+        row = parse_record({"landing_page": "https://example.com/blogs/7/?utm=x", "date": "20240615", "visits": 3})
+        self.assertEqual((row.blog_id, row.date, row.sessions, row.position), (7, date(2024, 6, 15), 3, None))
+
+    def test_invalid_records(self):
+        for record, error in (
+            ({"date": "2024-06-15", "clicks": 1}, KeyError),
+            ({"page": "/about/", "date": "2024-06-15"}, ValueError),
+            ({"blog_id": 1, "date": "15/06/2024"}, ValueError),
+            ({"blog_id": 1, "date": "2024-06-15", "clicks": "many"}, ValueError),
+            ({"blog_id": 1}, KeyError),
+        ):
+            with self.assertRaises(error, msg=record):
+                parse_record(record)
+
+
+class IterJsonArrayTests(SimpleTestCase):
+    records = [{"blog_id": i, "date": "2024-06-15", "page": "/blogs/%d/ [x], {y}" % i} for i in range(20)]
+
+    def test_objects_straddling_read_chunks(self):
+        text = json.dumps(self.records, indent=2)
+        for chunk_size in (1, 7, 64, 1 << 16):
+            self.assertEqual(list(_iter_json_array(io.StringIO(text), chunk_size=chunk_size)), self.records)
+
+    def test_empty_array(self):
+        self.assertEqual(list(_iter_json_array(io.StringIO(" [ ] "), chunk_size=2)), [])
+
+    def test_rejects_anything_but_a_complete_array(self):
+        for text in ('{"blog_id": 1}', '[{"blog_id": 1}, {"blog_id"', '[{"blog_id": 1}'):
+            with self.assertRaises(ValueError, msg=text):
+                list(_iter_json_array(io.StringIO(text), chunk_size=4))
+
+
+class ImportMetricsTests(TestCase):
+    def setUp(self):
+        self.blog = make_blog()
+
+    def csv(self, *rows):
+        lines = ["blog_id,date,impressions,clicks,position"] + [",".join(map(str, row)) for row in rows]
+        return io.StringIO("\n".join(lines) + "\n")
+
+    def test_importing_the_same_file_twice_adds_nothing(self):
+        rows = [(self.blog.pk, f"2024-06-{day:02d}", 100, 5, 4.0) for day in range(1, 11)]
+        first = import_metrics(self.csv(*rows), "csv", batch_size=3)
+        self.assertEqual((first["read"], first["created"], first["duplicates"]), (10, 10, 0))
+        second = import_metrics(self.csv(*rows), "csv", batch_size=4)
+        self.assertEqual((second["read"], second["created"], second["duplicates"]), (10, 0, 10))
+        self.assertEqual(SeoMetricDaily.objects.count(), 10)
+
+    def test_duplicates_within_a_file_unknown_posts_and_invalid_rows(self):
+        summary = import_metrics(self.csv(
+            (self.blog.pk, "2024-06-01", 1, 0, ""),
+            (self.blog.pk, "2024-06-01", 2, 0, ""),
+            (self.blog.pk + 1000, "2024-06-01", 1, 0, ""),
+            (self.blog.pk, "not a date", 1, 0, ""),
+        ), "csv")
+        self.assertEqual(
+            {key: summary[key] for key in ("created", "duplicates", "unknown_blogs", "invalid")},
+            {"created": 1, "duplicates": 1, "unknown_blogs": 1, "invalid": 1},
+        )
+        self.assertEqual(len(summary["errors"]), 1)
+
+    def test_jsonl(self):
+        lines = [json.dumps({"page": f"/blog/{self.blog.pk}", "date": "2024-06-01", "clicks": 3}), ""]
+        summary = import_metrics(io.StringIO("\n".join(lines)), "jsonl")
+        self.assertEqual(summary["created"], 1)
+
+
+class RollupTests(TestCase):
+    day = date(2024, 6, 15)
+
+    def setUp(self):
+        self.blog = make_blog()
+        rows = []
+        for offset in range(-120, 121):
+            day = self.day + timedelta(days=offset)
+            if offset < 0:
+                impressions, position = (30, 2.0) if offset == -1 else (10, 5.0)
+            elif offset == 0:
+                impressions, position = 10000, 1.0  # the refresh day is in neither window
+            else:
+                impressions, position = 20, 3.0
+            rows.append(f"{self.blog.pk},{day},{impressions},{impressions // 10},{position},1")
+        self.export = "blog_id,date,impressions,clicks,position,sessions\n" + "\n".join(rows)
+        refreshed_at = timezone.make_aware(datetime.combine(self.day, datetime.min.time()) + timedelta(hours=12))
+        self.event = record_refresh(self.blog.pk, refreshed_at)
+
+    def impacts(self):
+        return {impact.window_days: impact for impact in RefreshImpact.objects.filter(event=self.event)}
+
+    def test_rollups_are_filled_by_the_import(self):
+        self.assertEqual(self.impacts()[7].before_days, 0)
+        summary = import_metrics(io.StringIO(self.export), "csv")
+        self.assertEqual(summary["events"], 1)
+
+        impacts = self.impacts()
+        self.assertEqual(sorted(impacts), [7, 30, 90])
+        for n, impact in impacts.items():
+            self.assertEqual((impact.before_days, impact.after_days), (n, n))
+            self.assertEqual(impact.before_impressions, 30 + 10 * (n - 1))
+            self.assertEqual(impact.before_clicks, 3 + (n - 1))
+            self.assertEqual(impact.after_impressions, 20 * n)
+            self.assertEqual(impact.after_clicks, 2 * n)
+            self.assertEqual((impact.before_sessions, impact.after_sessions), (n, n))
+            # Impression-weighted position
+            self.assertAlmostEqual(impact.before_position, (30 * 2.0 + 10 * 5.0 * (n - 1)) / (30 + 10 * (n - 1)))
+            self.assertAlmostEqual(impact.after_position, 3.0)
+
+    def test_refresh_impact_reports_daily_rates(self):
+        import_metrics(io.StringIO(self.export), "csv")
+        [entry] = refresh_impact(self.blog.pk)
+        week = entry["windows"][0]
+        self.assertEqual(week["window_days"], 7)
+        before = round(90 / 7, 2)
+        self.assertEqual(week["before"]["impressions_per_day"], before)
+        self.assertEqual(week["after"]["clicks_per_day"], 2.0)
+        self.assertEqual(week["change"]["impressions_per_day_pct"], round((20 - before) / before * 100, 1))
+        self.assertTrue(week["complete"])
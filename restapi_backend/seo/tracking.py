@@ -0,0 +1,335 @@
+import csv
+import json
+import re
+from datetime import date, timedelta
+
+from django.db.models import Avg, Count, F, Q, Sum
+from django.utils import timezone
+
+from blog.models import Blog
+
+from .models import RefreshEvent, RefreshImpact, SeoMetricDaily
+
+# Before/after windows (days) precomputed around every refresh
+ROLLUP_WINDOWS = (7, 30, 90)
+FORMATS = ("csv", "json", "jsonl")
+IMPORT_BATCH_SIZE = 5000
+# Errors kept in the import summary (the rest are only counted)
+MAX_REPORTED_ERRORS = 20
+
+# Export column names (lowercased, "_" as space) -> SeoMetricDaily field; "page" is a post URL
+COLUMNS = {
+    "blog": "blog", "blog id": "blog", "post id": "blog",
+    "page": "page", "url": "page", "landing page": "page", "top pages": "page",
+    "date": "date", "day": "date",
+    "impressions": "impressions",
+    "clicks": "clicks",
+    "position": "position", "average position": "position", "avg position": "position",
+    "sessions": "sessions", "visits": "sessions",
+}
+PAGE_RE = re.compile(r"/blogs?/(\d+)/?(?:[?#].*)?$")
+SEPARATORS_RE = re.compile(r"[\s,]*")
+
+
+def detect_format(path):
+    extension = path.rsplit(".", 1)[-1].lower()
+    return {"ndjson": "jsonl"}.get(extension, extension)
+
+
+# Records from an export, read incrementally: CSV rows, JSON Lines, or the objects of one JSON array
+def iter_records(f, fmt):
+    if fmt == "csv":
+        return csv.DictReader(f)
+    if fmt == "jsonl":
+        return (json.loads(line) for line in f if line.strip())
+    if fmt == "json":
+        return _iter_json_array(f)
+    raise ValueError(f"Unknown format '{fmt}'. Choose one of: {', '.join(FORMATS)}")
+
+
+# Decode the items of a top-level JSON array chunk by chunk, without loading the whole file
+def _iter_json_array(f, chunk_size=1 << 16):
+    decoder = json.JSONDecoder()
+    buffer, pos, opened = "", 0, False
+    while True:
+        chunk = f.read(chunk_size)
+        buffer, pos = buffer[pos:] + chunk, 0
+        while True:
+            pos = SEPARATORS_RE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            if not opened:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array of records")
+                opened, pos = True, pos + 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not chunk:
+                    raise
+                break  # the item continues in the next chunk
+            yield record
+        if not chunk:
+            if opened:
+                raise ValueError("Unexpected end of file inside the JSON array")
+            return
+
+
+def _number(value, cast=int):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, str):
+        value = value.strip().replace(",", "").rstrip("%")
+    return cast(float(value)) if cast is int else cast(value)
+
+
+def _date(value):
+    value = str(value).strip()
+    if len(value) == 8 and value.isdigit():  # GA4 exports: YYYYMMDD
+        return date(int(value[:4]), int(value[4:6]), int(value[6:]))
+    return date.fromisoformat(value[:10])
+
+
+# One export record as an unsaved SeoMetricDaily; raises ValueError/KeyError/TypeError on bad input
+def parse_record(record):
+    fields = {}
+    for key, value in record.items():
+        field = COLUMNS.get(str(key).strip().lower().replace("_", " "))
+        if field:
+            fields[field] = value
+    if "blog" in fields:
+        blog_id = _number(fields["blog"])
+    elif "page" in fields:
+        match = PAGE_RE.search(str(fields["page"]))
+        if not match:
+            raise ValueError(f"Can't find a post id in page {fields['page']!r}")
+        blog_id = int(match.group(1))
+    else:
+        raise KeyError("blog_id or page")
+    return SeoMetricDaily(
+        blog_id=blog_id,
+        date=_date(fields["date"]),
+        impressions=_number(fields.get("impressions")) or 0,
+        clicks=_number(fields.get("clicks")) or 0,
+        position=_number(fields.get("position"), float),
+        sessions=_number(fields.get("sessions")) or 0,
+    )
+
+
+# Stream an export into SeoMetricDaily in bulk_create batches, then refresh the rollups of every
+# refresh event whose windows the imported days fall in. Days already stored are skipped.
+def import_metrics(f, fmt, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    summary = {"read": 0, "created": 0, "duplicates": 0, "unknown_blogs": 0, "invalid": 0, "errors": [], "events": 0}
+    touched = {}
+    batch = []
+    for number, record in enumerate(iter_records(f, fmt), 1):
+        summary["read"] += 1
+        try:
+            batch.append(parse_record(record))
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            summary["invalid"] += 1
+            if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+                summary["errors"].append(f"record {number}: {e!r}")
+        if len(batch) >= batch_size:
+            _write_batch(batch, summary, touched)
+            batch = []
+            if progress:
+                progress(summary)
+    if batch:
+        _write_batch(batch, summary, touched)
+    summary["events"] = update_rollups(touched)
+    return summary
+
+
+def _write_batch(rows, summary, touched):
+    blog_ids = {row.blog_id for row in rows}
+    known = set(Blog.objects.filter(pk__in=blog_ids).values_list("pk", flat=True))
+    first, last = min(row.date for row in rows), max(row.date for row in rows)
+    stored = set(
+        SeoMetricDaily.objects.filter(blog_id__in=known, date__range=(first, last)).values_list("blog_id", "date")
+    )
+
+    new = []
+    for row in rows:
+        key = (row.blog_id, row.date)
+        if row.blog_id not in known:
+            summary["unknown_blogs"] += 1
+        elif key in stored:
+            summary["duplicates"] += 1
+        else:
+            stored.add(key)
+            new.append(row)
+            low, high = touched.get(row.blog_id, (row.date, row.date))
+            touched[row.blog_id] = (min(low, row.date), max(high, row.date))
+    # ignore_conflicts covers a concurrent import of the same days
+    SeoMetricDaily.objects.bulk_create(new, batch_size=1000, ignore_conflicts=True)
+    summary["created"] += len(new)
+
+
+# Recompute the rollups of refresh events near the given days ({blog_id: (first_day, last_day)})
+def update_rollups(touched):
+    reach = timedelta(days=max(ROLLUP_WINDOWS))
+    blog_ids = list(touched)
+    events = []
+    for start in range(0, len(blog_ids), 500):
+        candidates = RefreshEvent.objects.filter(blog_id__in=blog_ids[start:start + 500])
+        for event in candidates:
+            first, last = touched[event.blog_id]
+            if first - reach <= _event_day(event) <= last + reach:
+                events.append(event)
+    compute_rollups(events)
+    return len(events)
+
+
+def _event_day(event):
+    return timezone.localdate(event.refreshed_at)
+
+
+# One aggregate query per event covers all windows on both sides; results are upserted
+def compute_rollups(events):
+    impacts = []
+    for event in events:
+        day = _event_day(event)
+        aggregates = {}
+        for n in ROLLUP_WINDOWS:
+            for side, start, end in (("before", day - timedelta(days=n), day - timedelta(days=1)),
+                                     ("after", day + timedelta(days=1), day + timedelta(days=n))):
+                window = Q(date__range=(start, end))
+                ranked = window & Q(position__isnull=False)
+                prefix = f"{side}_{n}"
+                aggregates[f"{prefix}_days"] = Count("id", filter=window)
+                aggregates[f"{prefix}_impressions"] = Sum("impressions", filter=window)
+                aggregates[f"{prefix}_clicks"] = Sum("clicks", filter=window)
+                aggregates[f"{prefix}_sessions"] = Sum("sessions", filter=window)
+                aggregates[f"{prefix}_weighted"] = Sum(F("position") * F("impressions"), filter=ranked)
+                aggregates[f"{prefix}_ranked_impressions"] = Sum("impressions", filter=ranked)
+                aggregates[f"{prefix}_position"] = Avg("position", filter=ranked)
+        reach = timedelta(days=max(ROLLUP_WINDOWS))
+        totals = SeoMetricDaily.objects.filter(
+            blog_id=event.blog_id, date__range=(day - reach, day + reach)
+        ).aggregate(**aggregates)
+
+        for n in ROLLUP_WINDOWS:
+            values = {}
+            for side in ("before", "after"):
+                prefix = f"{side}_{n}"
+                values[f"{side}_days"] = totals[f"{prefix}_days"]
+                for field in ("impressions", "clicks", "sessions"):
+                    values[f"{side}_{field}"] = totals[f"{prefix}_{field}"] or 0
+                # Impression-weighted average position, or the plain average for days without impressions
+                ranked = totals[f"{prefix}_ranked_impressions"]
+                values[f"{side}_position"] = (
+                    totals[f"{prefix}_weighted"] / ranked if ranked else totals[f"{prefix}_position"]
+                )
+            impacts.append(RefreshImpact(event=event, window_days=n, **values))
+
+    fields = [field.name for field in RefreshImpact._meta.concrete_fields if field.name.startswith(("before_", "after_"))]
+    RefreshImpact.objects.bulk_create(
+        impacts, batch_size=500, update_conflicts=True,
+        unique_fields=["event", "window_days"], update_fields=fields + ["computed_at"],
+    )
+    return impacts
+
+
+# Record a refresh saved onto a post; its "before" rollups are filled straight away
+def record_refresh(blog_id, refreshed_at=None):
+    event = RefreshEvent.objects.create(blog_id=blog_id, refreshed_at=refreshed_at or timezone.now())
+    compute_rollups([event])
+    return event
+
+
+def _side(impact, side):
+    days = getattr(impact, f"{side}_days")
+    impressions = getattr(impact, f"{side}_impressions")
+    clicks = getattr(impact, f"{side}_clicks")
+    sessions = getattr(impact, f"{side}_sessions")
+    position = getattr(impact, f"{side}_position")
+    return {
+        "days": days,
+        "impressions": impressions,
+        "clicks": clicks,
+        "sessions": sessions,
+        "ctr": round(clicks / impressions, 4) if impressions else None,
+        "position": round(position, 2) if position is not None else None,
+        "clicks_per_day": round(clicks / days, 2) if days else None,
+        "impressions_per_day": round(impressions / days, 2) if days else None,
+        "sessions_per_day": round(sessions / days, 2) if days else None,
+    }
+
+
+def _change(before, after):
+    def pct(key):
+        if not before[key] or after[key] is None:
+            return None
+        return round((after[key] - before[key]) / before[key] * 100, 1)
+
+    def delta(key):
+        if before[key] is None or after[key] is None:
+            return None
+        return round(after[key] - before[key], 4)
+
+    # Daily rates, so a window that hasn't fully elapsed yet still compares fairly
+    return {
+        "clicks_per_day_pct": pct("clicks_per_day"),
+        "impressions_per_day_pct": pct("impressions_per_day"),
+        "sessions_per_day_pct": pct("sessions_per_day"),
+        "ctr": delta("ctr"),
+        # Negative = ranking improved
+        "position": delta("position"),
+    }
+
+
+def serialize_impact(impact):
+    before, after = _side(impact, "before"), _side(impact, "after")
+    return {
+        "window_days": impact.window_days,
+        "before": before,
+        "after": after,
+        "change": _change(before, after),
+        "complete": timezone.localdate() > _event_day(impact.event) + timedelta(days=impact.window_days),
+    }
+
+
+# Before/after numbers of every refresh of a post, newest first, read from the precomputed rollups
+def refresh_impact(blog_id):
+    impacts = (
+        RefreshImpact.objects.filter(event__blog_id=blog_id)
+        .select_related("event")
+        .order_by("-event__refreshed_at", "event_id", "window_days")
+    )
+    events = {}
+    for impact in impacts:
+        entry = events.setdefault(impact.event_id, {"refreshed_at": impact.event.refreshed_at, "windows": []})
+        entry["windows"].append(serialize_impact(impact))
+    return list(events.values())
+
+
+# Site-wide before/after totals per window over every refresh (one grouped query over the rollups)
+def impact_summary():
+    sums = {
+        f"{side}_{field}": Sum(f"{side}_{field}")
+        for side in ("before", "after")
+        for field in ("days", "impressions", "clicks", "sessions")
+    }
+    rows = RefreshImpact.objects.values("window_days").annotate(
+        refreshes=Count("id"),
+        before_position=Avg("before_position"),
+        after_position=Avg("after_position"),
+        **sums,
+    ).order_by("window_days")
+    summary = []
+    for row in rows:
+        impact = RefreshImpact(**{key: value or 0 for key, value in row.items() if key != "refreshes"})
+        impact.before_position, impact.after_position = row["before_position"], row["after_position"]
+        before, after = _side(impact, "before"), _side(impact, "after")
+        summary.append({
+            "window_days": row["window_days"],
+            "refreshes": row["refreshes"],
+            "before": before,
+            "after": after,
+            "change": _change(before, after),
+        })
+    return summary
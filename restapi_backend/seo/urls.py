@@ -8,9 +8,46 @@
 # ]
 
 from django.urls import path
-from .views import preview_refresh_blog, confirm_refresh_blog
+from .views import (
+    preview_refresh_blog,
+    stream_preview_refresh_blog,
+    confirm_refresh_blog,
+    create_refresh_job,
+    refresh_job_status,
+    create_bulk_refresh,
+    bulk_refresh_status,
+    stale_posts,
+    blog_keywords,
+    refresh_schedule,
+    blog_refresh_impact,
+    refresh_impact_summary,
+    blog_revisions,
+    blog_revision,
+    restore_blog_revision,
+    blog_diff,
+    model_status,
+    cache_status,
+    metrics_view,
+)
 
 urlpatterns = [
     path("refresh-blog/<int:pk>/preview/", preview_refresh_blog, name="preview_refresh_blog"),
+    path("refresh-blog/<int:pk>/preview/stream/", stream_preview_refresh_blog, name="stream_preview_refresh_blog"),
     path("refresh-blog/<int:pk>/confirm/", confirm_refresh_blog, name="confirm_refresh_blog"),
+    path("refresh-blog/<int:pk>/jobs/", create_refresh_job, name="create_refresh_job"),
+    path("refresh-jobs/<uuid:job_id>/", refresh_job_status, name="refresh_job_status"),
+    path("refresh-blog/bulk/", create_bulk_refresh, name="create_bulk_refresh"),
+    path("refresh-blog/bulk/<int:run_id>/", bulk_refresh_status, name="bulk_refresh_status"),
+    path("refresh-blog/stale/", stale_posts, name="stale_posts"),
+    path("refresh-blog/<int:pk>/keywords/", blog_keywords, name="blog_keywords"),
+    path("refresh-blog/<int:pk>/schedule/", refresh_schedule, name="refresh_schedule"),
+    path("refresh-blog/<int:pk>/impact/", blog_refresh_impact, name="blog_refresh_impact"),
+    path("refresh-blog/<int:pk>/revisions/", blog_revisions, name="blog_revisions"),
+    path("refresh-blog/<int:pk>/revisions/<int:number>/", blog_revision, name="blog_revision"),
+    path("refresh-blog/<int:pk>/revisions/<int:number>/restore/", restore_blog_revision, name="restore_blog_revision"),
+    path("refresh-blog/<int:pk>/diff/", blog_diff, name="blog_diff"),
+    path("seo/impact/", refresh_impact_summary, name="refresh_impact_summary"),
+    path("seo/models/", model_status, name="seo_model_status"),
+    path("seo/cache/", cache_status, name="seo_cache_status"),
+    path("seo/metrics/", metrics_view, name="seo_metrics"),
 ]
@@ -90,46 +90,196 @@
 import re
 import logging
 from datetime import datetime
-import spacy
-from rake_nltk import Rake
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
-import torch
 import random
+from django.conf import settings
+from .registry import GENERATION_MODEL_NAME, registry
+from .scanner import context_window, scan_outdated
+from .chunking import chunk_text, separator
+from .rewrite import apply_edits, year_edits
+from .inference_client import InferenceUnavailable, fallback_enabled, get_client
+from .cache import TieredCache, make_key
+from .metrics import count, stage
 
 # Setup logging
 logging.basicConfig(level=logging.DEBUG)
 
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
+_generation_cache_settings = getattr(settings, "SEO_GENERATION_CACHE", {})
+generation_cache = TieredCache(
+    "generation",
+    max_entries=_generation_cache_settings.get("MAX_ENTRIES", 2048),
+    persistent_alias=_generation_cache_settings.get("PERSISTENT_ALIAS"),
+    timeout=_generation_cache_settings.get("TIMEOUT"),
+)
 
-# Load Hugging Face model + tokenizer
-MODEL_NAME = "google/flan-t5-base"
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
 
-# Device setup (GPU if available)
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-model.to(device)
+# spaCy pipeline, loaded on first use
+def get_nlp():
+    return registry.get("nlp")
+
+
+# Entity-only spaCy pipeline for detect_outdated
+def get_ner():
+    return registry.get("ner")
+
+
+# Generation backend (see seo.backends), loaded on first use
+def get_generator():
+    return registry.get("generator")
+
+
+# Hugging Face tokenizer alone, loaded on first use
+def get_tokenizer():
+    return registry.get("tokenizer")
+
+
+# Token count for each string, measured with the generation tokenizer
+def count_tokens(texts):
+    if not texts:
+        return []
+    return [len(ids) for ids in get_tokenizer()(list(texts), add_special_tokens=False)["input_ids"]]
 
 
 # Generate text with variation
 def generate_text(prompt, max_length=256, temperature=0.7, top_p=0.9):
-    inputs = tokenizer(prompt, return_tensors="pt").to(device)
-    outputs = model.generate(
-        **inputs,
-        max_length=max_length,
-        do_sample=True,
-        temperature=temperature,
-        top_p=top_p,
-        num_return_sequences=1,
-        pad_token_id=tokenizer.eos_token_id
-    )
-    return tokenizer.decode(outputs[0], skip_special_tokens=True)
+    return generate_batch([prompt], max_length=max_length, temperature=temperature, top_p=top_p)[0]
+
+
+# Number of prompts tokenized and decoded together in one model.generate call
+def get_batch_size():
+    return getattr(settings, "SEO_GENERATION_BATCH_SIZE", 8)
+
+
+# Generate text for many prompts, padding each batch to a shared length
+def generate_batch(prompts, max_length=256, temperature=0.7, top_p=0.9, batch_size=None):
+    results = [None] * len(prompts)
+    for i, text in iter_generate_batch(prompts, max_length, temperature, top_p, batch_size):
+        results[i] = text
+    return results
+
+
+# Yield (index, text) for each prompt as soon as its batch is decoded.
+# With sort_by_length, prompts of similar length share a batch (less padding) but finish out of order.
+# In a deterministic generation mode, prompts already in the generation cache are answered without the model.
+def iter_generate_batch(prompts, max_length=256, temperature=0.7, top_p=0.9, batch_size=None, sort_by_length=True):
+    if not prompts:
+        return
+    batch_size = max(1, batch_size or get_batch_size())
+    params = decoding_params(temperature, top_p)
+    keys = [generation_key(prompt, max_length, params) for prompt in prompts] if generation_cacheable() else None
+
+    order = list(range(len(prompts)))
+    if sort_by_length:
+        order.sort(key=lambda i: len(prompts[i]))
+
+    pending = []
+    for i in order:
+        cached = generation_cache.get(keys[i]) if keys else None
+        if cached is None:
+            pending.append(i)
+            if len(pending) == batch_size:
+                yield from _generate_pending(prompts, pending, max_length, params, keys)
+                pending = []
+            continue
+        # Keep prompt order when asked to: earlier misses are generated before this hit is yielded
+        if pending and not sort_by_length:
+            yield from _generate_pending(prompts, pending, max_length, params, keys)
+            pending = []
+        yield i, cached
+    if pending:
+        yield from _generate_pending(prompts, pending, max_length, params, keys)
+
+
+def _generate_pending(prompts, indexes, max_length, params, keys):
+    with stage("generate"):
+        texts = get_generator().generate([prompts[i] for i in indexes], max_length=max_length, **params)
+    count("generation_prompts", len(indexes))
+    if keys:
+        for i, text in zip(indexes, texts):
+            generation_cache.set(keys[i], text)
+    return zip(indexes, texts)
+
+
+# "sample" (default) samples freshly on every call; "greedy" decodes greedily and "seeded" samples with
+# SEO_GENERATION_SEED. Both deterministic modes reuse results from the generation cache.
+def generation_mode():
+    return getattr(settings, "SEO_GENERATION_MODE", "sample")
+
+
+def generation_cacheable():
+    return generation_mode() in ("greedy", "seeded")
+
+
+# Decoding keyword arguments for the backend in the current generation mode
+def decoding_params(temperature, top_p):
+    mode = generation_mode()
+    if mode == "greedy":
+        return {"do_sample": False}
+    params = {"temperature": temperature, "top_p": top_p}
+    if mode == "seeded":
+        params["seed"] = getattr(settings, "SEO_GENERATION_SEED", 0)
+    return params
+
+
+# Cache key: whitespace-normalised prompt + model/backend + decoding parameters
+def generation_key(prompt, max_length, params):
+    backend = getattr(settings, "SEO_GENERATION_BACKEND", "torch")
+    return make_key("generation", GENERATION_MODEL_NAME, backend, " ".join(prompt.split()), max_length, params)
+
+
+# Detect outdated info (old years, stats, money, quantities) with the regex scanner,
+# optionally confirming bare numbers with NER
+def detect_outdated(content, use_ner=None):
+    return detect_outdated_many([content], use_ner=use_ner)[0]
+
+
+# detect_outdated for many posts; the NER pass streams only the ambiguous spans' context through nlp.pipe
+def detect_outdated_many(contents, batch_size=32, n_process=None, use_ner=None):
+    with stage("detect_outdated"):
+        return _detect_outdated_many(contents, batch_size, n_process, use_ner)
+
+
+def _detect_outdated_many(contents, batch_size, n_process, use_ner):
+    use_ner = outdated_ner_pass() if use_ner is None else use_ner
+    if use_ner:
+        client = get_client()
+        if client is not None:
+            try:
+                return client.analyze(list(contents))
+            except InferenceUnavailable:
+                if not fallback_enabled():
+                    raise
+
+    scanned = [scan_outdated(content) for content in contents]
+    if not use_ner:
+        return [[(span.text, span.start, span.end) for span in spans] for spans in scanned]
+
+    windows = [
+        (i, span, context_window(contents[i], span))
+        for i, spans in enumerate(scanned)
+        for span in spans
+        if span.ambiguous
+    ]
+    n_process = n_process or getattr(settings, "SEO_NLP_PROCESSES", 1)
+    docs = get_ner().pipe([text for _, _, (_, text) in windows], batch_size=batch_size, n_process=n_process)
+    rejected = set()
+    for (i, span, (offset, _)), doc in zip(windows, docs):
+        confirmed = {(start + offset, end + offset) for _, start, end in outdated_from_doc(doc)}
+        if not any(start < span.end and span.start < end for start, end in confirmed):
+            rejected.add((i, span.start))
+
+    return [
+        [(span.text, span.start, span.end) for span in spans if (i, span.start) not in rejected]
+        for i, spans in enumerate(scanned)
+    ]
+
+
+# Whether bare numbers found by the scanner are confirmed with spaCy NER
+def outdated_ner_pass():
+    return getattr(settings, "SEO_OUTDATED_NER_PASS", False)
 
 
-# Detect outdated entities (years, numbers)
-def detect_outdated(content):
-    doc = nlp(content)
+# Outdated spans from spaCy entities (the NER second pass)
+def outdated_from_doc(doc):
     outdated = []
     current_year = datetime.now().year
     for ent in doc.ents:
@@ -142,18 +292,21 @@ def detect_outdated(content):
     return outdated
 
 
-# Extract SEO keywords
+# Extract SEO keywords: the post's top phrases by TF-IDF against the corpus keyword index, so
+# phrases every post shares (site boilerplate) rank below what this post is specifically about
 def extract_keywords(content):
     try:
-        r = Rake()
-        r.extract_keywords_from_text(content)
-        return r.get_ranked_phrases()[:10]
+        from .keywords import top_keywords
+        with stage("extract_keywords"):
+            return top_keywords(content, limit=10)
     except Exception as e:
         logging.error(f"Keyword extraction failed: {str(e)}")
         return []
 
 
-# Fetch trends (mock for now, replace with live scraping later)
+# Fetch trends (mock for now, replace with live scraping later).
+# The trends end up in the chunk prompts, so deterministic modes pick them per topic and year
+# to keep those prompts (and their generation cache keys) stable.
 def fetch_current_trends(topic, current_year):
     base_trends = [
         f"AI-powered {topic} tools are revolutionizing the industry in {current_year}.",
@@ -162,43 +315,138 @@ def fetch_current_trends(topic, current_year):
         f"How {topic} is evolving with new technologies in {current_year}.",
         f"Best practices for {topic} in {current_year} to stay ahead of competition."
     ]
-    random.shuffle(base_trends)
+    rng = random.Random(f"{topic}:{current_year}") if generation_cacheable() else random
+    rng.shuffle(base_trends)
     return base_trends[:3]
 
 
-# Update title + content
-def update_content(content, title, outdated, trends, old_keywords, topic):
+# Decoding settings for titles and content chunks
+TITLE_GENERATION = {"max_length": 50, "temperature": 0.8, "top_p": 0.9}
+CHUNK_GENERATION = {"max_length": 256, "temperature": 0.8, "top_p": 0.9}
+
+
+CHUNK_PROMPT = (
+    "Update this blog content to be SEO-friendly, replace outdated info with: {trends}, "
+    "incorporate keywords: {keywords}, preserve original tone: {chunk}"
+)
+
+
+# Most tokens of post text one chunk prompt may carry: the configured budget (output has to fit
+# in CHUNK_GENERATION's max_length too), capped by what the prompt template leaves of the model input
+def chunk_token_budget(trends_str, new_keywords):
+    overhead = count_tokens([CHUNK_PROMPT.format(trends=trends_str, keywords=new_keywords, chunk="")])[0] + 1
+    model_limit = min(get_tokenizer().model_max_length, 512)
+    return max(32, min(getattr(settings, "SEO_CHUNK_TOKEN_BUDGET", 240), model_limit - overhead))
+
+
+# "full" rewrites every chunk; "incremental" rewrites only paragraphs with outdated info
+# (plus the intro when the post is missing the target keywords) and keeps the rest byte-for-byte
+def refresh_mode():
+    return getattr(settings, "SEO_REFRESH_MODE", "full")
+
+
+# Build the title prompt and one prompt per content chunk to regenerate.
+# Chunks follow paragraph/sentence boundaries and carry their offsets into the year-updated content
+# (plan["offsets"] maps them back to the source);
+# plan["regenerate"] lists the chunk indexes that have a prompt, plan["reasons"] why each one was picked.
+def plan_refresh(content, title, outdated, trends, old_keywords, topic, incremental=None):
     current_year = str(datetime.now().year)
+    incremental = refresh_mode() == "incremental" if incremental is None else incremental
 
-    # Replace outdated years
-    for old, start, end in outdated:
-        if re.match(r"\d{4}", old):
-            content = content[:start] + current_year + content[end:]
+    # Replace outdated years in one pass; offsets maps chunk positions back to the source
+    content, offsets = apply_edits(content, year_edits(outdated, current_year))
 
     trends_str = " ".join(trends)
-    new_keywords = ", ".join(old_keywords[:5] + [f"best {topic} {current_year}", f"AI-powered {topic}"])
+    target_keywords = [f"best {topic} {current_year}", f"AI-powered {topic}"]
+    new_keywords = ", ".join(old_keywords[:5] + target_keywords)
 
     # SEO Title
     title_prompt = (
         f"Rewrite this title to be SEO-friendly with keywords '{new_keywords}' "
         f"and current year {current_year}: {title}"
     )
-    updated_title = generate_text(title_prompt, max_length=50, temperature=0.8, top_p=0.9)
 
     # SEO Content
-    chunk_size = 500
-    chunks = [content[i:i+chunk_size] for i in range(0, len(content), chunk_size)]
-    updated_chunks = []
-    for chunk in chunks:
-        prompt = (
-            f"Update this blog content to be SEO-friendly, replace outdated info with: {trends_str}, "
-            f"incorporate keywords: {new_keywords}, preserve original tone: {chunk}"
-        )
-        updated_chunk = generate_text(prompt, max_length=256, temperature=0.8, top_p=0.9)
-        updated_chunks.append(updated_chunk)
-
-    updated_content = " ".join(updated_chunks)
-    return updated_title, updated_content, None
+    budget = chunk_token_budget(trends_str, new_keywords)
+    chunks = chunk_text(content, budget, count_tokens, cross_paragraphs=not incremental)
+    if incremental:
+        moved = [(text, offsets.to_target(start), offsets.to_target(end)) for text, start, end in outdated]
+        reasons = refresh_reasons(content, chunks, moved, target_keywords)
+    else:
+        reasons = ["full"] * len(chunks)
+    regenerate = [i for i, reason in enumerate(reasons) if reason]
+    chunk_prompts = [
+        CHUNK_PROMPT.format(trends=trends_str, keywords=new_keywords, chunk=chunks[i].text)
+        for i in regenerate
+    ]
+    return {
+        "title_prompt": title_prompt,
+        "chunk_prompts": chunk_prompts,
+        "chunks": chunks,
+        "content": content,
+        "offsets": offsets,
+        "regenerate": regenerate,
+        "reasons": reasons,
+    }
+
+
+# Why each chunk needs rewriting ("outdated", "keywords") or None to keep it as written
+def refresh_reasons(content, chunks, outdated, target_keywords):
+    reasons = [None] * len(chunks)
+    for i, chunk in enumerate(chunks):
+        if any(start < chunk.end and chunk.start < end for _, start, end in outdated):
+            reasons[i] = "outdated"
+
+    lowered = content.lower()
+    if chunks and reasons[0] is None and any(k.lower() not in lowered for k in target_keywords):
+        reasons[0] = "keywords"
+    return reasons
+
+
+# Join the regenerated chunks (in plan["regenerate"] order) and the kept chunks back into post content.
+# Whitespace between two kept chunks is copied from the source; next to a rewritten chunk only the
+# paragraph/sentence break is kept.
+def assemble_content(plan, updated_chunks):
+    source = plan["content"]
+    chunks = plan["chunks"]
+    if not chunks:
+        return source
+    texts = [chunk.text for chunk in chunks]
+    rewritten = set(plan["regenerate"])
+    for i, text in zip(plan["regenerate"], updated_chunks):
+        texts[i] = text
+
+    parts = [source[:chunks[0].start]]
+    for i, text in enumerate(texts):
+        if i:
+            kept = i - 1 not in rewritten and i not in rewritten
+            parts.append(source[chunks[i - 1].end:chunks[i].start] if kept else separator(source, chunks[i - 1], chunks[i]))
+        parts.append(text)
+    parts.append(source[chunks[-1].end:])
+    return "".join(parts)
+
+
+# (start, end) of a planned chunk in the original post content
+def source_range(plan, index):
+    chunk = plan["chunks"][index]
+    return plan["offsets"].to_source(chunk.start), plan["offsets"].to_source(chunk.end)
+
+
+# Regenerated chunks with their source ranges, for reporting in previews
+def regenerated_segments(plan):
+    segments = []
+    for i in plan["regenerate"]:
+        start, end = source_range(plan, i)
+        segments.append({"index": i, "source_start": start, "source_end": end, "reason": plan["reasons"][i]})
+    return segments
+
+
+# Update title + content
+def update_content(content, title, outdated, trends, old_keywords, topic, incremental=None):
+    plan = plan_refresh(content, title, outdated, trends, old_keywords, topic, incremental=incremental)
+    updated_title = generate_text(plan["title_prompt"], **TITLE_GENERATION)
+    updated_chunks = generate_batch(plan["chunk_prompts"], **CHUNK_GENERATION)
+    return updated_title, assemble_content(plan, updated_chunks), None
 
 
 # Update meta tags
@@ -227,95 +227,328 @@
 #     }, status=status.HTTP_200_OK)
 
 
-from rest_framework.decorators import api_view, permission_classes
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Length
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from rest_framework import status
-from django.shortcuts import get_object_or_404
-from datetime import datetime
+
 from blog.models import Blog
 from blog.serializers import BlogSerializer
-from .utils import detect_outdated, extract_keywords, fetch_current_trends, update_content, update_meta_tags
 
-# Preview updated content without saving
+from .analysis import analysis_cache
+from .bulk import enqueue_bulk_refresh
+from .jobs import enqueue_refresh
+from .keywords import missed_keywords, top_keywords
+from .metrics import metrics, stage, trace
+from .models import BlogRevision, BulkRefreshRun, RefreshJob, RefreshPolicy
+from .permissions import HasMetricsToken, IsSuperUser, MetricsAuthentication
+from .pipeline import (
+    PreviewConflict, RefreshError, confirm_refresh, current_preview, iter_preview_refresh, preview_refresh,
+)
+from .registry import registry
+from .revisions import RevisionError, as_state, blog_state, diff_states, rebuild, restore_revision
+from .serializers import (
+    BlogRevisionSerializer, BulkRefreshRequestSerializer, BulkRefreshRunSerializer, RefreshJobSerializer,
+    RefreshPolicySerializer, StalePostSerializer,
+)
+from .staleness import months_to_days, select_stale
+from .streaming import EventStreamRenderer, sse_events, stream_body
+from .tracking import impact_summary, refresh_impact
+from .utils import generation_cache
+
+
+# Preview updated content without changing the post (stored in preview_data for confirm). With ?diff=1
+# the response has the change as line parts (`fields`, see blog_diff) instead of the preview bodies.
+# Refresh views never run inside a request transaction: generation can take minutes.
+@transaction.non_atomic_requests
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])  # ✅ Any logged-in user
 def preview_refresh_blog(request, pk):
     blog = get_object_or_404(Blog, pk=pk)
-    title = blog.title
-    content = blog.content
-    meta_tags = blog.meta_tags or {}
-    topic = blog.topic
-
-    outdated = detect_outdated(content)
-    old_keywords = extract_keywords(content)
-    current_year = datetime.now().year
-    trends = fetch_current_trends(topic, current_year)
-
-    variation_prompt = f"rewrite in SEO-friendly way with unique style variation {datetime.now().timestamp()}"
-    updated_title, updated_content, error = update_content(
-        content,
-        f"{title} {variation_prompt}",
-        outdated,
-        trends,
-        old_keywords,
-        topic
-    )
-
-    if error:
-        return Response({"error": f"Content preview failed: {error}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-    new_keywords = ", ".join(old_keywords + [f"SEO optimized {current_year}", f"latest {topic} trends"])
-    updated_meta = update_meta_tags(meta_tags, new_keywords, updated_title, updated_content)
+    with trace() as timings:
+        try:
+            with stage("preview"):
+                preview = preview_refresh(blog, incremental=_incremental_param(request))
+        except RefreshError as e:
+            return Response({"error": f"Content preview failed: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    body = {
+        "trends_used": preview["trends_used"],
+        "regenerated_segments": preview["regenerated_segments"],
+        "segments_total": preview["segments_total"],
+        "related_posts": preview.get("related_posts", []),
+        "missed_keywords": preview.get("missed_keywords", []),
+        "preview_version": preview["version"]
+    }
+    if request.query_params.get("diff") in ("1", "true"):
+        # Only the line diff against the current post, so the editor downloads neither full body
+        with stage("diff"):
+            body.update(diff_states(blog_state(blog), as_state(preview)))
+    else:
+        body.update({
+            "preview_title": preview["title"],
+            "preview_content": preview["content"],
+            "preview_meta_tags": preview["meta_tags"],
+        })
+    response = Response(body, status=status.HTTP_200_OK)
+    if getattr(settings, "SEO_SERVER_TIMING", False):
+        response["Server-Timing"] = timings.server_timing()
+    return response
+
+# Stream a preview as server-sent events: the title first, then each rewritten chunk as soon as it is generated.
+# The finished preview is stored like preview_refresh_blog, so confirm works the same afterwards.
+@transaction.non_atomic_requests
+@api_view(["GET"])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+@permission_classes([IsAuthenticated])
+def stream_preview_refresh_blog(request, pk):
+    blog = get_object_or_404(Blog, pk=pk)
+    events = sse_events(iter_preview_refresh(blog, incremental=_incremental_param(request)))
+    response = StreamingHttpResponse(stream_body(request, events), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # stop nginx from buffering the stream
+    return response
+
+# ?mode=incremental|full overrides SEO_REFRESH_MODE for one preview
+def _incremental_param(request):
+    mode = request.query_params.get("mode")
+    if mode in ("incremental", "full"):
+        return mode == "incremental"
+    return None
+
+# Confirm refresh: save the previewed content to DB (regenerates only if the post changed since preview)
+@transaction.non_atomic_requests
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])  # ✅ Any logged-in user
+def confirm_refresh_blog(request, pk):
+    blog = get_object_or_404(Blog, pk=pk)
+    try:
+        refresh, reused = confirm_refresh(blog, version=request.data.get("preview_version"))
+    except PreviewConflict as e:
+        return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+    except RefreshError as e:
+        return Response({"error": f"Content update failed: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     return Response({
-        "preview_title": updated_title,
-        "preview_content": updated_content,
-        "preview_meta_tags": updated_meta,
-        "trends_used": trends
+        "message": f"Blog ID {pk} refreshed successfully",
+        "updated_blog": BlogSerializer(blog).data,
+        "trends_used": refresh["trends_used"],
+        "reused_preview": reused
     }, status=status.HTTP_200_OK)
 
-# Confirm refresh: save updated content to DB
+
+# Queue a preview/confirm refresh to run in the background and return its job id
 @api_view(["POST"])
-@permission_classes([IsAuthenticated])  # ✅ Any logged-in user
-def confirm_refresh_blog(request, pk):
+@permission_classes([IsAuthenticated])
+def create_refresh_job(request, pk):
     blog = get_object_or_404(Blog, pk=pk)
-    title = blog.title
-    content = blog.content
-    meta_tags = blog.meta_tags or {}
-    topic = blog.topic
-
-    outdated = detect_outdated(content)
-    old_keywords = extract_keywords(content)
-    current_year = datetime.now().year
-    trends = fetch_current_trends(topic, current_year)
-
-    variation_prompt = f"rewrite in SEO-friendly way with unique style variation {datetime.now().timestamp()}"
-    updated_title, updated_content, error = update_content(
-        content,
-        f"{title} {variation_prompt}",
-        outdated,
-        trends,
-        old_keywords,
-        topic
-    )
+    action = request.data.get("action", RefreshJob.ACTION_PREVIEW)
+    if action not in dict(RefreshJob.ACTION_CHOICES):
+        return Response({"error": f"Unknown action '{action}'"}, status=status.HTTP_400_BAD_REQUEST)
+
+    job = enqueue_refresh(blog, action, request.user)
+    return Response(RefreshJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+# Poll a refresh job; the result is included once it has finished
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def refresh_job_status(request, job_id):
+    job = get_object_or_404(RefreshJob, pk=job_id)
+    return Response(RefreshJobSerializer(job).data, status=status.HTTP_200_OK)
 
-    if error:
-        return Response({"error": f"Content update failed: {error}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    new_keywords = ", ".join(old_keywords + [f"SEO optimized {current_year}", f"latest {topic} trends"])
-    updated_meta = update_meta_tags(meta_tags, new_keywords, updated_title, updated_content)
+# Refresh every blog matching topic / author / older_than_days / not_refreshed_days in the background
+@api_view(["POST"])
+@permission_classes([IsSuperUser])
+def create_bulk_refresh(request):
+    serializer = BulkRefreshRequestSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    filters = dict(serializer.validated_data)
+    apply = filters.pop("apply")
+    run = enqueue_bulk_refresh(filters, apply=apply, user=request.user)
+    return Response(BulkRefreshRunSerializer(run).data, status=status.HTTP_202_ACCEPTED)
 
-    # Save to DB
-    blog.title = updated_title
-    blog.content = updated_content
-    blog.meta_tags = updated_meta
-    blog.save()
 
+# Posts due for a refresh: ?topic=&months=&min_score=&order=oldest|score&limit=
+@api_view(["GET"])
+@permission_classes([IsSuperUser])
+def stale_posts(request):
+    params = request.query_params
+    try:
+        months = float(params["months"]) if params.get("months") else None
+        blogs = select_stale(
+            topic=params.get("topic") or None,
+            older_than_days=months_to_days(months) if months is not None else None,
+            min_score=float(params["min_score"]) if params.get("min_score") else None,
+            order=params.get("order", "oldest"),
+            limit=min(int(params.get("limit", 50)), 500),
+        )
+    except ValueError as e:
+        return Response({"error": f"Invalid selection: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(StalePostSerializer(blogs, many=True).data, status=status.HTTP_200_OK)
+
+
+# The post's top TF-IDF keywords and the phrases sibling posts of its topic use that it is missing
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def blog_keywords(request, pk):
+    blog = get_object_or_404(Blog.objects.only("id", "content", "topic"), pk=pk)
+    try:
+        limit = min(int(request.query_params.get("limit", 10)), 100)
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
     return Response({
-        "message": f"Blog ID {pk} refreshed successfully",
-        "updated_blog": BlogSerializer(blog).data,
-        "trends_used": trends
+        "keywords": top_keywords(blog.content, limit=limit),
+        "missed_keywords": missed_keywords(blog, limit=limit),
     }, status=status.HTTP_200_OK)
 
 
+# Rankings, CTR and traffic in the 7/30/90 days before and after each refresh of a post
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def blog_refresh_impact(request, pk):
+    get_object_or_404(Blog.objects.only("id"), pk=pk)
+    return Response({"blog": pk, "refreshes": refresh_impact(pk)}, status=status.HTTP_200_OK)
+
+
+# The same before/after comparison summed over every refresh, per window
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def refresh_impact_summary(request):
+    return Response(impact_summary(), status=status.HTTP_200_OK)
+
+
+# A post's revision history, newest first (metadata only; versions are rebuilt on request)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def blog_revisions(request, pk):
+    get_object_or_404(Blog.objects.only("id"), pk=pk)
+    revisions = (
+        BlogRevision.objects.filter(blog_id=pk).defer("data").annotate(size=Length("data")).order_by("-number")
+    )
+    return Response(BlogRevisionSerializer(revisions, many=True).data, status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def blog_revision(request, pk, number):
+    revision = get_object_or_404(
+        BlogRevision.objects.defer("data").annotate(size=Length("data")), blog_id=pk, number=number
+    )
+    try:
+        state = rebuild(pk, number)
+    except RevisionError as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response(dict(BlogRevisionSerializer(revision).data, **state), status=status.HTTP_200_OK)
+
+
+# Put the post back to an earlier revision (recorded as a new "restore" revision)
+@api_view(["POST"])
+@permission_classes([IsSuperUser])
+def restore_blog_revision(request, pk, number):
+    blog = get_object_or_404(Blog, pk=pk)
+    if not BlogRevision.objects.filter(blog_id=pk, number=number).exists():
+        return Response({"error": f"Blog {pk} has no revision {number}"}, status=status.HTTP_404_NOT_FOUND)
+    try:
+        blog = restore_revision(blog, number)
+    except RevisionError as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response(BlogSerializer(blog).data, status=status.HTTP_200_OK)
+
+
+# "current", "preview" or a revision number
+def _version_state(blog, ref):
+    if ref == "current":
+        return blog_state(blog)
+    if ref == "preview":
+        preview = current_preview(blog)
+        if preview is None:
+            raise RevisionError("The post has no up-to-date preview")
+        return as_state(preview)
+    try:
+        number = int(ref)
+    except ValueError:
+        raise RevisionError(f"Unknown version {ref!r}: use current, preview or a revision number")
+    return rebuild(blog.pk, number)
+
+
+# Line diff between two versions of a post (?from=&to=, each current, preview or a revision number;
+# current -> preview by default), computed here so the editor doesn't download and diff both bodies
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def blog_diff(request, pk):
+    blog = get_object_or_404(Blog, pk=pk)
+    old_ref = request.query_params.get("from", "current")
+    new_ref = request.query_params.get("to", "preview")
+    try:
+        with stage("diff"):
+            old, new = _version_state(blog, old_ref), _version_state(blog, new_ref)
+            diff = diff_states(old, new)
+    except RevisionError as e:
+        return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+    return Response(dict(diff, blog=pk, **{"from": old_ref, "to": new_ref}), status=status.HTTP_200_OK)
+
+
+# A post's scheduled refresh policy. PUT creates it if needed; changing the interval without giving
+# next_run_at moves the next run to one interval after the last refresh.
+@api_view(["GET", "PUT"])
+@permission_classes([IsSuperUser])
+def refresh_schedule(request, pk):
+    blog = get_object_or_404(Blog.objects.only("id", "last_refreshed_at"), pk=pk)
+    policy = RefreshPolicy.objects.filter(blog=blog).first()
+    if request.method == "GET":
+        if policy is None:
+            return Response({"error": "This post has no refresh schedule"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(RefreshPolicySerializer(policy).data, status=status.HTTP_200_OK)
+
+    if policy is None:
+        policy = RefreshPolicy(blog=blog)
+        policy.next_run_at = blog.last_refreshed_at + policy.interval
+    serializer = RefreshPolicySerializer(policy, data=request.data, partial=True)
+    serializer.is_valid(raise_exception=True)
+    policy = serializer.save()
+    if "interval_days" in serializer.validated_data and "next_run_at" not in serializer.validated_data:
+        policy.next_run_at = (policy.last_run_at or blog.last_refreshed_at) + policy.interval
+        policy.save(update_fields=["next_run_at"])
+    return Response(RefreshPolicySerializer(policy).data, status=status.HTTP_200_OK)
+
+
+# Progress of a bulk refresh run
+@api_view(["GET"])
+@permission_classes([IsSuperUser])
+def bulk_refresh_status(request, run_id):
+    run = get_object_or_404(BulkRefreshRun, pk=run_id)
+    return Response(BulkRefreshRunSerializer(run).data, status=status.HTTP_200_OK)
+
+
+# Report which models this worker has loaded, with load time and memory use
+@api_view(["GET"])
+@permission_classes([IsSuperUser])
+def model_status(request):
+    return Response(registry.stats(), status=status.HTTP_200_OK)
+
+
+# Hit/miss counters for this worker's analysis cache
+@api_view(["GET"])
+@permission_classes([IsSuperUser])
+def cache_status(request):
+    return Response(
+        {"analysis": analysis_cache.stats(), "generation": generation_cache.stats()},
+        status=status.HTTP_200_OK,
+    )
+
+
+# Stage timings, token/chunk counters and cache hit rates for this worker, in Prometheus text format
+@api_view(["GET"])
+@authentication_classes([MetricsAuthentication])
+@permission_classes([HasMetricsToken])
+def metrics_view(request):
+    body = metrics.render(caches=[analysis_cache, generation_cache])
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")